@@ -6,6 +6,7 @@ from types import SimpleNamespace
 from typing import TYPE_CHECKING, Awaitable, Optional, Union
 
 from redis.exceptions import LockError, LockNotOwnedError
+from redis.lock import notify_keys, notify_max_wait
 from redis.typing import Number
 
 if TYPE_CHECKING:
@@ -26,6 +27,8 @@ class Lock:
     lua_release = None
     lua_extend = None
     lua_reacquire = None
+    lua_notify_acquire = None
+    lua_notify_release = None
 
     # KEYS[1] - lock name
     # ARGV[1] - token
@@ -79,6 +82,77 @@ class Lock:
         return 1
     """
 
+    # KEYS[1] - lock name
+    # KEYS[2] - wake-up signal list
+    # KEYS[3] - waiters sorted set, scored by registration expiry
+    # KEYS[4] - handoff record, the signal of the waiter the lock is handed to
+    # ARGV[1] - token
+    # ARGV[2] - milliseconds until the lock expires, "0" for no expiry
+    # ARGV[3] - the signal the caller was woken up by, "" if none
+    # ARGV[4] - milliseconds the caller stays registered as a waiter if the
+    #           lock isn't acquired, "0" to not register
+    # return {1, 0} if the lock was acquired, otherwise {0, pttl of the lock}
+    LUA_NOTIFY_ACQUIRE_SCRIPT = """
+        local now = redis.call('time')
+        now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+        redis.call('zremrangebyscore', KEYS[3], '-inf', now)
+        if ARGV[4] == '0' then
+            -- the caller gives up after this attempt
+            redis.call('zrem', KEYS[3], ARGV[1])
+        end
+        if redis.call('zcard', KEYS[3]) == 0 then
+            -- nobody is left to take a pending signal
+            redis.call('del', KEYS[2], KEYS[4])
+        end
+        -- a lock handed over goes to the waiter holding its signal
+        local handoff = redis.call('get', KEYS[4])
+        if redis.call('exists', KEYS[1]) == 0
+                and (not handoff or handoff == ARGV[3]) then
+            if ARGV[2] == '0' then
+                redis.call('set', KEYS[1], ARGV[1])
+            else
+                redis.call('set', KEYS[1], ARGV[1], 'px', ARGV[2])
+            end
+            redis.call('zrem', KEYS[3], ARGV[1])
+            redis.call('del', KEYS[4])
+            return {1, 0}
+        end
+        local registration = tonumber(ARGV[4])
+        if registration > 0 then
+            redis.call('zadd', KEYS[3], now + registration, ARGV[1])
+            if redis.call('pttl', KEYS[3]) < registration then
+                redis.call('pexpire', KEYS[3], registration)
+            end
+        end
+        return {0, redis.call('pttl', KEYS[1])}
+    """
+
+    # KEYS[1] - lock name
+    # KEYS[2] - wake-up signal list
+    # KEYS[3] - waiters sorted set
+    # KEYS[4] - handoff record
+    # ARGV[1] - token
+    # return 1 if the lock was released, otherwise 0
+    LUA_NOTIFY_RELEASE_SCRIPT = """
+        local token = redis.call('get', KEYS[1])
+        if not token or token ~= ARGV[1] then
+            return 0
+        end
+        redis.call('del', KEYS[1])
+        local now = redis.call('time')
+        now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+        redis.call('zremrangebyscore', KEYS[3], '-inf', now)
+        if redis.call('zcard', KEYS[3]) > 0 then
+            -- BLPOP hands the signal to the longest waiting client, and the
+            -- record keeps the lock for it until it comes to take it
+            redis.call('del', KEYS[2])
+            redis.call('rpush', KEYS[2], ARGV[1])
+            redis.call('pexpire', KEYS[2], 1000)
+            redis.call('set', KEYS[4], ARGV[1], 'px', 1000)
+        end
+        return 1
+    """
+
     def __init__(
         self,
         redis: Union["Redis", "RedisCluster"],
@@ -89,6 +163,7 @@ class Lock:
         blocking_timeout: Optional[Number] = None,
         thread_local: bool = True,
         raise_on_release_error: bool = True,
+        notify: bool = False,
     ):
         """
         Create a new Lock instance named ``name`` using the Redis client
@@ -137,6 +212,11 @@ class Lock:
         this is True, meaning an exception will be raised. If False, the warning
         will be logged and the exception will be suppressed.
 
+        ``notify`` makes blocking acquires wait for a wake-up signal that
+        release() pushes to the waiter that has been waiting the longest,
+        rather than polling every ``sleep`` seconds. All the users of a lock
+        name must use the same mode, see :class:`redis.lock.Lock`.
+
         In some use cases it's necessary to disable thread local storage. For
         example, if you have code where one thread acquires a lock and passes
         that lock instance to a worker thread to release later. If thread
@@ -154,6 +234,10 @@ class Lock:
         self.thread_local = bool(thread_local)
         self.local = threading.local() if self.thread_local else SimpleNamespace()
         self.raise_on_release_error = raise_on_release_error
+        self.notify = notify
+        if notify:
+            # fail early on names the signal keys can't share a slot with
+            notify_keys(name)
         self.local.token = None
         self.register_scripts()
 
@@ -166,6 +250,14 @@ class Lock:
             cls.lua_extend = client.register_script(cls.LUA_EXTEND_SCRIPT)
         if cls.lua_reacquire is None:
             cls.lua_reacquire = client.register_script(cls.LUA_REACQUIRE_SCRIPT)
+        if cls.lua_notify_acquire is None:
+            cls.lua_notify_acquire = client.register_script(
+                cls.LUA_NOTIFY_ACQUIRE_SCRIPT
+            )
+        if cls.lua_notify_release is None:
+            cls.lua_notify_release = client.register_script(
+                cls.LUA_NOTIFY_RELEASE_SCRIPT
+            )
 
     async def __aenter__(self):
         if await self.acquire():
@@ -220,6 +312,11 @@ class Lock:
         stop_trying_at = None
         if blocking_timeout is not None:
             stop_trying_at = asyncio.get_running_loop().time() + blocking_timeout
+        if self.notify:
+            if await self.do_notify_acquire(token, blocking, stop_trying_at):
+                self.local.token = token
+                return True
+            return False
         while True:
             if await self.do_acquire(token):
                 self.local.token = token
@@ -241,6 +338,36 @@ class Lock:
             return True
         return False
 
+    async def do_notify_acquire(
+        self, token: bytes, blocking: bool, stop_trying_at: Optional[float]
+    ) -> bool:
+        px = int(self.timeout * 1000) if self.timeout else 0
+        keys = [self.name, *notify_keys(self.name)]
+        # the signal popped, which the lock may have been handed over with
+        signal = ""
+        max_wait = notify_max_wait(self.redis)
+        while True:
+            if stop_trying_at is None:
+                wait = max_wait
+            else:
+                wait = min(stop_trying_at - asyncio.get_running_loop().time(), max_wait)
+            # stay registered a little longer than the wait below
+            registration = int((wait + 1) * 1000) if blocking and wait > 0 else 0
+            acquired, pttl = await self.lua_notify_acquire(
+                keys=keys,
+                args=[token, px, signal, registration],
+                client=self.redis,
+            )
+            if acquired:
+                return True
+            if not registration:
+                return False
+            if pttl > 0:
+                # an expiring lock isn't released, so there's no signal
+                wait = min(wait, pttl / 1000)
+            popped = await self.redis.blpop([keys[1]], timeout=wait)
+            signal = popped[1] if popped is not None else ""
+
     async def locked(self) -> bool:
         """
         Returns True if this key is locked by any process, otherwise False.
@@ -275,11 +402,17 @@ class Lock:
         return self.do_release(expected_token)
 
     async def do_release(self, expected_token: bytes) -> None:
-        if not bool(
-            await self.lua_release(
+        if self.notify:
+            released = await self.lua_notify_release(
+                keys=[self.name, *notify_keys(self.name)],
+                args=[expected_token],
+                client=self.redis,
+            )
+        else:
+            released = await self.lua_release(
                 keys=[self.name], args=[expected_token], client=self.redis
             )
-        ):
+        if not bool(released):
             raise LockNotOwnedError("Cannot release a lock that's no longer owned")
 
     def extend(
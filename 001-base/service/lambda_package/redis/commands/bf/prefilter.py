@@ -0,0 +1,234 @@
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+
+from redis.exceptions import ConnectionError, RedisError
+from redis.typing import EncodableT, KeyT
+
+from .commands import BF_MEXISTS, CF_MEXISTS, CFCommands
+
+
+class _Check:
+    __slots__ = ("key", "items", "result")
+
+    def __init__(self, key: KeyT, items: List[EncodableT]):
+        self.key = key
+        self.items = items
+        self.result: Union[List[bool], Exception, None] = None
+
+
+class BloomPrefilter:
+    """
+    Answers membership checks on a Bloom or Cuckoo filter with as few round
+    trips as possible.
+
+    Items added through the prefilter, and items the server reported as
+    present, are kept in a local shadow of up to ``shadow_size`` items, so
+    checking them again needs no round trip. The filters have no false
+    negatives, so such an item stays present until its key is deleted, or
+    for a Cuckoo filter until the item is deleted. ``shadow_ttl`` bounds how
+    many seconds an item is trusted for, and ``forget`` drops the items of
+    a key, e.g. after deleting it.
+
+    The other checks are coalesced: a check is sent right away when nothing
+    is in flight, and the checks made by other threads in the meantime are
+    sent together as soon as the reply arrives, up to ``max_batch`` items
+    in a single round trip.
+
+    The prefilter needs a synchronous client.
+    """
+
+    def __init__(
+        self,
+        bloom,
+        shadow_size: int = 100_000,
+        shadow_ttl: Optional[float] = None,
+        max_batch: int = 1000,
+    ):
+        if inspect.iscoroutinefunction(bloom.client.execute_command):
+            raise RedisError(
+                "BloomPrefilter waits on threads and needs a synchronous client"
+            )
+        self.bloom = bloom
+        self.shadow_size = shadow_size
+        self.shadow_ttl = shadow_ttl
+        self.max_batch = max_batch
+        self.shadow_hits = 0
+        self.checks = 0
+        self.batches = 0
+        if isinstance(bloom, CFCommands):
+            self._mexists_command = CF_MEXISTS
+        else:
+            self._mexists_command = BF_MEXISTS
+        # (key, item) -> expiry on the monotonic clock, or None
+        self._shadow: "OrderedDict[Tuple[KeyT, EncodableT], Optional[float]]" = (
+            OrderedDict()
+        )
+        self._shadow_lock = threading.Lock()
+        self._queue: List[_Check] = []
+        self._sending = False
+        self._cond = threading.Condition()
+
+    def add(self, key: KeyT, item: EncodableT):
+        """Add ``item`` to the filter ``key`` and to the shadow"""
+        result = self.bloom.add(key, item)
+        self._remember(key, [item])
+        return result
+
+    def madd(self, key: KeyT, *items: EncodableT):
+        """
+        Add ``items`` to the filter ``key``, with BF.MADD or CF.INSERT, and
+        those the server accepted to the shadow.
+        """
+        if self._mexists_command == CF_MEXISTS:
+            results = self.bloom.insert(key, list(items))
+        else:
+            results = self.bloom.madd(key, *items)
+        self._remember(
+            key,
+            [
+                item
+                for item, result in zip(items, results)
+                if not isinstance(result, Exception) and result != -1
+            ],
+        )
+        return results
+
+    def delete(self, key: KeyT, item: EncodableT):
+        """Delete ``item`` from the Cuckoo filter ``key`` and from the shadow"""
+        with self._shadow_lock:
+            self._shadow.pop((key, item), None)
+        return self.bloom.delete(key, item)
+
+    def exists(self, key: KeyT, item: EncodableT) -> bool:
+        """Return whether ``item`` may be in the filter ``key``"""
+        if self._known(key, item):
+            return True
+        return self._check(key, [item])[0]
+
+    def mexists(self, key: KeyT, *items: EncodableT) -> List[bool]:
+        """Return whether each of ``items`` may be in the filter ``key``"""
+        results = [self._known(key, item) for item in items]
+        unknown = [i for i, known in enumerate(results) if not known]
+        if unknown:
+            checked = self._check(key, [items[i] for i in unknown])
+            for i, result in zip(unknown, checked):
+                results[i] = result
+        return results
+
+    def forget(self, key: Optional[KeyT] = None) -> None:
+        """Drop the items of the filter ``key`` from the shadow, or all items"""
+        with self._shadow_lock:
+            if key is None:
+                self._shadow.clear()
+                return
+            for entry in [entry for entry in self._shadow if entry[0] == key]:
+                del self._shadow[entry]
+
+    def _known(self, key: KeyT, item: EncodableT) -> bool:
+        entry = (key, item)
+        with self._shadow_lock:
+            try:
+                expiry = self._shadow[entry]
+            except KeyError:
+                return False
+            if expiry is not None and expiry < time.monotonic():
+                del self._shadow[entry]
+                return False
+            self._shadow.move_to_end(entry)
+            self.shadow_hits += 1
+            return True
+
+    def _remember(self, key: KeyT, items: List[EncodableT]) -> None:
+        if not self.shadow_size:
+            return
+        expiry = None
+        if self.shadow_ttl is not None:
+            expiry = time.monotonic() + self.shadow_ttl
+        with self._shadow_lock:
+            for item in items:
+                entry = (key, item)
+                self._shadow[entry] = expiry
+                self._shadow.move_to_end(entry)
+            while len(self._shadow) > self.shadow_size:
+                self._shadow.popitem(last=False)
+
+    def _check(self, key: KeyT, items: List[EncodableT]) -> List[bool]:
+        check = _Check(key, items)
+        with self._cond:
+            self._queue.append(check)
+        while True:
+            with self._cond:
+                while check.result is None and self._sending:
+                    self._cond.wait()
+                if check.result is not None:
+                    break
+                # nothing in flight: send the queued checks, this one included
+                self._sending = True
+                batch = self._take_batch()
+            try:
+                self._send(batch)
+            finally:
+                with self._cond:
+                    for queued in batch:
+                        if queued.result is None:
+                            queued.result = ConnectionError("Check interrupted")
+                    self._sending = False
+                    self._cond.notify_all()
+        if isinstance(check.result, Exception):
+            raise check.result
+        return check.result
+
+    def _take_batch(self) -> List[_Check]:
+        size = 0
+        for i, check in enumerate(self._queue):
+            size += len(check.items)
+            if size >= self.max_batch:
+                break
+        batch = self._queue[: i + 1]
+        del self._queue[: i + 1]
+        return batch
+
+    def _send(self, batch: List[_Check]) -> None:
+        # BF.MEXISTS takes a single key, so send one per key
+        by_key: Dict[KeyT, List[_Check]] = {}
+        for check in batch:
+            by_key.setdefault(check.key, []).append(check)
+        commands = [
+            (key, [item for check in checks for item in check.items])
+            for key, checks in by_key.items()
+        ]
+        try:
+            if len(commands) == 1:
+                key, items = commands[0]
+                replies = [
+                    self.bloom.client.execute_command(
+                        self._mexists_command, key, *items
+                    )
+                ]
+            else:
+                pipe = self.bloom.client.pipeline(transaction=False)
+                for key, items in commands:
+                    pipe.execute_command(self._mexists_command, key, *items)
+                replies = pipe.execute(raise_on_error=False)
+        except Exception as e:
+            replies = [e] * len(commands)
+
+        for (key, items), reply, checks in zip(commands, replies, by_key.values()):
+            if isinstance(reply, Exception):
+                for check in checks:
+                    check.result = reply
+                continue
+            results = [bool(result) for result in reply]
+            self._remember(
+                key, [item for item, result in zip(items, results) if result]
+            )
+            offset = 0
+            for check in checks:
+                check.result = results[offset : offset + len(check.items)]
+                offset += len(check.items)
+        with self._cond:
+            self.checks += sum(len(check.items) for check in batch)
+            self.batches += 1
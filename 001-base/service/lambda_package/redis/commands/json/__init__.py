@@ -16,10 +16,19 @@ class JSON(JSONCommands):
 
     :param encoder:
     :type json.JSONEncoder: An instance of json.JSONEncoder
+
+    :param loads:
+    :type Callable: A function decoding JSON from bytes, e.g. ``orjson.loads``,
+        used instead of ``decoder`` to decode the replies
     """
 
     def __init__(
-        self, client, version=None, decoder=JSONDecoder(), encoder=JSONEncoder()
+        self,
+        client,
+        version=None,
+        decoder=JSONDecoder(),
+        encoder=JSONEncoder(),
+        loads=None,
     ):
         """
         Create a client for talking to json.
@@ -29,6 +38,10 @@ class JSON(JSONCommands):
 
         :param encoder:
         :type json.JSONEncoder: An instance of json.JSONEncoder
+
+        :param loads:
+        :type Callable: A function decoding JSON from bytes, e.g. ``orjson.loads``,
+            used instead of ``decoder`` to decode the replies
         """
         # Set the module commands' callbacks
         self._MODULE_CALLBACKS = {
@@ -78,12 +91,20 @@ class JSON(JSONCommands):
 
         self.__encoder__ = encoder
         self.__decoder__ = decoder
+        self.__loads__ = loads
 
-    def _decode(self, obj):
+    def _decode(self, obj, raw=False, **options):
         """Get the decoder."""
-        if obj is None:
+        if obj is None or raw:
             return obj
 
+        if self.__loads__ is not None:
+            try:
+                return self.__loads__(obj)
+            except (TypeError, ValueError):
+                # not a JSON document, e.g. the integer reply of JSON.ARRLEN
+                pass
+
         try:
             x = self.__decoder__.decode(obj)
             if x is None:
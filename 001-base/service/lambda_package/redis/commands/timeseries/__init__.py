@@ -1,5 +1,8 @@
+from typing import Callable, Dict, NoReturn, Optional
+
 import redis
 from redis._parsers.helpers import bool_ok
+from redis.exceptions import RedisError
 
 from ..helpers import get_protocol_version, parse_to_list
 from .commands import (
@@ -16,10 +19,19 @@ from .commands import (
     QUERYINDEX_CMD,
     RANGE_CMD,
     REVRANGE_CMD,
+    AsyncTimeSeriesCommands,
     TimeSeriesCommands,
 )
 from .info import TSInfo
-from .utils import parse_get, parse_m_get, parse_m_range, parse_range
+from .utils import (
+    parse_get,
+    parse_m_get,
+    parse_m_range,
+    parse_m_range_resp3,
+    parse_range,
+    parse_range_resp3,
+)
+from .writer import TimeSeriesWriter
 
 
 class TimeSeries(TimeSeriesCommands):
@@ -51,7 +63,12 @@ class TimeSeries(TimeSeriesCommands):
             REVRANGE_CMD: parse_range,
             QUERYINDEX_CMD: parse_to_list,
         }
-        _RESP3_MODULE_CALLBACKS = {}
+        _RESP3_MODULE_CALLBACKS = {
+            MRANGE_CMD: parse_m_range_resp3,
+            MREVRANGE_CMD: parse_m_range_resp3,
+            RANGE_CMD: parse_range_resp3,
+            REVRANGE_CMD: parse_range_resp3,
+        }
 
         self.client = client
         self.execute_command = client.execute_command
@@ -99,6 +116,32 @@ class TimeSeries(TimeSeriesCommands):
             )
         return p
 
+    def writer(
+        self,
+        batch_bytes: int = 64 * 1024,
+        flush_interval: Optional[float] = 0.1,
+        max_buffer_bytes: int = 4 * 1024 * 1024,
+        create_options: Optional[Dict] = None,
+        on_error: Optional[Callable] = None,
+    ) -> TimeSeriesWriter:
+        """Return a buffered writer of samples, see `TimeSeriesWriter`.
+
+        Usage example:
+
+        with r.ts().writer(create_options={"retention_msecs": 86400000}) as w:
+            for sample in samples:
+                w.add("qr:generated", "*", sample, labels={"kind": "qr"})
+
+        """
+        return TimeSeriesWriter(
+            self,
+            batch_bytes=batch_bytes,
+            flush_interval=flush_interval,
+            max_buffer_bytes=max_buffer_bytes,
+            create_options=create_options,
+            on_error=on_error,
+        )
+
 
 class ClusterPipeline(TimeSeriesCommands, redis.cluster.ClusterPipeline):
     """Cluster pipeline for the module."""
@@ -106,3 +149,12 @@ class ClusterPipeline(TimeSeriesCommands, redis.cluster.ClusterPipeline):
 
 class Pipeline(TimeSeriesCommands, redis.client.Pipeline):
     """Pipeline for the module."""
+
+
+class AsyncTimeSeries(TimeSeries, AsyncTimeSeriesCommands):
+    """Async RedisTimeSeries client."""
+
+    def writer(self, *args, **kwargs) -> NoReturn:
+        raise RedisError(
+            "TimeSeriesWriter sends from threads and needs a synchronous client"
+        )
@@ -1,3 +1,5 @@
+from array import array
+
 from redis._parsers.helpers import pairs_to_dict
 from redis.commands.vectorset.commands import CallbacksOptions
 
@@ -27,6 +29,9 @@ def parse_vemb_result(response, **options):
             result["range"] = float(response[3])
         return result
     else:
+        if options.get(CallbacksOptions.AS_ARRAY.value):
+            return array("f", map(float, response))
+
         if options.get(CallbacksOptions.RESP3.value):
             return response
 
@@ -76,11 +81,20 @@ def parse_vsim_result(response, **options):
     Parsing VSIM result into:
     - List[List[str]]
     - List[Dict[str, Number]]
+    - Tuple[List[str], array] with the ``AS_ARRAY`` option
     """
     if response is None:
         return response
 
+    if isinstance(response, dict):
+        # RESP3 replies with a map of the elements to their scores
+        if options.get(CallbacksOptions.AS_ARRAY.value):
+            return list(response), array("d", response.values())
+        return response
+
     if options.get(CallbacksOptions.WITHSCORES.value):
+        if options.get(CallbacksOptions.AS_ARRAY.value):
+            return response[::2], array("d", map(float, response[1::2]))
         # Redis will return a list of list of pairs.
         # This list have to be transformed to dict
         result_dict = {}
@@ -0,0 +1,355 @@
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from redis.exceptions import ResponseError
+from redis.metrics import StreamWorkerStats
+from redis.typing import ConsumerT, GroupT, KeyT, StreamIdT
+from redis.utils import str_if_bytes
+
+logger = logging.getLogger(__name__)
+
+# stream, entry ID, fields
+EntryT = Tuple[KeyT, StreamIdT, Dict]
+
+
+def entry_time(entry_id: StreamIdT) -> Optional[float]:
+    """
+    Return the time in seconds since the epoch of the stream entry
+    ``entry_id``, from its millisecond part.
+    """
+    try:
+        return int(str_if_bytes(entry_id).split("-", 1)[0]) / 1000
+    except ValueError:
+        return None
+
+
+class StreamWorker(threading.Thread):
+    """
+    Consumes ``streams`` as the consumer ``consumername`` of the consumer
+    group ``groupname``, calling ``handler(stream, entry_id, fields)`` for
+    each entry and acknowledging the entries it handled.
+
+    Entries are read ``count`` at a time, waiting up to ``block``
+    milliseconds for new ones. The handlers run on this thread, on
+    ``handler_threads`` threads, or on ``executor``, e.g. a
+    ``ProcessPoolExecutor`` for CPU bound handlers, with at most
+    ``max_in_flight`` entries submitted at a time. The entries handled are
+    acknowledged together, with one XACK per stream in a pipeline, after
+    each read.
+
+    An entry whose handler raised isn't acknowledged, and is passed to
+    ``exception_handler`` along with the error if given, otherwise logged.
+    It stays pending, and every ``claim_interval`` seconds XAUTOCLAIM takes
+    over up to ``count`` entries per stream that have been pending for more
+    than ``claim_min_idle_time`` milliseconds, those of consumers that died
+    included, to handle them again. Entries are therefore handled at least
+    once. The entries still pending for this consumer from a previous run
+    are handled first.
+
+    With ``create_group`` the group is created if missing, along with the
+    stream, starting at the ID given for the stream when ``streams`` is a
+    dict, at new entries otherwise.
+
+    In a cluster the streams must hash to the same slot, like the keys of
+    any XREADGROUP. The client's ``socket_timeout`` must be longer than
+    ``block``.
+    """
+
+    def __init__(
+        self,
+        client,
+        streams: Union[Iterable[KeyT], Dict[KeyT, StreamIdT]],
+        groupname: GroupT,
+        handler: Callable[[KeyT, StreamIdT, Dict], None],
+        consumername: Optional[ConsumerT] = None,
+        count: int = 100,
+        block: int = 1000,
+        handler_threads: int = 0,
+        executor: Optional[Executor] = None,
+        max_in_flight: Optional[int] = None,
+        claim_min_idle_time: Optional[int] = 60000,
+        claim_interval: float = 10.0,
+        create_group: bool = True,
+        daemon: bool = False,
+        exception_handler: Optional[
+            Callable[[Exception, "StreamWorker", Optional[EntryT]], None]
+        ] = None,
+    ):
+        super().__init__()
+        if count < 1 or block < 0:
+            raise ValueError('"count" must be positive and "block" non-negative')
+        if not isinstance(streams, dict):
+            streams = dict.fromkeys(streams, "$")
+        if not streams:
+            raise ValueError('"streams" must not be empty')
+        self.daemon = daemon
+        self.client = client
+        self.streams = streams
+        self.groupname = groupname
+        self.handler = handler
+        if consumername is None:
+            consumername = f"{socket.gethostname()}-{os.getpid()}-{id(self)}"
+        self.consumername = consumername
+        self.count = count
+        self.block = block
+        self.handler_threads = handler_threads
+        self.executor = executor
+        self.max_in_flight = max_in_flight or 2 * count
+        self.claim_min_idle_time = claim_min_idle_time
+        self.claim_interval = claim_interval
+        self.create_group = create_group
+        self.exception_handler = exception_handler
+        self._running = threading.Event()
+        # the entries pending for this consumer are read from the last ID
+        # handled until there are none left, then new entries with ">"
+        self._read_ids: Dict[KeyT, StreamIdT] = dict.fromkeys(streams, "0")
+        self._claim_ids: Dict[KeyT, StreamIdT] = dict.fromkeys(streams, "0-0")
+        self._next_claim = 0.0
+        self._in_flight: Dict[Future, EntryT] = {}
+        # (stream, entry ID) of the entries submitted
+        self._in_flight_ids = set()
+        # stream -> IDs to acknowledge
+        self._acks: Dict[KeyT, List[StreamIdT]] = {}
+        self._stats_lock = threading.Lock()
+        self._stats = StreamWorkerStats()
+
+    def run(self) -> None:
+        if self._running.is_set():
+            return
+        self._running.set()
+        executor = self.executor
+        if executor is None and self.handler_threads:
+            executor = ThreadPoolExecutor(
+                self.handler_threads, thread_name_prefix=f"{self.name}-handler"
+            )
+        try:
+            if self.create_group:
+                self._create_groups()
+            while self._running.is_set():
+                try:
+                    self._poll(executor)
+                except BaseException as e:
+                    if self.exception_handler is None:
+                        raise
+                    self.exception_handler(e, self, None)
+        finally:
+            self._running.clear()
+            try:
+                # let the handlers submitted finish and acknowledge them
+                wait(list(self._in_flight))
+                self._collect()
+                self._send_acks()
+            finally:
+                if executor is not self.executor:
+                    executor.shutdown()
+
+    def stop(self) -> None:
+        """
+        Stop reading, after the current read returns. The handlers running
+        are waited for and their entries acknowledged.
+        """
+        self._running.clear()
+
+    def stats(self) -> StreamWorkerStats:
+        """Return the counters and the lag of this worker"""
+        with self._stats_lock:
+            return StreamWorkerStats(
+                received=self._stats.received,
+                claimed=self._stats.claimed,
+                acked=self._stats.acked,
+                failed=self._stats.failed,
+                batches=self._stats.batches,
+                in_flight=len(self._in_flight),
+                lag=self._stats.lag.copy(),
+            )
+
+    def group_lag(self) -> Dict[KeyT, Optional[int]]:
+        """
+        Return the number of entries of each stream not yet delivered to the
+        group, as reported by XINFO GROUPS, or None where the server can't
+        tell.
+        """
+        lags = {}
+        groupname = str_if_bytes(self.groupname)
+        for stream in self.streams:
+            lags[stream] = None
+            for group in self.client.xinfo_groups(stream):
+                group = {str_if_bytes(k): v for k, v in group.items()}
+                if str_if_bytes(group["name"]) == groupname:
+                    lags[stream] = group.get("lag")
+        return lags
+
+    def _create_groups(self) -> None:
+        for stream, group_id in self.streams.items():
+            try:
+                self.client.xgroup_create(
+                    stream, self.groupname, id=group_id, mkstream=True
+                )
+            except ResponseError as e:
+                if not str(e).startswith("BUSYGROUP"):
+                    raise
+
+    def _poll(self, executor: Optional[Executor]) -> None:
+        if (
+            self.claim_min_idle_time is not None
+            and time.monotonic() >= self._next_claim
+        ):
+            self._next_claim = time.monotonic() + self.claim_interval
+            self._claim(executor)
+            # so the pending entries read next don't include them
+            self._collect()
+            self._send_acks()
+
+        room = self.count
+        if executor is not None:
+            room = min(room, self.max_in_flight - len(self._in_flight))
+            if room <= 0:
+                wait(
+                    list(self._in_flight),
+                    timeout=self.block / 1000,
+                    return_when=FIRST_COMPLETED,
+                )
+                self._collect()
+                self._send_acks()
+                return
+
+        block = self.block
+        if any(entry_id != ">" for entry_id in self._read_ids.values()):
+            # the pending entries are returned right away
+            block = None
+        elif self._in_flight:
+            # come back soon to acknowledge the entries being handled
+            block = min(block, 100)
+        response = self.client.xreadgroup(
+            self.groupname,
+            self.consumername,
+            self._read_ids,
+            count=room,
+            block=block,
+        )
+        if isinstance(response, dict):
+            # RESP3
+            response = [(stream, value[0]) for stream, value in response.items()]
+        entries = []
+        history = {s for s, entry_id in self._read_ids.items() if entry_id != ">"}
+        for stream, stream_entries in response or []:
+            stream = self._stream_name(stream)
+            if stream in history:
+                history.discard(stream)
+                if not stream_entries:
+                    self._read_ids[stream] = ">"
+                    continue
+                self._read_ids[stream] = stream_entries[-1][0]
+            entries.extend(
+                (stream, entry_id, fields)
+                for entry_id, fields in stream_entries
+                if (stream, entry_id) not in self._in_flight_ids
+            )
+        for stream in history:
+            self._read_ids[stream] = ">"
+
+        if entries:
+            self._dispatch(entries, executor)
+        self._collect()
+        self._send_acks()
+
+    def _claim(self, executor: Optional[Executor]) -> None:
+        entries = []
+        for stream in self.streams:
+            response = self.client.xautoclaim(
+                stream,
+                self.groupname,
+                self.consumername,
+                self.claim_min_idle_time,
+                start_id=self._claim_ids[stream],
+                count=self.count,
+            )
+            self._claim_ids[stream] = response[0]
+            for entry_id, fields in response[1]:
+                # entries deleted from the stream come back as None before
+                # Redis 7, which drops them from the pending list itself
+                if entry_id is None or (stream, entry_id) in self._in_flight_ids:
+                    continue
+                entries.append((stream, entry_id, fields))
+        if entries:
+            with self._stats_lock:
+                self._stats.claimed += len(entries)
+            self._dispatch(entries, executor)
+
+    def _dispatch(self, entries: List[EntryT], executor: Optional[Executor]) -> None:
+        now = time.time()
+        with self._stats_lock:
+            self._stats.received += len(entries)
+            self._stats.batches += 1
+            for _, entry_id, _ in entries:
+                created = entry_time(entry_id)
+                if created is not None:
+                    self._stats.lag.record(max(now - created, 0.0))
+        for entry in entries:
+            stream, entry_id, fields = entry
+            if not fields:
+                # deleted from the stream while pending, nothing to handle
+                self._acks.setdefault(stream, []).append(entry_id)
+            elif executor is None:
+                try:
+                    self.handler(*entry)
+                except Exception as e:
+                    self._failed(e, entry)
+                else:
+                    self._acks.setdefault(stream, []).append(entry_id)
+            else:
+                future = executor.submit(self.handler, *entry)
+                self._in_flight[future] = entry
+                self._in_flight_ids.add((stream, entry_id))
+
+    def _collect(self) -> None:
+        for future in [future for future in self._in_flight if future.done()]:
+            entry = self._in_flight.pop(future)
+            self._in_flight_ids.discard(entry[:2])
+            error = future.exception()
+            if error is not None:
+                self._failed(error, entry)
+            else:
+                self._acks.setdefault(entry[0], []).append(entry[1])
+
+    def _failed(self, error: Exception, entry: EntryT) -> None:
+        with self._stats_lock:
+            self._stats.failed += 1
+        if self.exception_handler is not None:
+            self.exception_handler(error, self, entry)
+        else:
+            logger.warning(
+                "Handler failed on entry %r of stream %r: %r", entry[1], entry[0], error
+            )
+
+    def _send_acks(self) -> None:
+        if not self._acks:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for stream, entry_ids in self._acks.items():
+            pipe.xack(stream, self.groupname, *entry_ids)
+        pipe.execute()
+        acked = sum(len(entry_ids) for entry_ids in self._acks.values())
+        self._acks = {}
+        with self._stats_lock:
+            self._stats.acked += acked
+
+    def _stream_name(self, stream):
+        # the reply names the streams as bytes, unless decoding responses
+        if stream in self._read_ids:
+            return stream
+        for name in self._read_ids:
+            if str_if_bytes(name) == str_if_bytes(stream):
+                return name
+        return stream
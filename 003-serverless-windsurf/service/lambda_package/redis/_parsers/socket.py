@@ -28,11 +28,16 @@ SYM_CRLF = b"\r\n"
 
 class SocketBuffer:
     def __init__(
-        self, socket: socket.socket, socket_read_size: int, socket_timeout: float
+        self,
+        socket: socket.socket,
+        socket_read_size: int,
+        socket_timeout: float,
+        metrics=None,
     ):
         self._sock = socket
         self.socket_read_size = socket_read_size
         self.socket_timeout = socket_timeout
+        self._metrics = metrics
         self._buffer = io.BytesIO()
 
     def unread_bytes(self) -> int:
@@ -69,6 +74,8 @@ class SocketBuffer:
                 buf.write(data)
                 data_length = len(data)
                 marker += data_length
+                if self._metrics is not None:
+                    self._metrics.record_bytes_received(data_length)
 
                 if length is not None and length > marker:
                     continue
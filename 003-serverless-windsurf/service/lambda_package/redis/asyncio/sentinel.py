@@ -1,5 +1,7 @@
 import asyncio
+import logging
 import random
+import time
 import weakref
 from typing import AsyncIterator, Iterable, Mapping, Optional, Sequence, Tuple, Type
 
@@ -17,6 +19,10 @@ from redis.exceptions import (
     ResponseError,
     TimeoutError,
 )
+from redis.sentinel import SENTINEL_EVENTS
+from redis.utils import str_if_bytes
+
+logger = logging.getLogger(__name__)
 
 
 class MasterNotFoundError(ConnectionError):
@@ -50,12 +56,18 @@ class SentinelManagedConnection(Connection):
         if self._reader:
             return  # already connected
         if self.connection_pool.is_master:
-            await self.connect_to(await self.connection_pool.get_master_address())
+            try:
+                await self.connect_to(await self.connection_pool.get_master_address())
+            except ConnectionError:
+                # the address may be stale, look it up again on the retry
+                self.connection_pool.invalidate_cache()
+                raise
         else:
             async for slave in self.connection_pool.rotate_slaves():
                 try:
                     return await self.connect_to(slave)
                 except ConnectionError:
+                    self.connection_pool.invalidate_cache()
                     continue
             raise SlaveNotFoundError  # Never be here
 
@@ -87,6 +99,7 @@ class SentinelManagedConnection(Connection):
                 # to has been demoted to a slave and there's a new master.
                 # calling disconnect will force the connection to re-query
                 # sentinel during the next connect() attempt.
+                self.connection_pool.invalidate_cache()
                 await self.disconnect()
                 raise ConnectionError("The previous master is now a slave")
             raise
@@ -139,6 +152,11 @@ class SentinelConnectionPool(ConnectionPool):
         )
         return check and super().owns_connection(connection)
 
+    def invalidate_cache(self):
+        invalidate_cache = getattr(self.sentinel_manager, "invalidate_cache", None)
+        if invalidate_cache is not None:
+            invalidate_cache(self.service_name)
+
     async def get_master_address(self):
         master_address = await self.sentinel_manager.discover_master(self.service_name)
         if self.is_master:
@@ -167,6 +185,47 @@ class SentinelConnectionPool(ConnectionPool):
         raise SlaveNotFoundError(f"No slave found for {self.service_name!r}")
 
 
+async def _watch_sentinels(sentinel_manager_ref) -> None:
+    # Only a weak reference is kept, so the task doesn't keep an otherwise
+    # unused Sentinel alive.
+    index = 0
+    while True:
+        sentinel_manager = sentinel_manager_ref()
+        if sentinel_manager is None:
+            return
+        sentinels = sentinel_manager.sentinels
+        pubsub = sentinels[index % len(sentinels)].pubsub(
+            ignore_subscribe_messages=True
+        )
+        del sentinel_manager, sentinels
+        try:
+            await pubsub.subscribe(*SENTINEL_EVENTS)
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+                sentinel_manager = sentinel_manager_ref()
+                if sentinel_manager is None:
+                    return
+                if message is not None:
+                    await sentinel_manager._handle_event(
+                        str_if_bytes(message["channel"]), str_if_bytes(message["data"])
+                    )
+                del sentinel_manager
+        except Exception as e:
+            # try the next sentinel, events may have been missed meanwhile
+            if not isinstance(e, (ConnectionError, TimeoutError)):
+                logger.exception("Error watching the sentinels for failover events")
+            index += 1
+            sentinel_manager = sentinel_manager_ref()
+            if sentinel_manager is not None:
+                sentinel_manager.invalidate_cache()
+            del sentinel_manager
+            await asyncio.sleep(0.1)
+        finally:
+            await pubsub.aclose()
+
+
 class Sentinel(AsyncSentinelCommands):
     """
     Redis Sentinel cluster client
@@ -192,6 +251,17 @@ class Sentinel(AsyncSentinelCommands):
     not specified, any socket_timeout and socket_keepalive options specified
     in ``connection_kwargs`` will be used.
 
+    ``cache_ttl`` caches the discovered master and replica addresses for
+    that many seconds, so new connections don't query the sentinels. The
+    cache of a service is dropped when connecting to one of its addresses
+    fails or its master turns read-only.
+
+    ``watch_failover`` subscribes to the failover events of a sentinel in a
+    background task, which updates the cache as soon as a master is switched
+    or an instance goes down or comes back, and disconnects the idle
+    connections to a replaced master. The addresses are then cached until
+    such an event, unless ``cache_ttl`` is also set.
+
     ``connection_kwargs`` are keyword arguments that will be used when
     establishing a connection to a Redis server.
     """
@@ -202,6 +272,8 @@ class Sentinel(AsyncSentinelCommands):
         min_other_sentinels=0,
         sentinel_kwargs=None,
         force_master_ip=None,
+        cache_ttl: Optional[float] = None,
+        watch_failover: bool = False,
         **connection_kwargs,
     ):
         # if sentinel_kwargs isn't defined, use the socket_* options from
@@ -219,6 +291,18 @@ class Sentinel(AsyncSentinelCommands):
         self.min_other_sentinels = min_other_sentinels
         self.connection_kwargs = connection_kwargs
         self._force_master_ip = force_master_ip
+        self.cache_ttl = cache_ttl
+        self.watch_failover = watch_failover
+        self._caching = cache_ttl is not None or watch_failover
+        # service name -> (addresses, expires at or None)
+        self._master_cache = {}
+        self._slaves_cache = {}
+        # service name (None for all) -> count of the events that changed its
+        # addresses, so a lookup started before one doesn't cache stale ones
+        self._generations = {}
+        # the pools of master_for(), told about master switches
+        self._master_pools = weakref.WeakSet()
+        self._watch_task: Optional[asyncio.Task] = None
 
     async def execute_command(self, *args, **kwargs):
         """
@@ -272,6 +356,83 @@ class Sentinel(AsyncSentinelCommands):
             return False
         return True
 
+    def _get_cached(self, cache, service_name: str):
+        entry = cache.get(service_name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        return value
+
+    def _generation(self, service_name: str) -> Tuple[int, int]:
+        return self._generations.get(None, 0), self._generations.get(service_name, 0)
+
+    def _bump_generation(self, service_name: Optional[str]) -> None:
+        self._generations[service_name] = self._generations.get(service_name, 0) + 1
+
+    def _set_cached(
+        self,
+        cache,
+        service_name: str,
+        value,
+        generation: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        if generation not in (None, self._generation(service_name)):
+            # the addresses changed during the lookup
+            return
+        if self.cache_ttl is None:
+            expires_at = None
+        else:
+            expires_at = time.monotonic() + self.cache_ttl
+        cache[service_name] = (value, expires_at)
+
+    def invalidate_cache(self, service_name: Optional[str] = None) -> None:
+        """
+        Drop the cached addresses of ``service_name``, or of every service,
+        so that they're discovered again on the next connection.
+        """
+        if service_name is None:
+            self._master_cache.clear()
+            self._slaves_cache.clear()
+            self._bump_generation(None)
+        else:
+            self._master_cache.pop(service_name, None)
+            self._slaves_cache.pop(service_name, None)
+            self._bump_generation(service_name)
+
+    async def aclose(self) -> None:
+        """Stop watching for failover events"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+    async def _handle_event(self, event: str, data: str) -> None:
+        parts = data.split()
+        if not parts:
+            return
+        if event == "+switch-master":
+            # <master name> <old ip> <old port> <new ip> <new port>
+            service_name = parts[0]
+            ip = parts[3]
+            if self._force_master_ip is not None:
+                ip = self._force_master_ip
+            self._bump_generation(service_name)
+            self._set_cached(self._master_cache, service_name, (ip, int(parts[4])))
+            self._slaves_cache.pop(service_name, None)
+            for pool in list(self._master_pools):
+                if pool.service_name == service_name:
+                    # disconnects the idle connections to the old master
+                    await pool.get_master_address()
+        elif parts[0] == "master":
+            # <instance type> <name> <ip> <port>
+            self.invalidate_cache(parts[1])
+        elif "@" in parts:
+            # <instance type> <name> <ip> <port> @ <master name> <ip> <port>
+            service_name = parts[parts.index("@") + 1]
+            self._slaves_cache.pop(service_name, None)
+            self._bump_generation(service_name)
+
     async def discover_master(self, service_name: str):
         """
         Asks sentinel servers for the Redis master's address corresponding
@@ -280,6 +441,17 @@ class Sentinel(AsyncSentinelCommands):
         Returns a pair (address, port) or raises MasterNotFoundError if no
         master is found.
         """
+        if self._caching:
+            if self.watch_failover and (
+                self._watch_task is None or self._watch_task.done()
+            ):
+                self._watch_task = asyncio.create_task(
+                    _watch_sentinels(weakref.ref(self))
+                )
+            address = self._get_cached(self._master_cache, service_name)
+            if address is not None:
+                return address
+            generation = self._generation(service_name)
         collected_errors = list()
         for sentinel_no, sentinel in enumerate(self.sentinels):
             try:
@@ -300,6 +472,13 @@ class Sentinel(AsyncSentinelCommands):
                     if self._force_master_ip is not None
                     else state["ip"]
                 )
+                if self._caching:
+                    self._set_cached(
+                        self._master_cache,
+                        service_name,
+                        (ip, state["port"]),
+                        generation,
+                    )
                 return ip, state["port"]
 
         error_info = ""
@@ -322,6 +501,11 @@ class Sentinel(AsyncSentinelCommands):
         self, service_name: str
     ) -> Sequence[Tuple[EncodableT, EncodableT]]:
         """Returns a list of alive slaves for service ``service_name``"""
+        if self._caching:
+            slaves = self._get_cached(self._slaves_cache, service_name)
+            if slaves is not None:
+                return slaves
+            generation = self._generation(service_name)
         for sentinel in self.sentinels:
             try:
                 slaves = await sentinel.sentinel_slaves(service_name)
@@ -329,6 +513,10 @@ class Sentinel(AsyncSentinelCommands):
                 continue
             slaves = self.filter_slaves(slaves)
             if slaves:
+                if self._caching:
+                    self._set_cached(
+                        self._slaves_cache, service_name, slaves, generation
+                    )
                 return slaves
         return []
 
@@ -368,6 +556,8 @@ class Sentinel(AsyncSentinelCommands):
         connection_kwargs.update(kwargs)
 
         connection_pool = connection_pool_class(service_name, self, **connection_kwargs)
+        if self.watch_failover:
+            self._master_pools.add(connection_pool)
         # The Redis object "owns" the pool
         return redis_class.from_pool(connection_pool)
 
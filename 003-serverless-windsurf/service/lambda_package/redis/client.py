@@ -2,6 +2,7 @@ import copy
 import re
 import threading
 import time
+from collections import deque
 from itertools import chain
 from typing import (
     TYPE_CHECKING,
@@ -31,7 +32,7 @@ from redis.commands import (
     SentinelCommands,
     list_or_args,
 )
-from redis.commands.core import Script
+from redis.commands.core import EVALSHA_COMMANDS, Script, ScriptRegistry
 from redis.connection import (
     AbstractConnection,
     Connection,
@@ -50,12 +51,14 @@ from redis.event import (
 from redis.exceptions import (
     ConnectionError,
     ExecAbortError,
+    NoScriptError,
     PubSubError,
     RedisError,
     ResponseError,
     WatchError,
 )
 from redis.lock import Lock
+from redis.metrics import ClientMetrics, PubSubWorkerStats
 from redis.retry import Retry
 from redis.utils import (
     _set_info_logger,
@@ -244,6 +247,7 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
         cache: Optional[CacheInterface] = None,
         cache_config: Optional[CacheConfig] = None,
         event_dispatcher: Optional[EventDispatcher] = None,
+        metrics: Optional[ClientMetrics] = None,
     ) -> None:
         """
         Initialize a new Redis client.
@@ -271,6 +275,12 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
         single_connection_client:
             if `True`, connection pool is not used. In that case `Redis`
             instance use is not thread safe.
+
+        metrics:
+            a `ClientMetrics` in which the connection pool, its connections
+            and the client record pool wait times, connection counts, bytes
+            sent and received and command latencies, see
+            `ConnectionPool.collect_metrics()`.
         """
         if event_dispatcher is None:
             self._event_dispatcher = EventDispatcher()
@@ -298,6 +308,14 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
                 "credential_provider": credential_provider,
                 "protocol": protocol,
             }
+            if metrics is not None:
+                # collected metrics are dispatched to the client's listeners
+                kwargs.update(
+                    {
+                        "metrics": metrics,
+                        "event_dispatcher": self._event_dispatcher,
+                    }
+                )
             # based on input, setup appropriate connection args
             if unix_socket_path is not None:
                 kwargs.update(
@@ -338,7 +356,7 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
                             "ssl_ciphers": ssl_ciphers,
                         }
                     )
-                if (cache_config or cache) and protocol in [3, "3"]:
+                if cache_config or cache:
                     kwargs.update(
                         {
                             "cache": cache,
@@ -362,12 +380,6 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
 
         self.connection_pool = connection_pool
 
-        if (cache_config or cache) and self.connection_pool.get_protocol() not in [
-            3,
-            "3",
-        ]:
-            raise RedisError("Client caching is only supported with RESP version 3")
-
         self.single_connection_lock = threading.RLock()
         self.connection = None
         self._single_connection_client = single_connection_client
@@ -379,6 +391,8 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
                 )
             )
 
+        self.script_registry = ScriptRegistry()
+
         self.response_callbacks = CaseInsensitiveDict(_RedisCallbacks)
 
         if self.connection_pool.connection_kwargs.get("protocol") in ["3", 3]:
@@ -480,6 +494,8 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
         lock_class: Union[None, Any] = None,
         thread_local: bool = True,
         raise_on_release_error: bool = True,
+        notify: bool = False,
+        auto_renew: bool = False,
     ):
         """
         Return a new Lock object using key ``name`` that mimics
@@ -531,6 +547,12 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
         this is True, meaning an exception will be raised. If False, the warning
         will be logged and the exception will be suppressed.
 
+        ``notify`` makes blocking acquires wait for a signal pushed on release
+        instead of polling every ``sleep`` seconds, see :class:`Lock`.
+
+        ``auto_renew`` keeps renewing the lease of the lock in a background
+        thread until it's released, see :class:`Lock`.
+
         In some use cases it's necessary to disable thread local storage. For
         example, if you have code where one thread acquires a lock and passes
         that lock instance to a worker thread to release later. If thread
@@ -549,6 +571,8 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
             blocking_timeout=blocking_timeout,
             thread_local=thread_local,
             raise_on_release_error=raise_on_release_error,
+            notify=notify,
+            auto_renew=auto_renew,
         )
 
     def pubsub(self, **kwargs):
@@ -600,8 +624,16 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
         """
         Send a command and parse the response
         """
-        conn.send_command(*args, **options)
-        return self.parse_response(conn, command_name, **options)
+        metrics = getattr(conn, "metrics", None)
+        if metrics is None:
+            conn.send_command(*args, **options)
+            return self.parse_response(conn, command_name, **options)
+        started = time.perf_counter()
+        try:
+            conn.send_command(*args, **options)
+            return self.parse_response(conn, command_name, **options)
+        finally:
+            metrics.record_command(command_name, time.perf_counter() - started)
 
     def _close_connection(self, conn) -> None:
         """
@@ -629,6 +661,8 @@ class Redis(RedisModuleCommands, CoreCommands, SentinelCommands):
         if self._single_connection_client:
             self.single_connection_lock.acquire()
         try:
+            if command_name in EVALSHA_COMMANDS:
+                self.script_registry.attach(conn)
             return conn.retry.call_with_retry(
                 lambda: self._send_command_parse_response(
                     conn, command_name, *args, **options
@@ -1110,6 +1144,36 @@ class PubSub:
         before returning. Timeout should be specified as a floating point
         number, or None, to wait indefinitely.
         """
+        responses = self._read_responses(timeout, 1)
+        if responses:
+            return self.handle_message(responses[0], ignore_subscribe_messages)
+        return None
+
+    get_sharded_message = get_message
+
+    def get_messages(
+        self,
+        ignore_subscribe_messages: bool = False,
+        timeout: float = 0.0,
+        max_messages: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """
+        Like :meth:`get_message`, but once a message is available also return
+        the ones read along with it, up to ``max_messages``, instead of one
+        message per call.
+        """
+        messages = []
+        for response in self._read_responses(timeout, max_messages):
+            message = self.handle_message(response, ignore_subscribe_messages)
+            if message is not None:
+                messages.append(message)
+        return messages
+
+    def _read_responses(self, timeout: Optional[float], max_messages: int) -> List:
+        """
+        Wait up to ``timeout`` for a response, then read the ones that are
+        already available without blocking.
+        """
         if not self.subscribed:
             # Wait for subscription
             start_time = time.monotonic()
@@ -1122,14 +1186,18 @@ class PubSub:
             else:
                 # The connection isn't subscribed to any channels or patterns,
                 # so no messages are available
-                return None
+                return []
 
         response = self.parse_response(block=(timeout is None), timeout=timeout)
-        if response:
-            return self.handle_message(response, ignore_subscribe_messages)
-        return None
-
-    get_sharded_message = get_message
+        if not response:
+            return []
+        responses = [response]
+        while len(responses) < max_messages:
+            response = self.parse_response(block=False, timeout=0)
+            if not response:
+                break
+            responses.append(response)
+        return responses
 
     def ping(self, message: Union[str, None] = None) -> bool:
         """
@@ -1144,8 +1212,19 @@ class PubSub:
         with a message handler, the handler is invoked instead of a parsed
         message being returned.
         """
-        if response is None:
+        message, handler = self._parse_message(response, ignore_subscribe_messages)
+        if handler:
+            handler(message)
             return None
+        return message
+
+    def _parse_message(self, response, ignore_subscribe_messages=False):
+        """
+        Parse a pub/sub message and return it with the handler of its channel
+        or pattern, if any. The message is None if it should be ignored.
+        """
+        if response is None:
+            return None, None
         if isinstance(response, bytes):
             response = [b"pong", response] if response != b"PONG" else [b"pong", b""]
         message_type = str_if_bytes(response[0])
@@ -1202,22 +1281,36 @@ class PubSub:
             else:
                 handler = self.channels.get(message["channel"], None)
             if handler:
-                handler(message)
-                return None
+                return message, handler
         elif message_type != "pong":
             # this is a subscribe/unsubscribe message. ignore if we don't
             # want them
             if ignore_subscribe_messages or self.ignore_subscribe_messages:
-                return None
+                return None, None
 
-        return message
+        return message, None
 
     def run_in_thread(
         self,
         sleep_time: float = 0.0,
         daemon: bool = False,
         exception_handler: Optional[Callable] = None,
+        handler_threads: int = 0,
+        max_queue_size: int = 10000,
+        drop_when_full: bool = False,
+        batch_size: int = 1000,
     ) -> "PubSubWorkerThread":
+        """
+        Start a :class:`PubSubWorkerThread` calling the handlers of the
+        subscribed channels and patterns.
+
+        Every read drains up to ``batch_size`` available messages. With
+        ``handler_threads`` the handlers run on that many threads, fed by a
+        queue of at most ``max_queue_size`` messages, which also bounds the
+        batches. When the queue is full the reader waits for the handlers, or
+        drops the messages if ``drop_when_full`` is set.
+        :meth:`PubSubWorkerThread.stats` reports the lag and drops.
+        """
         for channel, handler in self.channels.items():
             if handler is None:
                 raise PubSubError(f"Channel: '{channel}' has no handler registered")
@@ -1231,13 +1324,27 @@ class PubSub:
                 )
 
         thread = PubSubWorkerThread(
-            self, sleep_time, daemon=daemon, exception_handler=exception_handler
+            self,
+            sleep_time,
+            daemon=daemon,
+            exception_handler=exception_handler,
+            handler_threads=handler_threads,
+            max_queue_size=max_queue_size,
+            drop_when_full=drop_when_full,
+            batch_size=batch_size,
         )
         thread.start()
         return thread
 
 
 class PubSubWorkerThread(threading.Thread):
+    """
+    Reads the messages of a :class:`PubSub` in batches and calls their
+    handlers, either on this thread or on ``handler_threads`` threads fed by
+    a bounded queue. With more than one handler thread, messages of
+    different batches may be handled out of order.
+    """
+
     def __init__(
         self,
         pubsub,
@@ -1246,13 +1353,32 @@ class PubSubWorkerThread(threading.Thread):
         exception_handler: Union[
             Callable[[Exception, "PubSub", "PubSubWorkerThread"], None], None
         ] = None,
+        handler_threads: int = 0,
+        max_queue_size: int = 10000,
+        drop_when_full: bool = False,
+        batch_size: int = 1000,
     ):
         super().__init__()
+        if max_queue_size < 1 or batch_size < 1:
+            raise ValueError('"max_queue_size" and "batch_size" must be positive')
+        if handler_threads:
+            # a batch is queued whole, so it must fit
+            batch_size = min(batch_size, max_queue_size)
         self.daemon = daemon
         self.pubsub = pubsub
         self.sleep_time = sleep_time
         self.exception_handler = exception_handler
+        self.handler_threads = handler_threads
+        self.max_queue_size = max_queue_size
+        self.drop_when_full = drop_when_full
+        self.batch_size = batch_size
         self._running = threading.Event()
+        # (message, handler, read at) waiting for a handler thread
+        self._queue = deque()
+        self._queue_cond = threading.Condition()
+        self._handlers: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self._stats = PubSubWorkerStats()
 
     def run(self) -> None:
         if self._running.is_set():
@@ -1260,14 +1386,116 @@ class PubSubWorkerThread(threading.Thread):
         self._running.set()
         pubsub = self.pubsub
         sleep_time = self.sleep_time
-        while self._running.is_set():
+        for i in range(self.handler_threads):
+            handler_thread = threading.Thread(
+                target=self._run_handlers,
+                name=f"{self.name}-handler-{i}",
+                daemon=self.daemon,
+            )
+            handler_thread.start()
+            self._handlers.append(handler_thread)
+        try:
+            while self._running.is_set():
+                try:
+                    responses = pubsub._read_responses(sleep_time, self.batch_size)
+                    if responses:
+                        self._dispatch(responses)
+                except BaseException as e:
+                    if self.exception_handler is None:
+                        raise
+                    self.exception_handler(e, pubsub, self)
+            pubsub.close()
+        finally:
+            self._stop_handlers()
+
+    def _dispatch(self, responses: List) -> None:
+        read_at = time.monotonic()
+        batch = []
+        for response in responses:
+            message, handler = self.pubsub._parse_message(
+                response, ignore_subscribe_messages=True
+            )
+            if handler:
+                batch.append((message, handler, read_at))
+        with self._stats_lock:
+            # the subscribe confirmations and the like aren't messages
+            self._stats.received += len(batch)
+            self._stats.batches += 1
+        if not self._handlers:
+            self._call_handlers(batch)
+            return
+        with self._queue_cond:
+            while not self.drop_when_full and (
+                len(self._queue) + len(batch) > self.max_queue_size
+                and self._running.is_set()
+            ):
+                self._queue_cond.wait(0.1)
+            room = self.max_queue_size - len(self._queue)
+            if len(batch) > room and self.drop_when_full:
+                dropped = len(batch) - max(room, 0)
+                batch = batch[: max(room, 0)]
+                with self._stats_lock:
+                    self._stats.dropped += dropped
+            self._queue.extend(batch)
+            self._queue_cond.notify_all()
+
+    def _call_handlers(self, batch: List) -> None:
+        for message, handler, read_at in batch:
+            started = time.monotonic()
             try:
-                pubsub.get_message(ignore_subscribe_messages=True, timeout=sleep_time)
+                handler(message)
             except BaseException as e:
                 if self.exception_handler is None:
                     raise
-                self.exception_handler(e, pubsub, self)
-        pubsub.close()
+                self.exception_handler(e, self.pubsub, self)
+            finally:
+                with self._stats_lock:
+                    self._stats.dispatched += 1
+                    self._stats.lag.record(started - read_at)
+
+    def _run_handlers(self) -> None:
+        while True:
+            with self._queue_cond:
+                while not self._queue and self._running.is_set():
+                    self._queue_cond.wait()
+                if not self._queue:
+                    # stopped and drained
+                    return
+                batch = [
+                    self._queue.popleft()
+                    for _ in range(min(self.batch_size, len(self._queue)))
+                ]
+                self._queue_cond.notify_all()
+            try:
+                self._call_handlers(batch)
+            except BaseException:
+                # like a handler failing on the reader thread, this ends
+                # the worker
+                self.stop()
+                raise
+
+    def _stop_handlers(self) -> None:
+        self._running.clear()
+        with self._queue_cond:
+            self._queue_cond.notify_all()
+        for handler_thread in self._handlers:
+            if handler_thread is not threading.current_thread():
+                handler_thread.join()
+        self._handlers = []
+
+    def stats(self) -> PubSubWorkerStats:
+        """Return the counters and the handler lag of this worker"""
+        with self._queue_cond:
+            queued = len(self._queue)
+        with self._stats_lock:
+            return PubSubWorkerStats(
+                received=self._stats.received,
+                dispatched=self._stats.dispatched,
+                dropped=self._stats.dropped,
+                batches=self._stats.batches,
+                queued=queued,
+                lag=self._stats.lag.copy(),
+            )
 
     def stop(self) -> None:
         # trip the flag so the run loop exits. the run loop will
@@ -1523,11 +1751,40 @@ class Pipeline(Redis):
                 response.append(self.parse_response(connection, args[0], **options))
             except ResponseError as e:
                 response.append(e)
+        if self.scripts:
+            self._rerun_flushed_scripts(connection, commands, response)
 
         if raise_on_error:
             self.raise_first_error(commands, response)
         return response
 
+    def _rerun_flushed_scripts(self, connection, commands, response) -> None:
+        # the scripts known to be loaded weren't checked, so a SCRIPT FLUSH
+        # by another client shows as NOSCRIPT: load them again and re-run
+        # the EVALSHA calls that failed
+        scripts = {s.sha: s for s in self.scripts}
+        failed = [
+            i
+            for i, r in enumerate(response)
+            if isinstance(r, NoScriptError)
+            and str_if_bytes(commands[i][0][1]) in scripts
+        ]
+        if not failed:
+            return
+        for s in scripts.values():
+            if s.registry is not None:
+                s.registry.forget(connection)
+        self.load_scripts()
+        rerun = [commands[i] for i in failed]
+        connection.send_packed_command(
+            connection.pack_commands([args for args, _ in rerun])
+        )
+        for i, (args, options) in zip(failed, rerun):
+            try:
+                response[i] = self.parse_response(connection, args[0], **options)
+            except ResponseError as e:
+                response[i] = e
+
     def raise_first_error(self, commands, response):
         for i, r in enumerate(response):
             if isinstance(r, ResponseError):
@@ -1551,8 +1808,19 @@ class Pipeline(Redis):
         return result
 
     def load_scripts(self):
-        # make sure all scripts that are about to be run on this pipeline exist
-        scripts = list(self.scripts)
+        # make sure all scripts that are about to be run on this pipeline exist,
+        # except those known to be loaded on the server of the connection. a
+        # transaction can't re-run an EVALSHA failing with NOSCRIPT after the
+        # other commands ran, so it always checks
+        conn = self.connection
+        check_all = conn is None or self.transaction or self.explicit_transaction
+        scripts = [
+            s
+            for s in self.scripts
+            if check_all or s.registry is None or not s.registry.is_loaded(conn, s.sha)
+        ]
+        if not scripts:
+            return
         immediate = self.immediate_execute_command
         shas = [s.sha for s in scripts]
         # we can't use the normal script_* methods because they would just
@@ -1562,6 +1830,9 @@ class Pipeline(Redis):
             for s, exist in zip(scripts, exists):
                 if not exist:
                     s.sha = immediate("SCRIPT LOAD", s.script)
+        for s in scripts:
+            if s.registry is not None:
+                s.registry.mark_loaded(self.connection, s.sha)
 
     def _disconnect_raise_on_watching(
         self,
@@ -1591,8 +1862,6 @@ class Pipeline(Redis):
         stack = self.command_stack
         if not stack and not self.watching:
             return []
-        if self.scripts:
-            self.load_scripts()
         if self.transaction or self.explicit_transaction:
             execute = self._execute_transaction
         else:
@@ -1605,11 +1874,20 @@ class Pipeline(Redis):
             # back to the pool after we're done
             self.connection = conn
 
+        scripts = self.scripts
         try:
+            if scripts:
+                self.load_scripts()
             return conn.retry.call_with_retry(
                 lambda: execute(conn, stack, raise_on_error),
                 lambda error: self._disconnect_raise_on_watching(conn, error),
             )
+        except NoScriptError:
+            # the script cache of the server was flushed, check it next time
+            for s in scripts:
+                if s.registry is not None:
+                    s.registry.forget(conn)
+            raise
         finally:
             self.reset()
 
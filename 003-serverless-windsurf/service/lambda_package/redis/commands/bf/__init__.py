@@ -1,8 +1,11 @@
+from typing import Optional
+
 from redis._parsers.helpers import bool_ok
 
 from ..helpers import get_protocol_version, parse_to_list
 from .commands import *  # noqa
 from .info import BFInfo, CFInfo, CMSInfo, TDigestInfo, TopKInfo
+from .prefilter import BloomPrefilter
 
 
 class AbstractBloom:
@@ -182,6 +185,25 @@ class CFBloom(CFCommands, AbstractBloom):
         for k, v in _MODULE_CALLBACKS.items():
             self.client.set_response_callback(k, v)
 
+    def prefilter(
+        self,
+        shadow_size: int = 100_000,
+        shadow_ttl: Optional[float] = None,
+        max_batch: int = 1000,
+    ) -> BloomPrefilter:
+        """Return a prefilter of the membership checks, see `BloomPrefilter`.
+
+        Usage example:
+
+        seen = r.cf().prefilter()
+        if not seen.exists("qr:texts", text):
+            seen.add("qr:texts", text)
+
+        """
+        return BloomPrefilter(
+            self, shadow_size=shadow_size, shadow_ttl=shadow_ttl, max_batch=max_batch
+        )
+
 
 class TDigestBloom(TDigestCommands, AbstractBloom):
     def __init__(self, client, **kwargs):
@@ -251,3 +273,22 @@ class BFBloom(BFCommands, AbstractBloom):
 
         for k, v in _MODULE_CALLBACKS.items():
             self.client.set_response_callback(k, v)
+
+    def prefilter(
+        self,
+        shadow_size: int = 100_000,
+        shadow_ttl: Optional[float] = None,
+        max_batch: int = 1000,
+    ) -> BloomPrefilter:
+        """Return a prefilter of the membership checks, see `BloomPrefilter`.
+
+        Usage example:
+
+        seen = r.bf().prefilter()
+        if not seen.exists("qr:texts", text):
+            seen.add("qr:texts", text)
+
+        """
+        return BloomPrefilter(
+            self, shadow_size=shadow_size, shadow_ttl=shadow_ttl, max_batch=max_batch
+        )
@@ -1,8 +1,12 @@
 # from __future__ import annotations
 
+import asyncio
 import datetime
 import hashlib
+import threading
 import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import (
     TYPE_CHECKING,
@@ -23,7 +27,13 @@ from typing import (
     Union,
 )
 
-from redis.exceptions import ConnectionError, DataError, NoScriptError, RedisError
+from redis.exceptions import (
+    ConnectionError,
+    DataError,
+    NoScriptError,
+    RedisError,
+    ResponseError,
+)
 from redis.typing import (
     AbsExpiryT,
     AnyKeyT,
@@ -48,6 +58,7 @@ from redis.typing import (
 from redis.utils import (
     deprecated_function,
     extract_expire_flags,
+    str_if_bytes,
 )
 
 from .helpers import list_or_args
@@ -2950,6 +2961,49 @@ class ListCommands(CommandsProtocol):
 AsyncListCommands = ListCommands
 
 
+def _scan_pages(fetch: Callable[[Any], Tuple[int, Any]], prefetch: bool) -> Iterator:
+    """
+    Yield the pages of a cursor based scan, ``fetch`` returning the next cursor
+    and page for a cursor. With ``prefetch`` the next page is requested by a
+    worker thread while the caller consumes the current one.
+    """
+    if not prefetch:
+        cursor = "0"
+        while cursor != 0:
+            cursor, data = fetch(cursor)
+            yield data
+        return
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(fetch, "0")
+        while future is not None:
+            cursor, data = future.result()
+            future = executor.submit(fetch, cursor) if cursor != 0 else None
+            yield data
+
+
+async def _async_scan_pages(
+    fetch: Callable[[Any], Awaitable[Tuple[int, Any]]], prefetch: bool
+) -> AsyncIterator:
+    """
+    Async version of :py:func:`_scan_pages`, prefetching with a task.
+    """
+    if not prefetch:
+        cursor = "0"
+        while cursor != 0:
+            cursor, data = await fetch(cursor)
+            yield data
+        return
+    task = asyncio.ensure_future(fetch("0"))
+    try:
+        while task is not None:
+            cursor, data = await task
+            task = asyncio.ensure_future(fetch(cursor)) if cursor != 0 else None
+            yield data
+    finally:
+        if task is not None:
+            task.cancel()
+
+
 class ScanCommands(CommandsProtocol):
     """
     Redis SCAN commands.
@@ -2994,6 +3048,8 @@ class ScanCommands(CommandsProtocol):
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
         _type: Optional[str] = None,
+        prefetch: bool = False,
+        batched: bool = False,
         **kwargs,
     ) -> Iterator:
         """
@@ -3009,13 +3065,24 @@ class ScanCommands(CommandsProtocol):
             Stock Redis instances allow for the following types:
             HASH, LIST, SET, STREAM, STRING, ZSET
             Additionally, Redis modules can expose other types as well.
+
+        ``prefetch`` requests the next page from a worker thread while the
+            current one is consumed.
+
+        ``batched`` yields the keys of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
-            cursor, data = self.scan(
+
+        def fetch(cursor):
+            return self.scan(
                 cursor=cursor, match=match, count=count, _type=_type, **kwargs
             )
-            yield from data
+
+        for data in _scan_pages(fetch, prefetch):
+            if not batched:
+                yield from data
+            elif data:
+                yield data
 
     def sscan(
         self,
@@ -3046,6 +3113,8 @@ class ScanCommands(CommandsProtocol):
         name: KeyT,
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
+        prefetch: bool = False,
+        batched: bool = False,
     ) -> Iterator:
         """
         Make an iterator using the SSCAN command so that the client doesn't
@@ -3054,11 +3123,22 @@ class ScanCommands(CommandsProtocol):
         ``match`` allows for filtering the keys by pattern
 
         ``count`` allows for hint the minimum number of returns
+
+        ``prefetch`` requests the next page from a worker thread while the
+            current one is consumed.
+
+        ``batched`` yields the members of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
-            cursor, data = self.sscan(name, cursor=cursor, match=match, count=count)
-            yield from data
+
+        def fetch(cursor):
+            return self.sscan(name, cursor=cursor, match=match, count=count)
+
+        for data in _scan_pages(fetch, prefetch):
+            if not batched:
+                yield from data
+            elif data:
+                yield data
 
     def hscan(
         self,
@@ -3095,6 +3175,8 @@ class ScanCommands(CommandsProtocol):
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
         no_values: Union[bool, None] = None,
+        prefetch: bool = False,
+        batched: bool = False,
     ) -> Iterator:
         """
         Make an iterator using the HSCAN command so that the client doesn't
@@ -3105,16 +3187,25 @@ class ScanCommands(CommandsProtocol):
         ``count`` allows for hint the minimum number of returns
 
         ``no_values`` indicates to return only the keys, without values
+
+        ``prefetch`` requests the next page from a worker thread while the
+            current one is consumed.
+
+        ``batched`` yields the fields of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
+
+        def fetch(cursor):
             cursor, data = self.hscan(
                 name, cursor=cursor, match=match, count=count, no_values=no_values
             )
-            if no_values:
+            return cursor, data if no_values else list(data.items())
+
+        for data in _scan_pages(fetch, prefetch):
+            if not batched:
                 yield from data
-            else:
-                yield from data.items()
+            elif data:
+                yield data
 
     def zscan(
         self,
@@ -3150,6 +3241,8 @@ class ScanCommands(CommandsProtocol):
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
         score_cast_func: Union[type, Callable] = float,
+        prefetch: bool = False,
+        batched: bool = False,
     ) -> Iterator:
         """
         Make an iterator using the ZSCAN command so that the client doesn't
@@ -3160,17 +3253,28 @@ class ScanCommands(CommandsProtocol):
         ``count`` allows for hint the minimum number of returns
 
         ``score_cast_func`` a callable used to cast the score return value
+
+        ``prefetch`` requests the next page from a worker thread while the
+            current one is consumed.
+
+        ``batched`` yields the members of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
-            cursor, data = self.zscan(
+
+        def fetch(cursor):
+            return self.zscan(
                 name,
                 cursor=cursor,
                 match=match,
                 count=count,
                 score_cast_func=score_cast_func,
             )
-            yield from data
+
+        for data in _scan_pages(fetch, prefetch):
+            if not batched:
+                yield from data
+            elif data:
+                yield data
 
 
 class AsyncScanCommands(ScanCommands):
@@ -3179,6 +3283,8 @@ class AsyncScanCommands(ScanCommands):
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
         _type: Optional[str] = None,
+        prefetch: bool = False,
+        batched: bool = False,
         **kwargs,
     ) -> AsyncIterator:
         """
@@ -3194,20 +3300,33 @@ class AsyncScanCommands(ScanCommands):
             Stock Redis instances allow for the following types:
             HASH, LIST, SET, STREAM, STRING, ZSET
             Additionally, Redis modules can expose other types as well.
+
+        ``prefetch`` requests the next page in a separate task while the
+            current one is consumed.
+
+        ``batched`` yields the keys of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
-            cursor, data = await self.scan(
+
+        def fetch(cursor):
+            return self.scan(
                 cursor=cursor, match=match, count=count, _type=_type, **kwargs
             )
-            for d in data:
-                yield d
+
+        async for data in _async_scan_pages(fetch, prefetch):
+            if not batched:
+                for d in data:
+                    yield d
+            elif data:
+                yield data
 
     async def sscan_iter(
         self,
         name: KeyT,
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
+        prefetch: bool = False,
+        batched: bool = False,
     ) -> AsyncIterator:
         """
         Make an iterator using the SSCAN command so that the client doesn't
@@ -3216,14 +3335,23 @@ class AsyncScanCommands(ScanCommands):
         ``match`` allows for filtering the keys by pattern
 
         ``count`` allows for hint the minimum number of returns
+
+        ``prefetch`` requests the next page in a separate task while the
+            current one is consumed.
+
+        ``batched`` yields the members of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
-            cursor, data = await self.sscan(
-                name, cursor=cursor, match=match, count=count
-            )
-            for d in data:
-                yield d
+
+        def fetch(cursor):
+            return self.sscan(name, cursor=cursor, match=match, count=count)
+
+        async for data in _async_scan_pages(fetch, prefetch):
+            if not batched:
+                for d in data:
+                    yield d
+            elif data:
+                yield data
 
     async def hscan_iter(
         self,
@@ -3231,6 +3359,8 @@ class AsyncScanCommands(ScanCommands):
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
         no_values: Union[bool, None] = None,
+        prefetch: bool = False,
+        batched: bool = False,
     ) -> AsyncIterator:
         """
         Make an iterator using the HSCAN command so that the client doesn't
@@ -3241,18 +3371,26 @@ class AsyncScanCommands(ScanCommands):
         ``count`` allows for hint the minimum number of returns
 
         ``no_values`` indicates to return only the keys, without values
+
+        ``prefetch`` requests the next page in a separate task while the
+            current one is consumed.
+
+        ``batched`` yields the fields of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
+
+        async def fetch(cursor):
             cursor, data = await self.hscan(
                 name, cursor=cursor, match=match, count=count, no_values=no_values
             )
-            if no_values:
+            return cursor, data if no_values else list(data.items())
+
+        async for data in _async_scan_pages(fetch, prefetch):
+            if not batched:
                 for it in data:
                     yield it
-            else:
-                for it in data.items():
-                    yield it
+            elif data:
+                yield data
 
     async def zscan_iter(
         self,
@@ -3260,6 +3398,8 @@ class AsyncScanCommands(ScanCommands):
         match: Union[PatternT, None] = None,
         count: Optional[int] = None,
         score_cast_func: Union[type, Callable] = float,
+        prefetch: bool = False,
+        batched: bool = False,
     ) -> AsyncIterator:
         """
         Make an iterator using the ZSCAN command so that the client doesn't
@@ -3270,18 +3410,29 @@ class AsyncScanCommands(ScanCommands):
         ``count`` allows for hint the minimum number of returns
 
         ``score_cast_func`` a callable used to cast the score return value
+
+        ``prefetch`` requests the next page in a separate task while the
+            current one is consumed.
+
+        ``batched`` yields the members of each reply as a list instead of one
+            by one.
         """
-        cursor = "0"
-        while cursor != 0:
-            cursor, data = await self.zscan(
+
+        def fetch(cursor):
+            return self.zscan(
                 name,
                 cursor=cursor,
                 match=match,
                 count=count,
                 score_cast_func=score_cast_func,
             )
-            for d in data:
-                yield d
+
+        async for data in _async_scan_pages(fetch, prefetch):
+            if not batched:
+                for d in data:
+                    yield d
+            elif data:
+                yield data
 
 
 class SetCommands(CommandsProtocol):
@@ -5671,6 +5822,8 @@ class Script:
     def __init__(self, registered_client: "redis.client.Redis", script: ScriptTextT):
         self.registered_client = registered_client
         self.script = script
+        # set when added to the client's ScriptRegistry
+        self.registry: Optional["ScriptRegistry"] = None
         # Precalculate and store the SHA1 hex digest of the script.
 
         if isinstance(script, str):
@@ -5738,6 +5891,8 @@ class AsyncScript:
     ):
         self.registered_client = registered_client
         self.script = script
+        # set when added to the client's AsyncScriptRegistry
+        self.registry: Optional["AsyncScriptRegistry"] = None
         # Precalculate and store the SHA1 hex digest of the script.
 
         if isinstance(script, str):
@@ -5779,6 +5934,159 @@ class AsyncScript:
             return await client.evalsha(self.sha, len(keys), *args)
 
 
+# Commands running a script by its SHA, their connections are attached to the
+# script registry of the client.
+EVALSHA_COMMANDS = frozenset(("EVALSHA", "EVALSHA_RO"))
+
+
+class _LoadedScripts:
+    """The SHAs known to be loaded on the server of one connection"""
+
+    def __init__(self, registry: "ScriptRegistry"):
+        self.registry = registry
+        self.shas: Set[str] = set()
+        # loaded or failed to load, e.g. not compiling, so not sent again
+        self.attempted: Set[str] = set()
+
+    def on_connect(self, connection) -> None:
+        # a new connection may reach another server, e.g. after a failover,
+        # or one restarted with an empty script cache
+        self.shas = set()
+        self.attempted = set()
+        self.load(connection, self.registry.get_scripts())
+
+    def load(self, connection, scripts: List[Script]) -> None:
+        """Load ``scripts`` with a single round trip"""
+        if not scripts:
+            return
+        self.attempted.update(s.sha for s in scripts)
+        connection.send_packed_command(
+            connection.pack_commands([("SCRIPT LOAD", s.script) for s in scripts]),
+            check_health=False,
+        )
+        for _ in scripts:
+            try:
+                sha = connection.read_response()
+            except ResponseError:
+                # e.g. a script that doesn't compile, EVALSHA reports it
+                continue
+            self.shas.add(str_if_bytes(sha))
+
+
+class ScriptRegistry:
+    """
+    The scripts registered with ``register_script`` on a client, and for
+    every connection that ran one of them, which ones are known to be loaded
+    on its server.
+
+    The first EVALSHA on a connection loads all registered scripts it misses
+    in one round trip, and every reconnect loads them again through a connect
+    callback, so EVALSHA doesn't fail with NOSCRIPT after a failover or a
+    restart. Pipelines that aren't transactions skip the SCRIPT EXISTS check
+    for scripts known to be loaded on their connection. A SCRIPT FLUSH by
+    another client can't be seen: EVALSHA then falls back to SCRIPT LOAD as
+    before, a pipeline loads the scripts again and re-runs the EVALSHA calls
+    that failed, and the state of the connection is dropped.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._scripts: Dict[str, Script] = {}
+        self._connections: "weakref.WeakKeyDictionary[Any, _LoadedScripts]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def add(self, script: Script) -> None:
+        with self._lock:
+            self._scripts.setdefault(script.sha, script)
+        script.registry = self
+
+    def get_scripts(self) -> List[Script]:
+        with self._lock:
+            return list(self._scripts.values())
+
+    def _get_loaded(self, connection) -> _LoadedScripts:
+        with self._lock:
+            try:
+                return self._connections[connection]
+            except KeyError:
+                loaded = self._connections[connection] = _LoadedScripts(self)
+        # kept alive by the dictionary as long as the connection is
+        connection.register_connect_callback(loaded.on_connect)
+        return loaded
+
+    def attach(self, connection) -> None:
+        """Load the registered scripts the server of ``connection`` misses"""
+        loaded = self._get_loaded(connection)
+        if len(loaded.attempted) < len(self._scripts):
+            loaded.load(
+                connection,
+                [s for s in self.get_scripts() if s.sha not in loaded.attempted],
+            )
+
+    def is_loaded(self, connection, sha: str) -> bool:
+        loaded = self._connections.get(connection)
+        return loaded is not None and sha in loaded.shas
+
+    def mark_loaded(self, connection, sha: str) -> None:
+        loaded = self._get_loaded(connection)
+        loaded.shas.add(sha)
+        loaded.attempted.add(sha)
+
+    def forget(self, connection) -> None:
+        """Drop the known state of ``connection``, e.g. after NOSCRIPT"""
+        loaded = self._connections.get(connection)
+        if loaded is not None:
+            loaded.shas = set()
+            loaded.attempted = set()
+
+
+class _AsyncLoadedScripts(_LoadedScripts):
+    async def on_connect(self, connection) -> None:
+        self.shas = set()
+        self.attempted = set()
+        await self.load(connection, self.registry.get_scripts())
+
+    async def load(self, connection, scripts: List[AsyncScript]) -> None:
+        if not scripts:
+            return
+        self.attempted.update(s.sha for s in scripts)
+        await connection.send_packed_command(
+            connection.pack_commands([("SCRIPT LOAD", s.script) for s in scripts]),
+            check_health=False,
+        )
+        for _ in scripts:
+            try:
+                sha = await connection.read_response()
+            except ResponseError:
+                continue
+            self.shas.add(str_if_bytes(sha))
+
+
+class AsyncScriptRegistry(ScriptRegistry):
+    """
+    :py:class:`ScriptRegistry` of an asyncio client.
+    """
+
+    def _get_loaded(self, connection) -> _AsyncLoadedScripts:
+        with self._lock:
+            try:
+                return self._connections[connection]
+            except KeyError:
+                loaded = self._connections[connection] = _AsyncLoadedScripts(self)
+        connection.register_connect_callback(loaded.on_connect)
+        return loaded
+
+    async def attach(self, connection) -> None:
+        """Load the registered scripts the server of ``connection`` misses"""
+        loaded = self._get_loaded(connection)
+        if len(loaded.attempted) < len(self._scripts):
+            await loaded.load(
+                connection,
+                [s for s in self.get_scripts() if s.sha not in loaded.attempted],
+            )
+
+
 class PubSubCommands(CommandsProtocol):
     """
     Redis PubSub commands.
@@ -5987,7 +6295,11 @@ class ScriptCommands(CommandsProtocol):
         deal with scripts, keys, and shas. This is the preferred way to work
         with Lua scripts.
         """
-        return Script(self, script)
+        registered = Script(self, script)
+        registry = getattr(self, "script_registry", None)
+        if registry is not None:
+            registry.add(registered)
+        return registered
 
 
 class AsyncScriptCommands(ScriptCommands):
@@ -6004,7 +6316,11 @@ class AsyncScriptCommands(ScriptCommands):
         deal with scripts, keys, and shas. This is the preferred way to work
         with Lua scripts.
         """
-        return AsyncScript(self, script)
+        registered = AsyncScript(self, script)
+        registry = getattr(self, "script_registry", None)
+        if registry is not None:
+            registry.add(registered)
+        return registered
 
 
 class GeoCommands(CommandsProtocol):
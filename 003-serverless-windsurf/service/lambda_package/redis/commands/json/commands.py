@@ -1,7 +1,9 @@
+import inspect
 import os
 from json import JSONDecodeError, loads
 from typing import Dict, List, Optional, Tuple, Union
 
+from redis.client import NEVER_DECODE
 from redis.exceptions import DataError
 from redis.utils import deprecated_function
 
@@ -174,7 +176,11 @@ class JSONCommands:
     forget = delete
 
     def get(
-        self, name: str, *args, no_escape: Optional[bool] = False
+        self,
+        name: str,
+        *args,
+        no_escape: Optional[bool] = False,
+        raw: Optional[bool] = False,
     ) -> Optional[List[JsonType]]:
         """
         Get the object stored as a JSON value at key ``name``.
@@ -182,6 +188,7 @@ class JSONCommands:
         ``args`` is zero or more paths, and defaults to root path
         ```no_escape`` is a boolean flag to add no_escape option to get
         non-ascii characters
+        ``raw`` returns the serialized JSON as bytes, without decoding it
 
         For more information see `JSON.GET <https://redis.io/commands/json.get>`_.
         """  # noqa
@@ -196,24 +203,55 @@ class JSONCommands:
             for p in args:
                 pieces.append(str(p))
 
+        options = {NEVER_DECODE: True, "raw": True} if raw else {}
         # Handle case where key doesn't exist. The JSONDecoder would raise a
         # TypeError exception since it can't decode None
         try:
-            return self.execute_command("JSON.GET", *pieces, keys=[name])
+            return self.execute_command("JSON.GET", *pieces, keys=[name], **options)
         except TypeError:
             return None
 
-    def mget(self, keys: List[str], path: str) -> List[JsonType]:
+    def mget(
+        self, keys: List[str], path: str, raw: Optional[bool] = False
+    ) -> List[JsonType]:
         """
         Get the objects stored as a JSON values under ``path``. ``keys``
         is a list of one or more keys.
 
+        ``raw`` returns the serialized JSON values as bytes, without decoding
+        them.
+
+        On a cluster the keys are split by hash slot, and the JSON.MGET of
+        every slot are sent through one pipeline, to all the nodes at once.
+
         For more information see `JSON.MGET <https://redis.io/commands/json.mget>`_.
         """  # noqa
+        options = {NEVER_DECODE: True, "raw": True} if raw else {}
+        # JSON pipelines don't have a client, they queue the command as is
+        client = getattr(self, "client", None)
+        if hasattr(client, "_partition_keys_by_slot"):
+            slots_to_keys = client._partition_keys_by_slot(keys)
+            if len(slots_to_keys) > 1:
+                return self._mget_by_slot(client, keys, slots_to_keys, path, options)
+
         pieces = []
         pieces += keys
         pieces.append(str(path))
-        return self.execute_command("JSON.MGET", *pieces, keys=keys)
+        return self.execute_command("JSON.MGET", *pieces, keys=keys, **options)
+
+    @staticmethod
+    def _mget_by_slot(client, keys, slots_to_keys, path, options):
+        slots_to_args = {
+            slot: slot_keys + [str(path)] for slot, slot_keys in slots_to_keys.items()
+        }
+        res = client._execute_pipeline_by_slot("JSON.MGET", slots_to_args, **options)
+        if inspect.isawaitable(res):
+
+            async def reorder():
+                return client._reorder_keys_by_command(keys, slots_to_args, await res)
+
+            return reorder()
+        return client._reorder_keys_by_command(keys, slots_to_args, res)
 
     def set(
         self,
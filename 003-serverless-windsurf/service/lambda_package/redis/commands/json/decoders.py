@@ -9,10 +9,10 @@ def bulk_of_jsons(d):
     bulk array response (list).
     """
 
-    def _f(b):
+    def _f(b, **options):
         for index, item in enumerate(b):
             if item is not None:
-                b[index] = d(item)
+                b[index] = d(item, **options)
         return b
 
     return _f
@@ -15,3 +15,35 @@ class Document:
     def __getitem__(self, item):
         value = getattr(self, item)
         return value
+
+
+class StreamedDocument:
+    """
+    A document yielded by ``search_iter``, without a ``__dict__``. The fields
+    are in a dict and can be read as attributes, like those of a `Document`.
+    """
+
+    __slots__ = ("id", "score", "payload", "fields")
+
+    def __init__(self, id, score=None, payload=None, fields=None):
+        self.id = id
+        self.score = score
+        self.payload = payload
+        self.fields = fields if fields is not None else {}
+
+    def __repr__(self):
+        return f"StreamedDocument {self.id!r} {self.fields}"
+
+    def __getattr__(self, item):
+        if item in StreamedDocument.__slots__:
+            # an unset slot, e.g. while unpickling
+            raise AttributeError(item)
+        try:
+            return self.fields[item]
+        except KeyError:
+            raise AttributeError(item) from None
+
+    def __getitem__(self, item):
+        if item in self.__slots__:
+            return getattr(self, item)
+        return self.fields[item]
@@ -0,0 +1,213 @@
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import redis
+from redis.exceptions import RedisError, ResponseError
+from redis.typing import KeyT, Number
+
+logger = logging.getLogger(__name__)
+
+# RESP framing, timestamp and value of a sample on top of its key
+SAMPLE_OVERHEAD = 48
+
+SampleT = Tuple[KeyT, Union[int, str], Number]
+
+
+class TimeSeriesWriter:
+    """
+    Buffers samples and writes them with TS.MADD, in batches of up to
+    ``batch_bytes`` bytes. A background thread sends whatever is buffered
+    every ``flush_interval`` seconds, so a sample waits at most that long.
+    With ``flush_interval=None`` there is no thread and batches are sent by
+    ``add`` once full, or by ``flush``.
+
+    Once ``max_buffer_bytes`` are buffered, ``add`` blocks until the
+    buffer is flushed, so producers slow down to the rate the server
+    accepts samples at.
+
+    Samples added with ``labels`` create their series on the first write,
+    with ``create_options`` passed to TS.CREATE. Series that already exist
+    are left as they are.
+
+    A sample the server refuses is counted in ``failed`` and passed to
+    ``on_error`` along with the error, if given. An error sending a whole
+    batch is also raised by the next call to ``add``, ``flush`` or
+    ``close``.
+
+    The writer needs a synchronous client.
+    """
+
+    def __init__(
+        self,
+        ts,
+        batch_bytes: int = 64 * 1024,
+        flush_interval: Optional[float] = 0.1,
+        max_buffer_bytes: int = 4 * 1024 * 1024,
+        create_options: Optional[Dict] = None,
+        on_error: Optional[Callable[[SampleT, Exception], None]] = None,
+    ):
+        self.ts = ts
+        self.batch_bytes = batch_bytes
+        self.flush_interval = flush_interval
+        self.max_buffer_bytes = max(max_buffer_bytes, batch_bytes)
+        self.create_options = create_options or {}
+        self.on_error = on_error
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+        self._samples: List[SampleT] = []
+        self._creates: Dict[KeyT, Dict] = {}
+        self._created = set()
+        self._buffer_bytes = 0
+        self._error: Optional[Exception] = None
+        self._cond = threading.Condition()
+        # serializes the batches, so samples of a series are written in order
+        self._send_lock = threading.Lock()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        if flush_interval is not None:
+            self._thread = threading.Thread(
+                target=self._run, name="redis-ts-writer", daemon=True
+            )
+            self._thread.start()
+
+    def __enter__(self) -> "TimeSeriesWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def add(
+        self,
+        key: KeyT,
+        timestamp: Union[int, str],
+        value: Number,
+        labels: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Buffer the sample ``value`` at ``timestamp``, in milliseconds or
+        ``"*"`` for the server's clock, for the series ``key``.
+        """
+        with self._cond:
+            self._raise_error()
+            if self._closed:
+                raise RedisError("TimeSeriesWriter is closed")
+            while self._thread is not None and (
+                self._buffer_bytes >= self.max_buffer_bytes
+            ):
+                self._cond.notify_all()
+                self._cond.wait()
+                self._raise_error()
+            if labels is not None and key not in self._created:
+                self._created.add(key)
+                self._creates[key] = labels
+            self._samples.append((key, timestamp, value))
+            self._buffer_bytes += len(key) + SAMPLE_OVERHEAD
+            full = self._buffer_bytes >= self.batch_bytes
+            if full and self._thread is not None:
+                self._cond.notify_all()
+        if full and self._thread is None:
+            self._flush()
+
+    def flush(self) -> None:
+        """Send the buffered samples and wait for the replies"""
+        self._flush()
+        with self._cond:
+            self._raise_error()
+
+    def close(self) -> None:
+        """Flush the buffered samples and stop the background thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and self._buffer_bytes < self.batch_bytes:
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    return
+            self._flush()
+
+    def _flush(self) -> None:
+        with self._send_lock:
+            while True:
+                with self._cond:
+                    if not self._samples:
+                        self._cond.notify_all()
+                        return
+                    samples, creates = self._take_batch()
+                    # wake producers blocked on a full buffer
+                    self._cond.notify_all()
+                try:
+                    self._send(samples, creates)
+                except Exception as e:
+                    logger.warning("Failed to write %d samples: %s", len(samples), e)
+                    with self._cond:
+                        self._error = e
+                        self.failed += len(samples)
+                        # create them along with the next samples instead
+                        self._created.difference_update(creates)
+
+    def _take_batch(self) -> Tuple[List[SampleT], Dict[KeyT, Dict]]:
+        size = 0
+        for i, (key, _, _) in enumerate(self._samples):
+            size += len(key) + SAMPLE_OVERHEAD
+            if size >= self.batch_bytes:
+                break
+        samples = self._samples[: i + 1]
+        del self._samples[: i + 1]
+        self._buffer_bytes -= size
+        creates = {}
+        for key, _, _ in samples:
+            if key in self._creates:
+                creates[key] = self._creates.pop(key)
+        return samples, creates
+
+    def _send(self, samples: List[SampleT], creates: Dict[KeyT, Dict]) -> None:
+        client = self.ts.client
+        if isinstance(client, redis.RedisCluster):
+            # TS.MADD can't span hash slots
+            groups: Dict[int, List[SampleT]] = {}
+            for sample in samples:
+                groups.setdefault(client.keyslot(sample[0]), []).append(sample)
+            batches = list(groups.values())
+        else:
+            batches = [samples]
+
+        pipe = self.ts.pipeline(transaction=False)
+        for key, labels in creates.items():
+            pipe.create(key, labels=labels, **self.create_options)
+        for batch in batches:
+            pipe.madd(batch)
+        results = pipe.execute(raise_on_error=False)
+
+        sent = failed = 0
+        for key, result in zip(creates, results):
+            if isinstance(result, ResponseError) and "exists" not in str(result):
+                logger.warning("Failed to create time series %r: %s", key, result)
+        for batch, result in zip(batches, results[len(creates) :]):
+            if isinstance(result, Exception):
+                result = [result] * len(batch)
+            for sample, sample_result in zip(batch, result):
+                if isinstance(sample_result, Exception):
+                    failed += 1
+                    if self.on_error is not None:
+                        self.on_error(sample, sample_result)
+                else:
+                    sent += 1
+        with self._cond:
+            self.sent += sent
+            self.failed += failed
+            self.batches += 1
@@ -14,6 +14,7 @@ from .commands import (
     VINFO_CMD,
     VLINKS_CMD,
     VSIM_CMD,
+    AsyncVectorSetCommands,
     VectorSetCommands,
 )
 
@@ -24,12 +25,12 @@ class VectorSet(VectorSetCommands):
         # Set the module commands' callbacks
         self._MODULE_CALLBACKS = {
             VEMB_CMD: parse_vemb_result,
+            VSIM_CMD: parse_vsim_result,
             VGETATTR_CMD: lambda r: r and json.loads(r) or None,
         }
 
         self._RESP2_MODULE_CALLBACKS = {
             VINFO_CMD: lambda r: r and pairs_to_dict(r) or None,
-            VSIM_CMD: parse_vsim_result,
             VLINKS_CMD: parse_vlinks_result,
         }
         self._RESP3_MODULE_CALLBACKS = {}
@@ -44,3 +45,7 @@ class VectorSet(VectorSetCommands):
 
         for k, v in self._MODULE_CALLBACKS.items():
             self.client.set_response_callback(k, v)
+
+
+class AsyncVectorSet(VectorSet, AsyncVectorSetCommands):
+    """Async VectorSet client."""
@@ -6,7 +6,8 @@ import threading
 import time
 import weakref
 from abc import abstractmethod
-from itertools import chain
+from collections import deque
+from itertools import chain, count
 from queue import Empty, Full, LifoQueue
 from typing import Any, Callable, Dict, List, Optional, Type, TypeVar, Union
 from urllib.parse import parse_qs, unquote, urlparse
@@ -24,7 +25,11 @@ from ._parsers import Encoder, _HiredisParser, _RESP2Parser, _RESP3Parser
 from .auth.token import TokenInterface
 from .backoff import NoBackoff
 from .credentials import CredentialProvider, UsernamePasswordCredentialProvider
-from .event import AfterConnectionReleasedEvent, EventDispatcher
+from .event import (
+    AfterConnectionReleasedEvent,
+    EventDispatcher,
+    PoolMetricsCollectedEvent,
+)
 from .exceptions import (
     AuthenticationError,
     AuthenticationWrongNumberOfArgsError,
@@ -36,6 +41,7 @@ from .exceptions import (
     ResponseError,
     TimeoutError,
 )
+from .metrics import ClientMetrics, MetricsSnapshot
 from .retry import Retry
 from .utils import (
     CRYPTOGRAPHY_AVAILABLE,
@@ -143,6 +149,9 @@ class PythonRespSerializer:
 
 
 class ConnectionInterface:
+    # when the socket connected, on the monotonic clock, None if disconnected
+    connected_at: Optional[float] = None
+
     @abstractmethod
     def repr_pieces(self):
         pass
@@ -250,6 +259,7 @@ class AbstractConnection(ConnectionInterface):
         protocol: Optional[int] = 2,
         command_packer: Optional[Callable[[], None]] = None,
         event_dispatcher: Optional[EventDispatcher] = None,
+        metrics: Optional[ClientMetrics] = None,
     ):
         """
         Initialize a new Connection.
@@ -257,6 +267,8 @@ class AbstractConnection(ConnectionInterface):
         `retry_on_error` to a list of the error/s to retry on, then set
         `retry` to a valid `Retry` object.
         To retry on TimeoutError, `retry_on_timeout` can also be set to `True`.
+        Connects, disconnects and bytes sent and received are counted in
+        `metrics`, if given.
         """
         if (username or password) and credential_provider is not None:
             raise DataError(
@@ -269,6 +281,7 @@ class AbstractConnection(ConnectionInterface):
             self._event_dispatcher = EventDispatcher()
         else:
             self._event_dispatcher = event_dispatcher
+        self.metrics = metrics
         self.pid = os.getpid()
         self.db = db
         self.client_name = client_name
@@ -408,6 +421,9 @@ class AbstractConnection(ConnectionInterface):
             # clean up after any error in on_connect
             self.disconnect()
             raise
+        self.connected_at = time.monotonic()
+        if self.metrics is not None:
+            self.metrics.record_connect()
 
         # run any user callbacks. right now the only internal callback
         # is for pubsub channel/pattern resubscription
@@ -549,8 +565,11 @@ class AbstractConnection(ConnectionInterface):
 
         conn_sock = self._sock
         self._sock = None
+        self.connected_at = None
         if conn_sock is None:
             return
+        if self.metrics is not None:
+            self.metrics.record_disconnect()
 
         if os.getpid() == self.pid:
             try:
@@ -590,6 +609,8 @@ class AbstractConnection(ConnectionInterface):
                 command = [command]
             for item in command:
                 self._sock.sendall(item)
+            if self.metrics is not None:
+                self.metrics.record_bytes_sent(sum(map(len, command)))
         except socket.timeout:
             self.disconnect()
             raise TimeoutError("Timeout writing to socket")
@@ -821,6 +842,7 @@ class CacheProxyConnection(ConnectionInterface):
         self.pid = os.getpid()
         self._conn = conn
         self.retry = self._conn.retry
+        self.metrics = getattr(conn, "metrics", None)
         self.host = self._conn.host
         self.port = self._conn.port
         self.credential_provider = conn.credential_provider
@@ -834,6 +856,10 @@ class CacheProxyConnection(ConnectionInterface):
     def repr_pieces(self):
         return self._conn.repr_pieces()
 
+    @property
+    def connected_at(self) -> Optional[float]:
+        return self._conn.connected_at
+
     def register_connect_callback(self, callback):
         self._conn.register_connect_callback(callback)
 
@@ -905,13 +931,10 @@ class CacheProxyConnection(ConnectionInterface):
             # We have to trigger invalidation processing in case if
             # it was cached by another connection to avoid
             # queueing invalidations in stale connections.
-            if self._cache.get(self._current_command_cache_key):
-                entry = self._cache.get(self._current_command_cache_key)
-
+            entry = self._cache.get(self._current_command_cache_key)
+            if entry:
                 if entry.connection_ref != self._conn:
-                    with self._pool_lock:
-                        while entry.connection_ref.can_read():
-                            entry.connection_ref.read_response(push_request=True)
+                    self._process_connection_invalidations(entry.connection_ref)
 
                 return
 
@@ -938,15 +961,13 @@ class CacheProxyConnection(ConnectionInterface):
     ):
         with self._cache_lock:
             # Check if command response exists in a cache and it's not in progress.
-            if (
-                self._current_command_cache_key is not None
-                and self._cache.get(self._current_command_cache_key) is not None
-                and self._cache.get(self._current_command_cache_key).status
-                != CacheEntryStatus.IN_PROGRESS
-            ):
-                res = copy.deepcopy(
-                    self._cache.get(self._current_command_cache_key).cache_value
-                )
+            # The lookup was already accounted for by send_command(), so the
+            # collection is read directly.
+            entry = None
+            if self._current_command_cache_key is not None:
+                entry = self._cache.collection.get(self._current_command_cache_key)
+            if entry is not None and entry.status != CacheEntryStatus.IN_PROGRESS:
+                res = copy.deepcopy(entry.cache_value)
                 self._current_command_cache_key = None
                 return res
 
@@ -965,7 +986,7 @@ class CacheProxyConnection(ConnectionInterface):
                 self._cache.delete_by_cache_keys([self._current_command_cache_key])
                 return response
 
-            cache_entry = self._cache.get(self._current_command_cache_key)
+            cache_entry = self._cache.collection.get(self._current_command_cache_key)
 
             # Cache only responses that still valid
             # and wasn't invalidated by another connection in meantime.
@@ -1003,6 +1024,11 @@ class CacheProxyConnection(ConnectionInterface):
         while self.can_read():
             self._conn.read_response(push_request=True)
 
+    def _process_connection_invalidations(self, conn: ConnectionInterface):
+        with self._pool_lock:
+            while conn.can_read():
+                conn.read_response(push_request=True)
+
     def _on_invalidation_callback(self, data: List[Union[str, Optional[List[bytes]]]]):
         with self._cache_lock:
             # Flush cache when DB flushed on server-side
@@ -1021,6 +1047,126 @@ class CacheProxyConnection(ConnectionInterface):
         self._conn.re_auth()
 
 
+class CacheInvalidationListener:
+    """
+    Dedicated connection subscribed to the ``__redis__:invalidate`` channel.
+
+    Connections that enable key tracking with ``CLIENT TRACKING ON REDIRECT``
+    have their invalidation messages delivered here instead of as RESP3 push
+    messages, which makes client-side caching available over RESP2. Pending
+    messages are applied to the cache before every cached read. If the
+    listener loses its connection, invalidations may have been missed, so
+    the cache is flushed and tracking is redirected to the new connection.
+    """
+
+    CHANNEL = "__redis__:invalidate"
+
+    def __init__(self, conn: ConnectionInterface, cache: CacheInterface):
+        self.pid = os.getpid()
+        self.lock = threading.RLock()
+        self.client_id: Optional[int] = None
+        self._conn = conn
+        self._cache = cache
+
+    def ensure_connected(self) -> int:
+        """Connects and subscribes if needed, returns the listener client id"""
+        with self.lock:
+            self._checkpid()
+            if self.client_id is not None:
+                return self.client_id
+            try:
+                self._conn.connect()
+                self._conn.send_command("CLIENT", "ID", check_health=False)
+                client_id = int(self._conn.read_response())
+                self._conn.send_command("SUBSCRIBE", self.CHANNEL, check_health=False)
+                self._conn.read_response()
+            except BaseException:
+                self._conn.disconnect()
+                raise
+            self.client_id = client_id
+            return client_id
+
+    def process_pending(self) -> None:
+        """Applies every invalidation message already received"""
+        with self.lock:
+            self._checkpid()
+            if self.client_id is None:
+                return
+            try:
+                while self._conn.can_read():
+                    self._handle_message(self._conn.read_response())
+            except (ConnectionError, TimeoutError, OSError):
+                self._reset()
+
+    def disconnect(self) -> None:
+        with self.lock:
+            self._reset()
+
+    def _handle_message(self, message) -> None:
+        if not isinstance(message, list) or str_if_bytes(message[0]) != "message":
+            return
+        # Flush cache when DB flushed on server-side
+        if message[2] is None:
+            self._cache.flush()
+        else:
+            self._cache.delete_by_redis_keys(message[2])
+
+    def _reset(self) -> None:
+        self.client_id = None
+        self._conn.disconnect()
+        self._cache.flush()
+
+    def _checkpid(self) -> None:
+        # the parent process keeps using the inherited socket
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self._reset()
+
+
+class RedirectCacheProxyConnection(CacheProxyConnection):
+    """
+    Client-side caching proxy for RESP2 connections. Key tracking is
+    redirected to a shared :class:`CacheInvalidationListener`, since RESP2
+    connections cannot receive invalidation push messages themselves.
+    """
+
+    def __init__(
+        self,
+        conn: ConnectionInterface,
+        cache: CacheInterface,
+        pool_lock: threading.RLock,
+        listener: CacheInvalidationListener,
+    ):
+        self._listener = listener
+        self._redirect_id = None
+        super().__init__(conn, cache, pool_lock)
+        # Invalidations are applied by the listener for every connection,
+        # so all of them have to synchronize on the same lock.
+        self._cache_lock = listener.lock
+
+    def connect(self):
+        # Server version is only available from the RESP3 HELLO handshake,
+        # an unsupported server rejects CLIENT TRACKING instead.
+        self._conn.connect()
+
+    def _enable_tracking_callback(self, conn: ConnectionInterface) -> None:
+        client_id = self._listener.ensure_connected()
+        conn.send_command("CLIENT", "TRACKING", "ON", "REDIRECT", client_id)
+        conn.read_response()
+        self._redirect_id = client_id
+
+    def _process_pending_invalidations(self):
+        self._listener.process_pending()
+        if self._redirect_id is not None and self._redirect_id != (
+            self._listener.client_id
+        ):
+            # The listener reconnected under a new client id.
+            self._enable_tracking_callback(self._conn)
+
+    def _process_connection_invalidations(self, conn: ConnectionInterface):
+        self._listener.process_pending()
+
+
 class SSLConnection(Connection):
     """Manages SSL connections to and from the Redis server(s).
     This class extends the Connection class, adding SSL functionality, and making
@@ -1249,6 +1395,9 @@ URL_QUERY_ARGUMENT_PARSERS = {
     "health_check_interval": int,
     "ssl_check_hostname": to_bool,
     "timeout": float,
+    "min_idle": int,
+    "max_idle_time": float,
+    "max_lifetime": float,
 }
 
 
@@ -1312,6 +1461,24 @@ def parse_url(url):
 _CP = TypeVar("_CP", bound="ConnectionPool")
 
 
+def _maintain_pool(pool_ref: "weakref.ref", stop: threading.Event) -> None:
+    # Only a weak reference is kept, so the thread doesn't keep an otherwise
+    # unused pool alive.
+    while not stop.is_set():
+        pool = pool_ref()
+        if pool is None:
+            return
+        interval = pool.maintenance_interval
+        try:
+            pool.maintain()
+        except Exception:
+            # the next pass will retry, the request path still validates
+            # every connection it hands out
+            pass
+        del pool
+        stop.wait(interval)
+
+
 class ConnectionPool:
     """
     Create a connection pool. ``If max_connections`` is set, then this
@@ -1323,6 +1490,15 @@ class ConnectionPool:
     unix sockets.
     :py:class:`~redis.SSLConnection` can be used for SSL enabled connections.
 
+    If any of ``min_idle``, ``max_idle_time`` or ``max_lifetime`` is set, a
+    daemon thread maintains the pool every ``maintenance_interval`` seconds:
+    it opens connections until ``min_idle`` of them are idle, closes
+    connections idle for more than ``max_idle_time`` seconds (keeping
+    ``min_idle``) or connected for more than ``max_lifetime`` seconds, and
+    checks the health of the idle ones, so that none of this happens on the
+    request path. Connections past ``max_lifetime`` are also closed when
+    released.
+
     Any additional keyword arguments are passed to the constructor of
     ``connection_class``.
     """
@@ -1381,22 +1557,35 @@ class ConnectionPool:
         connection_class=Connection,
         max_connections: Optional[int] = None,
         cache_factory: Optional[CacheFactoryInterface] = None,
+        min_idle: int = 0,
+        max_idle_time: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+        maintenance_interval: float = 1.0,
         **connection_kwargs,
     ):
         max_connections = max_connections or 2**31
         if not isinstance(max_connections, int) or max_connections < 0:
             raise ValueError('"max_connections" must be a positive integer')
+        if not isinstance(min_idle, int) or not 0 <= min_idle <= max_connections:
+            raise ValueError('"min_idle" must be between 0 and "max_connections"')
 
         self.connection_class = connection_class
         self.connection_kwargs = connection_kwargs
         self.max_connections = max_connections
+        self.min_idle = min_idle
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.maintenance_interval = maintenance_interval
+        self._maintenance_enabled = bool(
+            min_idle or max_idle_time is not None or max_lifetime is not None
+        )
+        self._maintenance_stop: Optional[threading.Event] = None
         self.cache = None
         self._cache_factory = cache_factory
 
-        if connection_kwargs.get("cache_config") or connection_kwargs.get("cache"):
-            if connection_kwargs.get("protocol") not in [3, "3"]:
-                raise RedisError("Client caching is only supported with RESP version 3")
+        self._invalidation_listener = None
 
+        if connection_kwargs.get("cache_config") or connection_kwargs.get("cache"):
             cache = self.connection_kwargs.get("cache")
 
             if cache is not None:
@@ -1415,9 +1604,17 @@ class ConnectionPool:
         connection_kwargs.pop("cache", None)
         connection_kwargs.pop("cache_config", None)
 
+        if self.cache is not None and connection_kwargs.get("protocol") not in [3, "3"]:
+            # RESP2 connections can't receive invalidation push messages,
+            # they redirect them to a dedicated Pub/Sub connection instead.
+            self._invalidation_listener = CacheInvalidationListener(
+                self.connection_class(**self.connection_kwargs), self.cache
+            )
+
         self._event_dispatcher = self.connection_kwargs.get("event_dispatcher", None)
         if self._event_dispatcher is None:
             self._event_dispatcher = EventDispatcher()
+        self.metrics: Optional[ClientMetrics] = self.connection_kwargs.get("metrics")
 
         # a lock to protect the critical section in _checkpid().
         # this lock is acquired when the process id changes, such as
@@ -1433,6 +1630,9 @@ class ConnectionPool:
 
         self.reset()
 
+        if self._maintenance_enabled:
+            self._start_maintenance()
+
     def __repr__(self) -> str:
         conn_kwargs = ",".join([f"{k}={v}" for k, v in self.connection_kwargs.items()])
         return (
@@ -1453,6 +1653,7 @@ class ConnectionPool:
         self._created_connections = 0
         self._available_connections = []
         self._in_use_connections = set()
+        self._reset_maintenance()
 
         # this must be the last operation in this method. while reset() is
         # called when holding _fork_lock, other threads in this process
@@ -1520,12 +1721,21 @@ class ConnectionPool:
     def get_connection(self, command_name=None, *keys, **options) -> "Connection":
         "Get a connection from the pool"
 
+        if self.metrics is not None:
+            started = time.perf_counter()
         self._checkpid()
+        if self._maintenance_enabled and self._maintenance_stop is None:
+            self._start_maintenance()
         with self._lock:
             try:
                 connection = self._available_connections.pop()
             except IndexError:
-                connection = self.make_connection()
+                try:
+                    connection = self.make_connection()
+                except MaxConnectionsError:
+                    if self.metrics is not None:
+                        self.metrics.record_pool_exhausted()
+                    raise
             self._in_use_connections.add(connection)
 
         try:
@@ -1549,6 +1759,8 @@ class ConnectionPool:
             self.release(connection)
             raise
 
+        if self.metrics is not None:
+            self.metrics.record_pool_wait(time.perf_counter() - started)
         return connection
 
     def get_encoder(self) -> Encoder:
@@ -1567,21 +1779,30 @@ class ConnectionPool:
         self._created_connections += 1
 
         if self.cache is not None:
-            return CacheProxyConnection(
-                self.connection_class(**self.connection_kwargs), self.cache, self._lock
-            )
+            return self._make_cache_proxy_connection()
 
         return self.connection_class(**self.connection_kwargs)
 
+    def _make_cache_proxy_connection(self) -> "ConnectionInterface":
+        conn = self.connection_class(**self.connection_kwargs)
+        if self._invalidation_listener is not None:
+            return RedirectCacheProxyConnection(
+                conn, self.cache, self._lock, self._invalidation_listener
+            )
+        return CacheProxyConnection(conn, self.cache, self._lock)
+
     def release(self, connection: "Connection") -> None:
         "Releases the connection back to the pool"
         self._checkpid()
+        if self._maintenance_enabled and self._release_expired(connection):
+            return
         with self._lock:
             try:
                 self._in_use_connections.remove(connection)
             except KeyError:
                 # Gracefully fail when a connection is returned to this pool
                 # that the pool doesn't actually own
+                self._forget_connection(connection)
                 return
 
             if self.owns_connection(connection):
@@ -1594,6 +1815,7 @@ class ConnectionPool:
                 # to the pool.
                 # The created connections count should not be changed,
                 # because the connection was not created by the pool.
+                self._forget_connection(connection)
                 connection.disconnect()
                 return
 
@@ -1609,6 +1831,7 @@ class ConnectionPool:
         connections that are idle in the pool.
         """
         self._checkpid()
+        self._stop_maintenance()
         with self._lock:
             if inuse_connections:
                 connections = chain(
@@ -1620,10 +1843,166 @@ class ConnectionPool:
             for connection in connections:
                 connection.disconnect()
 
+            if self._invalidation_listener is not None:
+                self._invalidation_listener.disconnect()
+
     def close(self) -> None:
         """Close the pool, disconnecting all connections"""
         self.disconnect()
 
+    def collect_metrics(self) -> Optional[MetricsSnapshot]:
+        """
+        Return a snapshot of the pool's ``metrics``, with the number of
+        connections in use and idle, and dispatch it as a
+        :py:class:`~redis.event.PoolMetricsCollectedEvent`. Returns None if
+        the pool has no ``metrics``.
+        """
+        if self.metrics is None:
+            return None
+        snapshot = self.metrics.snapshot()
+        idle = len(self._get_idle_connections())
+        snapshot.idle_connections = idle
+        snapshot.in_use_connections = self._count_connections() - idle
+        self._event_dispatcher.dispatch(PoolMetricsCollectedEvent(self, snapshot))
+        return snapshot
+
+    def _count_connections(self) -> int:
+        with self._lock:
+            return len(self._available_connections) + len(self._in_use_connections)
+
+    def maintain(self) -> None:
+        """
+        Run a single maintenance pass, see the class docstring. Idle
+        connections are checked one at a time, so the others stay available.
+        """
+        self._checkpid()
+        now = time.monotonic()
+        idle = sorted(
+            self._get_idle_connections(),
+            key=lambda conn: self._idle_since.get(conn, now),
+            reverse=True,
+        )
+        kept = 0
+        for connection in idle:
+            reap = self._is_expired(connection, now) or (
+                self.max_idle_time is not None
+                and kept >= self.min_idle
+                and now - self._idle_since.get(connection, now) > self.max_idle_time
+            )
+            if not self._take_idle_connection(connection):
+                # checked out in the meantime
+                continue
+            if reap or not self._is_healthy(connection):
+                self._discard_connection(connection)
+            else:
+                self._return_idle_connection(connection)
+                kept += 1
+        while kept < self.min_idle and self._add_idle_connection():
+            kept += 1
+
+    def _reset_maintenance(self) -> None:
+        # a maintenance thread doesn't survive a fork, get_connection()
+        # starts a new one
+        self._maintenance_stop = None
+        self._idle_since: Dict[ConnectionInterface, float] = {}
+
+    def _start_maintenance(self) -> None:
+        with self._lock:
+            if self._maintenance_stop is not None:
+                return
+            self._maintenance_stop = threading.Event()
+            threading.Thread(
+                target=_maintain_pool,
+                args=(weakref.ref(self), self._maintenance_stop),
+                name=f"redis-pool-maintenance-{id(self):x}",
+                daemon=True,
+            ).start()
+
+    def _stop_maintenance(self) -> None:
+        # restarted by the next get_connection()
+        with self._lock:
+            if self._maintenance_stop is not None:
+                self._maintenance_stop.set()
+                self._maintenance_stop = None
+
+    def _is_expired(
+        self, connection: "ConnectionInterface", now: Optional[float] = None
+    ) -> bool:
+        if self.max_lifetime is None:
+            return False
+        connected_at = connection.connected_at
+        if connected_at is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        return now - connected_at > self.max_lifetime
+
+    def _release_expired(self, connection: "ConnectionInterface") -> bool:
+        """Closes the connection if past max_lifetime instead of pooling it"""
+        if not self._is_expired(connection):
+            self._idle_since[connection] = time.monotonic()
+            return False
+        self._discard_connection(connection)
+        return True
+
+    def _is_healthy(self, connection: "ConnectionInterface") -> bool:
+        try:
+            # an idle connection has nothing to read unless the server closed
+            # it, cache proxies may have pending invalidations though
+            if self.cache is None and connection.can_read():
+                return False
+            # check_health() only pings every health_check_interval
+            connection.send_command("PING", check_health=False)
+            return str_if_bytes(connection.read_response()) == "PONG"
+        except (ConnectionError, TimeoutError, OSError):
+            return False
+
+    def _forget_connection(self, connection: "ConnectionInterface") -> None:
+        self._idle_since.pop(connection, None)
+
+    def _get_idle_connections(self) -> List["ConnectionInterface"]:
+        with self._lock:
+            return list(self._available_connections)
+
+    def _take_idle_connection(self, connection: "ConnectionInterface") -> bool:
+        with self._lock:
+            try:
+                self._available_connections.remove(connection)
+            except ValueError:
+                return False
+            self._in_use_connections.add(connection)
+            return True
+
+    def _return_idle_connection(self, connection: "ConnectionInterface") -> None:
+        with self._lock:
+            self._in_use_connections.discard(connection)
+            # least recently used end, the order of use is kept
+            self._available_connections.insert(0, connection)
+
+    def _discard_connection(self, connection: "ConnectionInterface") -> None:
+        with self._lock:
+            if connection in self._in_use_connections:
+                self._in_use_connections.remove(connection)
+                self._created_connections -= 1
+        self._forget_connection(connection)
+        connection.disconnect()
+
+    def _add_idle_connection(self) -> bool:
+        with self._lock:
+            try:
+                connection = self.make_connection()
+            except MaxConnectionsError:
+                return False
+            self._in_use_connections.add(connection)
+        try:
+            connection.connect()
+        except (ConnectionError, TimeoutError, OSError):
+            self._discard_connection(connection)
+            return False
+        self._idle_since[connection] = time.monotonic()
+        self._return_idle_connection(connection)
+        return True
+
     def set_retry(self, retry: Retry) -> None:
         self.connection_kwargs.update({"retry": retry})
         for conn in self._available_connections:
@@ -1717,6 +2096,7 @@ class BlockingConnectionPool(ConnectionPool):
         # Keep a list of actual connection instances so that we can
         # disconnect them later.
         self._connections = []
+        self._reset_maintenance()
 
         # this must be the last operation in this method. while reset() is
         # called when holding _fork_lock, other threads in this process
@@ -1732,9 +2112,7 @@ class BlockingConnectionPool(ConnectionPool):
     def make_connection(self):
         "Make a fresh connection."
         if self.cache is not None:
-            connection = CacheProxyConnection(
-                self.connection_class(**self.connection_kwargs), self.cache, self._lock
-            )
+            connection = self._make_cache_proxy_connection()
         else:
             connection = self.connection_class(**self.connection_kwargs)
         self._connections.append(connection)
@@ -1757,8 +2135,12 @@ class BlockingConnectionPool(ConnectionPool):
         create new connections when we need to, i.e.: the actual number of
         connections will only increase in response to demand.
         """
+        if self.metrics is not None:
+            started = time.perf_counter()
         # Make sure we haven't changed process.
         self._checkpid()
+        if self._maintenance_enabled and self._maintenance_stop is None:
+            self._start_maintenance()
 
         # Try and get a connection from the pool. If one isn't available within
         # self.timeout then raise a ``ConnectionError``.
@@ -1766,6 +2148,8 @@ class BlockingConnectionPool(ConnectionPool):
         try:
             connection = self.pool.get(block=True, timeout=self.timeout)
         except Empty:
+            if self.metrics is not None:
+                self.metrics.record_pool_exhausted()
             # Note that this is not caught by the redis client and will be
             # raised unless handled by application code. If you want never to
             raise ConnectionError("No connection available.")
@@ -1795,6 +2179,8 @@ class BlockingConnectionPool(ConnectionPool):
             self.release(connection)
             raise
 
+        if self.metrics is not None:
+            self.metrics.record_pool_wait(time.perf_counter() - started)
         return connection
 
     def release(self, connection):
@@ -1809,6 +2195,8 @@ class BlockingConnectionPool(ConnectionPool):
             connection.disconnect()
             self.pool.put_nowait(None)
             return
+        if self._maintenance_enabled and self._release_expired(connection):
+            return
 
         # Put the connection back into the pool.
         try:
@@ -1816,10 +2204,298 @@ class BlockingConnectionPool(ConnectionPool):
         except Full:
             # perhaps the pool has been reset() after a fork? regardless,
             # we don't want this connection
-            pass
+            self._forget_connection(connection)
 
     def disconnect(self):
         "Disconnects all connections in the pool."
         self._checkpid()
+        self._stop_maintenance()
         for connection in self._connections:
             connection.disconnect()
+
+        if self._invalidation_listener is not None:
+            self._invalidation_listener.disconnect()
+
+    def _get_idle_connections(self):
+        with self.pool.mutex:
+            return [conn for conn in self.pool.queue if conn is not None]
+
+    def _count_connections(self):
+        return len(self._connections)
+
+    def _take_idle_connection(self, connection):
+        with self.pool.mutex:
+            try:
+                self.pool.queue.remove(connection)
+            except ValueError:
+                return False
+            return True
+
+    def _return_idle_connection(self, connection):
+        with self.pool.mutex:
+            # behind the None placeholders, which would otherwise be taken
+            # first and open new connections
+            queue = self.pool.queue
+            index = next(
+                (i for i, conn in enumerate(queue) if conn is not None), len(queue)
+            )
+            queue.insert(index, connection)
+            self.pool.not_empty.notify()
+
+    def _discard_connection(self, connection):
+        self._forget_connection(connection)
+        connection.disconnect()
+        if connection in self._connections:
+            self._connections.remove(connection)
+            self.pool.put_nowait(None)
+
+    def _add_idle_connection(self):
+        with self.pool.mutex:
+            try:
+                self.pool.queue.remove(None)
+            except ValueError:
+                return False
+        connection = self.make_connection()
+        try:
+            connection.connect()
+        except (ConnectionError, TimeoutError, OSError):
+            self._discard_connection(connection)
+            return False
+        self._idle_since[connection] = time.monotonic()
+        self._return_idle_connection(connection)
+        return True
+
+
+class ShardedConnectionPool(ConnectionPool):
+    """
+    Connection pool for processes running many threads::
+
+        >>> from redis.client import Redis
+        >>> from redis.connection import ShardedConnectionPool
+        >>> client = Redis(connection_pool=ShardedConnectionPool())
+
+    Every thread is assigned one of ``shards`` deques, spread round-robin,
+    and returns connections to it, so a thread usually gets back the
+    connection it used last. Up to ``shard_size`` idle connections are kept
+    per shard, the rest go to a shared overflow deque. Taking and returning
+    connections relies on the atomic ``deque.append`` and ``deque.pop``
+    instead of a pool-wide lock, which is only acquired to create a new
+    connection. A thread finding its shard and the overflow empty takes the
+    least recently used connection of another shard before creating one.
+
+    Like :py:class:`~redis.ConnectionPool`, it raises
+    :py:class:`~redis.exceptions.MaxConnectionsError` once more than
+    ``max_connections`` connections would be in use.
+    """
+
+    def __init__(
+        self,
+        connection_class=Connection,
+        max_connections: Optional[int] = None,
+        shards: int = 16,
+        shard_size: int = 2,
+        **connection_kwargs,
+    ):
+        if not isinstance(shards, int) or shards < 1:
+            raise ValueError('"shards" must be a positive integer')
+        self.shards = shards
+        self.shard_size = shard_size
+        super().__init__(
+            connection_class=connection_class,
+            max_connections=max_connections,
+            **connection_kwargs,
+        )
+
+    def reset(self) -> None:
+        self._created_connections = 0
+        # every connection created, so they can be disconnected later
+        self._connections = []
+        self._shards = [deque() for _ in range(self.shards)]
+        self._overflow = deque()
+        self._local = threading.local()
+        self._shard_ids = count()
+        self._reset_maintenance()
+
+        # this must be the last operation in this method, see
+        # ConnectionPool.reset()
+        self.pid = os.getpid()
+
+    def _get_shard(self) -> deque:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._shards[next(self._shard_ids) % self.shards]
+            self._local.shard = shard
+            return shard
+
+    def _get_idle_connection(self) -> Optional["ConnectionInterface"]:
+        try:
+            return self._get_shard().pop()
+        except IndexError:
+            pass
+        try:
+            return self._overflow.pop()
+        except IndexError:
+            pass
+        for shard in self._shards:
+            try:
+                return shard.popleft()
+            except IndexError:
+                continue
+        return None
+
+    @deprecated_args(
+        args_to_warn=["*"],
+        reason="Use get_connection() without args instead",
+        version="5.3.0",
+    )
+    def get_connection(self, command_name=None, *keys, **options) -> "Connection":
+        "Get a connection from the pool"
+        if self.metrics is not None:
+            started = time.perf_counter()
+        self._checkpid()
+        if self._maintenance_enabled and self._maintenance_stop is None:
+            self._start_maintenance()
+        connection = self._get_idle_connection()
+        if connection is None:
+            with self._lock:
+                try:
+                    connection = self.make_connection()
+                except MaxConnectionsError:
+                    if self.metrics is not None:
+                        self.metrics.record_pool_exhausted()
+                    raise
+                self._connections.append(connection)
+
+        try:
+            # ensure this connection is connected to Redis
+            connection.connect()
+            # connections that the pool provides should be ready to send
+            # a command. if not, the connection was either returned to the
+            # pool before all data has been read or the socket has been
+            # closed. either way, reconnect and verify everything is good.
+            try:
+                if connection.can_read() and self.cache is None:
+                    raise ConnectionError("Connection has data")
+            except (ConnectionError, TimeoutError, OSError):
+                connection.disconnect()
+                connection.connect()
+                if connection.can_read():
+                    raise ConnectionError("Connection not ready")
+        except BaseException:
+            # release the connection back to the pool so that we don't
+            # leak it
+            self.release(connection)
+            raise
+
+        if self.metrics is not None:
+            self.metrics.record_pool_wait(time.perf_counter() - started)
+        return connection
+
+    def release(self, connection: "Connection") -> None:
+        "Releases the connection back to the pool"
+        self._checkpid()
+        if not self.owns_connection(connection):
+            # Pool doesn't own this connection, do not add it back
+            # to the pool.
+            connection.disconnect()
+            return
+        if self._maintenance_enabled and self._release_expired(connection):
+            return
+
+        shard = self._get_shard()
+        if len(shard) < self.shard_size:
+            shard.append(connection)
+        else:
+            self._overflow.append(connection)
+        self._event_dispatcher.dispatch(AfterConnectionReleasedEvent(connection))
+
+    def _idle_connections(self) -> List["ConnectionInterface"]:
+        return list(chain(self._overflow, *self._shards))
+
+    def disconnect(self, inuse_connections: bool = True) -> None:
+        """
+        Disconnects connections in the pool
+
+        If ``inuse_connections`` is True, disconnect connections that are
+        current in use, potentially by other threads. Otherwise only disconnect
+        connections that are idle in the pool.
+        """
+        self._checkpid()
+        self._stop_maintenance()
+        with self._lock:
+            if inuse_connections:
+                connections = list(self._connections)
+            else:
+                connections = self._idle_connections()
+
+            for connection in connections:
+                connection.disconnect()
+
+            if self._invalidation_listener is not None:
+                self._invalidation_listener.disconnect()
+
+    def _get_idle_connections(self) -> List["ConnectionInterface"]:
+        return self._idle_connections()
+
+    def _count_connections(self) -> int:
+        return len(self._connections)
+
+    def _take_idle_connection(self, connection: "ConnectionInterface") -> bool:
+        for idle in chain((self._overflow,), self._shards):
+            try:
+                idle.remove(connection)
+            except ValueError:
+                continue
+            return True
+        return False
+
+    def _return_idle_connection(self, connection: "ConnectionInterface") -> None:
+        # least recently used end of the overflow
+        self._overflow.appendleft(connection)
+
+    def _discard_connection(self, connection: "ConnectionInterface") -> None:
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+                self._created_connections -= 1
+        self._forget_connection(connection)
+        connection.disconnect()
+
+    def _add_idle_connection(self) -> bool:
+        with self._lock:
+            try:
+                connection = self.make_connection()
+            except MaxConnectionsError:
+                return False
+            self._connections.append(connection)
+        try:
+            connection.connect()
+        except (ConnectionError, TimeoutError, OSError):
+            self._discard_connection(connection)
+            return False
+        self._idle_since[connection] = time.monotonic()
+        self._return_idle_connection(connection)
+        return True
+
+    def set_retry(self, retry: Retry) -> None:
+        self.connection_kwargs.update({"retry": retry})
+        for conn in list(self._connections):
+            conn.retry = retry
+
+    def re_auth_callback(self, token: TokenInterface):
+        with self._lock:
+            # in-use connections re-authenticate once they are released
+            for conn in self._connections:
+                conn.set_re_auth_token(token)
+            idle = []
+            while True:
+                conn = self._get_idle_connection()
+                if conn is None:
+                    break
+                idle.append(conn)
+            try:
+                for conn in idle:
+                    conn.re_auth()
+            finally:
+                self._overflow.extend(idle)
@@ -3,13 +3,192 @@ import threading
 import time as mod_time
 import uuid
 from types import SimpleNamespace, TracebackType
-from typing import Optional, Type
-
-from redis.exceptions import LockError, LockNotOwnedError
+from typing import Dict, List, Optional, Tuple, Type, Union
+
+from redis.exceptions import (
+    LockError,
+    LockNotOwnedError,
+    NoScriptError,
+    RedisClusterException,
+)
 from redis.typing import Number
 
 logger = logging.getLogger(__name__)
 
+# longest single wait for a wake-up signal, waiters register again after it
+NOTIFY_MAX_WAIT = 10
+
+
+def notify_keys(
+    name: Union[str, bytes, memoryview],
+) -> Tuple[Union[str, bytes], ...]:
+    """
+    Return the wake-up signal, waiters and handoff keys of the lock
+    ``name``. They hash to the slot of the lock, so the scripts using them
+    also work in a cluster.
+    """
+    if isinstance(name, memoryview):
+        name = name.tobytes()
+    if isinstance(name, str):
+        open_tag, close_tag = "{", "}"
+        suffixes = (":notify", ":waiters", ":handoff")
+    else:
+        open_tag, close_tag = b"{", b"}"
+        suffixes = (b":notify", b":waiters", b":handoff")
+    # the hash tag rule of redis.crc.key_slot
+    start = name.find(open_tag)
+    if start != -1:
+        end = name.find(close_tag, start + 1)
+        if end != -1 and end != start + 1:
+            # the name has a hash tag already
+            return tuple(name + suffix for suffix in suffixes)
+    if not name or close_tag in name:
+        # wrapped in braces, the name would hash differently
+        raise LockError(
+            "A notify lock name without a hash tag can't be empty or contain "
+            "'}', add a hash tag to the name",
+            lock_name=name,
+        )
+    base = open_tag + name + close_tag
+    return tuple(base + suffix for suffix in suffixes)
+
+
+def notify_max_wait(client) -> float:
+    """
+    Return the longest a notify lock may block waiting for a signal on
+    ``client``, so the wait returns before the ``socket_timeout`` fires.
+    """
+    pool = getattr(client, "connection_pool", None)
+    if pool is not None:
+        kwargs = getattr(pool, "connection_kwargs", {})
+    else:
+        # a cluster client
+        kwargs = getattr(client.nodes_manager, "connection_kwargs", {})
+    socket_timeout = kwargs.get("socket_timeout")
+    if socket_timeout:
+        return min(NOTIFY_MAX_WAIT, socket_timeout / 2)
+    return NOTIFY_MAX_WAIT
+
+
+class LockWatchdog:
+    """
+    Renews the leases of the locks acquired with ``auto_renew``. A single
+    thread, running only while there are locks to renew, resets the TTL of
+    each lock to its ``timeout`` every third of it. The locks due around the
+    same time are renewed together, with one pipeline per client.
+
+    A lock whose lease can't be renewed because it's no longer owned is
+    dropped and a warning is logged.
+    """
+
+    def __init__(self) -> None:
+        # token -> [lock, renew at]
+        self._leases: Dict[bytes, list] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, lock: "Lock", token: bytes) -> None:
+        with self._cond:
+            renew_at = mod_time.monotonic() + lock.timeout / 3
+            self._leases[token] = [lock, renew_at]
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="redis-lock-watchdog", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def unregister(self, token: bytes) -> None:
+        with self._cond:
+            self._leases.pop(token, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if not self._leases:
+                        self._thread = None
+                        return
+                    now = mod_time.monotonic()
+                    wait = min(renew_at for _, renew_at in self._leases.values()) - now
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                # renew the leases due within half an interval along with
+                # the ones that are due now
+                due = [
+                    (token, lock)
+                    for token, (lock, renew_at) in self._leases.items()
+                    if renew_at <= now + lock.timeout / 6
+                ]
+            self._renew(due)
+
+    def _renew(self, due: List[Tuple[bytes, "Lock"]]) -> None:
+        by_client = {}
+        for token, lock in due:
+            by_client.setdefault(id(lock.redis), []).append((token, lock))
+        for leases in by_client.values():
+            client = leases[0][1].redis
+            try:
+                pipe = client.pipeline(transaction=False)
+                for token, lock in leases:
+                    lock.lua_reacquire(
+                        keys=[lock.name],
+                        args=[token, int(lock.timeout * 1000)],
+                        client=pipe,
+                    )
+                results = pipe.execute(raise_on_error=False)
+            except RedisClusterException:
+                # cluster pipelines don't run scripts, renew one by one
+                results = [
+                    self._reacquire(client, token, lock) for token, lock in leases
+                ]
+            except Exception as e:
+                results = [e] * len(leases)
+            for (token, lock), result in zip(leases, results):
+                if isinstance(result, NoScriptError):
+                    result = self._reacquire(client, token, lock)
+                self._renewed(token, lock, result)
+
+    @staticmethod
+    def _reacquire(client, token: bytes, lock: "Lock"):
+        try:
+            return lock.lua_reacquire(
+                keys=[lock.name], args=[token, int(lock.timeout * 1000)], client=client
+            )
+        except Exception as e:
+            return e
+
+    def _renewed(self, token: bytes, lock: "Lock", result) -> None:
+        with self._cond:
+            if token not in self._leases:
+                # released meanwhile
+                return
+            now = mod_time.monotonic()
+            if isinstance(result, Exception):
+                # try again before the lease runs out
+                self._leases[token][1] = now + lock.timeout / 9
+                logger.warning("Failed to renew lock %r: %s", lock.name, result)
+            elif not result:
+                del self._leases[token]
+                logger.warning("Lock %r is no longer owned, renewal stopped", lock.name)
+            else:
+                self._leases[token][1] = now + lock.timeout / 3
+
+
+_watchdog = None
+_watchdog_lock = threading.Lock()
+
+
+def get_lock_watchdog() -> LockWatchdog:
+    """Return the watchdog of the process, created on first use"""
+    global _watchdog
+    if _watchdog is None:
+        with _watchdog_lock:
+            if _watchdog is None:
+                _watchdog = LockWatchdog()
+    return _watchdog
+
 
 class Lock:
     """
@@ -23,6 +202,8 @@ class Lock:
     lua_release = None
     lua_extend = None
     lua_reacquire = None
+    lua_notify_acquire = None
+    lua_notify_release = None
 
     # KEYS[1] - lock name
     # ARGV[1] - token
@@ -76,6 +257,77 @@ class Lock:
         return 1
     """
 
+    # KEYS[1] - lock name
+    # KEYS[2] - wake-up signal list
+    # KEYS[3] - waiters sorted set, scored by registration expiry
+    # KEYS[4] - handoff record, the signal of the waiter the lock is handed to
+    # ARGV[1] - token
+    # ARGV[2] - milliseconds until the lock expires, "0" for no expiry
+    # ARGV[3] - the signal the caller was woken up by, "" if none
+    # ARGV[4] - milliseconds the caller stays registered as a waiter if the
+    #           lock isn't acquired, "0" to not register
+    # return {1, 0} if the lock was acquired, otherwise {0, pttl of the lock}
+    LUA_NOTIFY_ACQUIRE_SCRIPT = """
+        local now = redis.call('time')
+        now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+        redis.call('zremrangebyscore', KEYS[3], '-inf', now)
+        if ARGV[4] == '0' then
+            -- the caller gives up after this attempt
+            redis.call('zrem', KEYS[3], ARGV[1])
+        end
+        if redis.call('zcard', KEYS[3]) == 0 then
+            -- nobody is left to take a pending signal
+            redis.call('del', KEYS[2], KEYS[4])
+        end
+        -- a lock handed over goes to the waiter holding its signal
+        local handoff = redis.call('get', KEYS[4])
+        if redis.call('exists', KEYS[1]) == 0
+                and (not handoff or handoff == ARGV[3]) then
+            if ARGV[2] == '0' then
+                redis.call('set', KEYS[1], ARGV[1])
+            else
+                redis.call('set', KEYS[1], ARGV[1], 'px', ARGV[2])
+            end
+            redis.call('zrem', KEYS[3], ARGV[1])
+            redis.call('del', KEYS[4])
+            return {1, 0}
+        end
+        local registration = tonumber(ARGV[4])
+        if registration > 0 then
+            redis.call('zadd', KEYS[3], now + registration, ARGV[1])
+            if redis.call('pttl', KEYS[3]) < registration then
+                redis.call('pexpire', KEYS[3], registration)
+            end
+        end
+        return {0, redis.call('pttl', KEYS[1])}
+    """
+
+    # KEYS[1] - lock name
+    # KEYS[2] - wake-up signal list
+    # KEYS[3] - waiters sorted set
+    # KEYS[4] - handoff record
+    # ARGV[1] - token
+    # return 1 if the lock was released, otherwise 0
+    LUA_NOTIFY_RELEASE_SCRIPT = """
+        local token = redis.call('get', KEYS[1])
+        if not token or token ~= ARGV[1] then
+            return 0
+        end
+        redis.call('del', KEYS[1])
+        local now = redis.call('time')
+        now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+        redis.call('zremrangebyscore', KEYS[3], '-inf', now)
+        if redis.call('zcard', KEYS[3]) > 0 then
+            -- BLPOP hands the signal to the longest waiting client, and the
+            -- record keeps the lock for it until it comes to take it
+            redis.call('del', KEYS[2])
+            redis.call('rpush', KEYS[2], ARGV[1])
+            redis.call('pexpire', KEYS[2], 1000)
+            redis.call('set', KEYS[4], ARGV[1], 'px', 1000)
+        end
+        return 1
+    """
+
     def __init__(
         self,
         redis,
@@ -86,6 +338,8 @@ class Lock:
         blocking_timeout: Optional[Number] = None,
         thread_local: bool = True,
         raise_on_release_error: bool = True,
+        notify: bool = False,
+        auto_renew: bool = False,
     ):
         """
         Create a new Lock instance named ``name`` using the Redis client
@@ -134,6 +388,19 @@ class Lock:
         this is True, meaning an exception will be raised. If False, the warning
         will be logged and the exception will be suppressed.
 
+        ``notify`` makes blocking acquires wait for a wake-up signal that
+        release() pushes to the waiter that has been waiting the longest,
+        rather than polling every ``sleep`` seconds. The lock is handed over
+        to that waiter within a round trip: release() records the handoff,
+        which keeps new callers from taking the lock ahead of it. All the
+        users of a lock name must use the same mode.
+
+        ``auto_renew`` hands the lease to the process wide
+        :class:`LockWatchdog`, which resets the lock's TTL to ``timeout``
+        until it's released. This allows a short ``timeout`` for long
+        critical sections: the lock still expires soon after the process
+        holding it dies. It requires a ``timeout``.
+
         In some use cases it's necessary to disable thread local storage. For
         example, if you have code where one thread acquires a lock and passes
         that lock instance to a worker thread to release later. If thread
@@ -150,6 +417,15 @@ class Lock:
         self.blocking_timeout = blocking_timeout
         self.thread_local = bool(thread_local)
         self.raise_on_release_error = raise_on_release_error
+        self.notify = notify
+        if notify:
+            # fail early on names the signal keys can't share a slot with
+            notify_keys(name)
+        if auto_renew and not timeout:
+            raise LockError(
+                "Cannot renew the lease of a lock with no timeout", lock_name=name
+            )
+        self.auto_renew = auto_renew
         self.local = threading.local() if self.thread_local else SimpleNamespace()
         self.local.token = None
         self.register_scripts()
@@ -163,6 +439,14 @@ class Lock:
             cls.lua_extend = client.register_script(cls.LUA_EXTEND_SCRIPT)
         if cls.lua_reacquire is None:
             cls.lua_reacquire = client.register_script(cls.LUA_REACQUIRE_SCRIPT)
+        if cls.lua_notify_acquire is None:
+            cls.lua_notify_acquire = client.register_script(
+                cls.LUA_NOTIFY_ACQUIRE_SCRIPT
+            )
+        if cls.lua_notify_release is None:
+            cls.lua_notify_release = client.register_script(
+                cls.LUA_NOTIFY_RELEASE_SCRIPT
+            )
 
     def __enter__(self) -> "Lock":
         if self.acquire():
@@ -223,9 +507,14 @@ class Lock:
         stop_trying_at = None
         if blocking_timeout is not None:
             stop_trying_at = mod_time.monotonic() + blocking_timeout
+        if self.notify:
+            if self.do_notify_acquire(token, blocking, stop_trying_at):
+                self._acquired(token)
+                return True
+            return False
         while True:
             if self.do_acquire(token):
-                self.local.token = token
+                self._acquired(token)
                 return True
             if not blocking:
                 return False
@@ -234,6 +523,11 @@ class Lock:
                 return False
             mod_time.sleep(sleep)
 
+    def _acquired(self, token: bytes) -> None:
+        self.local.token = token
+        if self.auto_renew:
+            get_lock_watchdog().register(self, token)
+
     def do_acquire(self, token: str) -> bool:
         if self.timeout:
             # convert to milliseconds
@@ -244,6 +538,36 @@ class Lock:
             return True
         return False
 
+    def do_notify_acquire(
+        self, token: bytes, blocking: bool, stop_trying_at: Optional[float]
+    ) -> bool:
+        px = int(self.timeout * 1000) if self.timeout else 0
+        keys = [self.name, *notify_keys(self.name)]
+        # the signal popped, which the lock may have been handed over with
+        signal = ""
+        max_wait = notify_max_wait(self.redis)
+        while True:
+            if stop_trying_at is None:
+                wait = max_wait
+            else:
+                wait = min(stop_trying_at - mod_time.monotonic(), max_wait)
+            # stay registered a little longer than the wait below
+            registration = int((wait + 1) * 1000) if blocking and wait > 0 else 0
+            acquired, pttl = self.lua_notify_acquire(
+                keys=keys,
+                args=[token, px, signal, registration],
+                client=self.redis,
+            )
+            if acquired:
+                return True
+            if not registration:
+                return False
+            if pttl > 0:
+                # an expiring lock isn't released, so there's no signal
+                wait = min(wait, pttl / 1000)
+            popped = self.redis.blpop([keys[1]], timeout=wait)
+            signal = popped[1] if popped is not None else ""
+
     def locked(self) -> bool:
         """
         Returns True if this key is locked by any process, otherwise False.
@@ -273,12 +597,22 @@ class Lock:
                 lock_name=self.name,
             )
         self.local.token = None
+        if self.auto_renew:
+            get_lock_watchdog().unregister(expected_token)
         self.do_release(expected_token)
 
     def do_release(self, expected_token: str) -> None:
-        if not bool(
-            self.lua_release(keys=[self.name], args=[expected_token], client=self.redis)
-        ):
+        if self.notify:
+            released = self.lua_notify_release(
+                keys=[self.name, *notify_keys(self.name)],
+                args=[expected_token],
+                client=self.redis,
+            )
+        else:
+            released = self.lua_release(
+                keys=[self.name], args=[expected_token], client=self.redis
+            )
+        if not bool(released):
             raise LockNotOwnedError(
                 "Cannot release a lock that's no longer owned",
                 lock_name=self.name,
@@ -124,7 +124,10 @@ class _RESPBase(BaseParser):
         "Called when the socket connects"
         self._sock = connection._sock
         self._buffer = SocketBuffer(
-            self._sock, self.socket_read_size, connection.socket_timeout
+            self._sock,
+            self.socket_read_size,
+            connection.socket_timeout,
+            getattr(connection, "metrics", None),
         )
         self.encoder = connection.encoder
 
@@ -143,11 +146,12 @@ class _RESPBase(BaseParser):
 class AsyncBaseParser(BaseParser):
     """Base parsing class for the python-backed async parser"""
 
-    __slots__ = "_stream", "_read_size"
+    __slots__ = "_stream", "_read_size", "_metrics"
 
     def __init__(self, socket_read_size: int):
         self._stream: Optional[StreamReader] = None
         self._read_size = socket_read_size
+        self._metrics = None
 
     async def can_read_destructive(self) -> bool:
         raise NotImplementedError()
@@ -231,6 +235,7 @@ class _AsyncRESPBase(AsyncBaseParser):
         self._stream = connection._reader
         if self._stream is None:
             raise RedisError("Buffer is closed.")
+        self._metrics = getattr(connection, "metrics", None)
         self.encoder = connection.encoder
         self._clear()
         self._connected = True
@@ -265,6 +270,8 @@ class _AsyncRESPBase(AsyncBaseParser):
                 data = await self._stream.readexactly(want - len(tail))
             except IncompleteReadError as error:
                 raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR) from error
+            if self._metrics is not None:
+                self._metrics.record_bytes_received(len(data))
             result = (tail + data)[:-2]
             self._chunks.append(data)
         self._pos += want
@@ -283,6 +290,8 @@ class _AsyncRESPBase(AsyncBaseParser):
             data = await self._stream.readline()
             if not data.endswith(b"\r\n"):
                 raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR)
+            if self._metrics is not None:
+                self._metrics.record_bytes_received(len(data))
             result = (tail + data)[:-2]
             self._chunks.append(data)
         self._pos += len(result) + 2
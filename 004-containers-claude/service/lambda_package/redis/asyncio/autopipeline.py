@@ -0,0 +1,209 @@
+import asyncio
+import time
+from collections import deque
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from redis.exceptions import ConnectionError, ResponseError
+
+if TYPE_CHECKING:
+    from redis.asyncio.client import Redis
+    from redis.asyncio.connection import AbstractConnection
+
+# Commands that block the connection, change its state or switch it into a
+# different protocol mode. Sharing a connection between callers is unsafe for
+# them, so they are always executed on a dedicated pool connection.
+AUTO_PIPELINE_EXCLUDED_COMMANDS = frozenset(
+    [
+        "AUTH",
+        "BLMOVE",
+        "BLMPOP",
+        "BLPOP",
+        "BRPOP",
+        "BRPOPLPUSH",
+        "BZMPOP",
+        "BZPOPMAX",
+        "BZPOPMIN",
+        "CLIENT",
+        "DISCARD",
+        "EXEC",
+        "HELLO",
+        "MONITOR",
+        "MULTI",
+        "PSUBSCRIBE",
+        "PSYNC",
+        "PUNSUBSCRIBE",
+        "QUIT",
+        "RESET",
+        "SELECT",
+        "SHUTDOWN",
+        "SSUBSCRIBE",
+        "SUBSCRIBE",
+        "SUNSUBSCRIBE",
+        "SYNC",
+        "UNSUBSCRIBE",
+        "UNWATCH",
+        "WAIT",
+        "WAITAOF",
+        "WATCH",
+        "XREAD",
+        "XREADGROUP",
+    ]
+)
+
+# command name, options, future, time written
+_PendingCommandT = Tuple[Union[str, bytes], Mapping[str, Any], asyncio.Future, float]
+_QueuedCommandT = Tuple[Tuple[Any, ...], Mapping[str, Any], asyncio.Future]
+
+
+def can_auto_pipeline(command_name: Union[str, bytes]) -> bool:
+    """Return True if ``command_name`` may share a connection with others"""
+    if not isinstance(command_name, str):
+        return False
+    name = command_name.split(" ", 1)[0].upper()
+    return name not in AUTO_PIPELINE_EXCLUDED_COMMANDS
+
+
+class AutoPipeline:
+    """
+    Buffers commands issued within the same event loop iteration and sends
+    them to the server in a single write on one shared connection.
+
+    Writes are serialized, while a single reader task resolves the replies in
+    the order the commands were written, so a batch can be sent while the
+    replies of a previous one are still being read. Commands are not retried:
+    once written they may have been executed by the server, so a connection
+    error is propagated to every command waiting for a reply.
+    """
+
+    def __init__(self, client: "Redis", max_batch_size: int = 1000):
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self._connection: Optional["AbstractConnection"] = None
+        self._queue: List[_QueuedCommandT] = []
+        self._pending: Deque[_PendingCommandT] = deque()
+        self._write_lock = asyncio.Lock()
+        self._flush_scheduled = False
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._reader_task: Optional[asyncio.Task] = None
+
+    def __len__(self):
+        return len(self._queue) + len(self._pending)
+
+    async def execute_command(self, *args, **options):
+        """Queue a command for the next flush and wait for its reply"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((args, options, future))
+        if len(self._queue) >= self.max_batch_size:
+            self._start_flush()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        self._flush_scheduled = False
+        if not self._queue:
+            return
+        batch, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._write(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _get_connection(self) -> "AbstractConnection":
+        if self._connection is None:
+            self._connection = await self.client.connection_pool.get_connection()
+        return self._connection
+
+    async def _write(self, batch: List[_QueuedCommandT]):
+        async with self._write_lock:
+            batch = [cmd for cmd in batch if not cmd[2].done()]
+            if not batch:
+                return
+            try:
+                conn = await self._get_connection()
+                if not self._pending:
+                    # the PING of a health check would otherwise race the
+                    # reader for the replies
+                    await conn.check_health()
+                packed = conn.pack_commands([args for args, _, _ in batch])
+            except BaseException as e:
+                self._fail(batch, e)
+                return
+            # replies must be matched against the commands in the order they
+            # are written, so register them before anything hits the socket
+            written = time.perf_counter()
+            for args, options, future in batch:
+                self._pending.append((args[0], options, future, written))
+            try:
+                await conn.send_packed_command(packed, check_health=False)
+            except BaseException as e:
+                await self._reset(conn, e)
+                return
+            if self._reader_task is None or self._reader_task.done():
+                self._reader_task = asyncio.ensure_future(self._read(conn))
+
+    async def _read(self, conn: "AbstractConnection"):
+        metrics = getattr(conn, "metrics", None)
+        while self._pending and self._connection is conn:
+            command_name, options, future, written = self._pending[0]
+            try:
+                response = await self.client.parse_response(
+                    conn, command_name, **options
+                )
+            except ResponseError as e:
+                response = e
+            except BaseException as e:
+                await self._reset(conn, e)
+                return
+            self._pending.popleft()
+            if metrics is not None:
+                metrics.record_command(command_name, time.perf_counter() - written)
+            if future.done():
+                # the caller went away, the reply only had to be consumed
+                continue
+            if isinstance(response, ResponseError):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+
+    @staticmethod
+    def _fail(commands, error: BaseException):
+        if isinstance(error, asyncio.CancelledError):
+            error = ConnectionError("Auto pipeline flush was cancelled")
+        for command in commands:
+            future = command[2]
+            if not future.done():
+                future.set_exception(error)
+
+    async def _reset(self, conn: "AbstractConnection", error: BaseException):
+        """Drop the shared connection and fail every command awaiting a reply"""
+        if self._connection is not conn:
+            return
+        pending, self._pending = self._pending, deque()
+        self._connection = None
+        self._fail(pending, error)
+        await conn.disconnect(nowait=True)
+        await self.client.connection_pool.release(conn)
+
+    async def aclose(self):
+        """Flush queued commands, wait for the replies and release the connection"""
+        self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+            self._reader_task = None
+        conn, self._connection = self._connection, None
+        if conn is not None:
+            await self.client.connection_pool.release(conn)
@@ -4,6 +4,7 @@ import enum
 import inspect
 import socket
 import sys
+import time
 import warnings
 import weakref
 from abc import abstractmethod
@@ -12,6 +13,7 @@ from types import MappingProxyType
 from typing import (
     Any,
     Callable,
+    Dict,
     Iterable,
     List,
     Mapping,
@@ -37,7 +39,20 @@ else:
     SSLContext = None
 
 from ..auth.token import TokenInterface
-from ..event import AsyncAfterConnectionReleasedEvent, EventDispatcher
+from ..cache import (
+    CacheEntry,
+    CacheEntryStatus,
+    CacheFactory,
+    CacheFactoryInterface,
+    CacheInterface,
+    CacheKey,
+)
+from ..event import (
+    AsyncAfterConnectionReleasedEvent,
+    EventDispatcher,
+    PoolMetricsCollectedEvent,
+)
+from ..metrics import ClientMetrics, MetricsSnapshot
 from ..utils import deprecated_args, format_error_message
 
 # the functionality is available in 3.11.x but has a major issue before
@@ -129,6 +144,7 @@ class AbstractConnection:
         "_writer",
         "_parser",
         "_connect_callbacks",
+        "connected_at",
         "_buffer_cutoff",
         "_lock",
         "_socket_read_size",
@@ -160,6 +176,7 @@ class AbstractConnection:
         credential_provider: Optional[CredentialProvider] = None,
         protocol: Optional[int] = 2,
         event_dispatcher: Optional[EventDispatcher] = None,
+        metrics: Optional[ClientMetrics] = None,
     ):
         if (username or password) and credential_provider is not None:
             raise DataError(
@@ -172,6 +189,7 @@ class AbstractConnection:
             self._event_dispatcher = EventDispatcher()
         else:
             self._event_dispatcher = event_dispatcher
+        self.metrics = metrics
         self.db = db
         self.client_name = client_name
         self.lib_name = lib_name
@@ -210,6 +228,8 @@ class AbstractConnection:
         self._socket_read_size = socket_read_size
         self.set_parser(parser_class)
         self._connect_callbacks: List[weakref.WeakMethod[ConnectCallbackT]] = []
+        # when the socket connected, on the monotonic clock, None if disconnected
+        self.connected_at: Optional[float] = None
         self._buffer_cutoff = 6000
         self._re_auth_token: Optional[TokenInterface] = None
 
@@ -331,6 +351,9 @@ class AbstractConnection:
             # clean up after any error in on_connect
             await self.disconnect()
             raise
+        self.connected_at = time.monotonic()
+        if self.metrics is not None:
+            self.metrics.record_connect()
 
         # run any user callbacks. right now the only internal callback
         # is for pubsub channel/pattern resubscription
@@ -473,8 +496,11 @@ class AbstractConnection:
         try:
             async with async_timeout(self.socket_connect_timeout):
                 self._parser.on_disconnect()
+                self.connected_at = None
                 if not self.is_connected:
                     return
+                if self.metrics is not None:
+                    self.metrics.record_disconnect()
                 try:
                     self._writer.close()  # type: ignore[union-attr]
                     # wait for close to finish, except when handling errors and
@@ -533,6 +559,8 @@ class AbstractConnection:
             else:
                 self._writer.writelines(command)
                 await self._writer.drain()
+            if self.metrics is not None:
+                self.metrics.record_bytes_sent(sum(map(len, command)))
         except asyncio.TimeoutError:
             await self.disconnect(nowait=True)
             raise TimeoutError("Timeout writing to socket") from None
@@ -964,6 +992,9 @@ URL_QUERY_ARGUMENT_PARSERS: Mapping[str, Callable[..., object]] = MappingProxyTy
         "health_check_interval": int,
         "ssl_check_hostname": to_bool,
         "timeout": float,
+        "min_idle": int,
+        "max_idle_time": float,
+        "max_lifetime": float,
     }
 )
 
@@ -1033,6 +1064,156 @@ def parse_url(url: str) -> ConnectKwargs:
 _CP = TypeVar("_CP", bound="ConnectionPool")
 
 
+CACHE_KEY = "CACHE_KEY"
+
+
+class CacheInvalidationListener:
+    """
+    Dedicated connection subscribed to the ``__redis__:invalidate`` channel.
+
+    Pool connections enable key tracking with ``CLIENT TRACKING ON REDIRECT``
+    once connected, so invalidations of every connection are delivered here
+    and applied to the cache by a background reader task as they arrive. If
+    the listener loses its connection, invalidations may have been missed,
+    so the cache is flushed and connections tracking to the old client id
+    are reconnected before they are used again.
+    """
+
+    CHANNEL = "__redis__:invalidate"
+    DUMMY_CACHE_VALUE = b"foo"
+
+    def __init__(self, connection: AbstractConnection, cache: CacheInterface):
+        self.client_id: Optional[int] = None
+        self._connection = connection
+        self._cache = cache
+        self._lock = asyncio.Lock()
+        self._reader_task: Optional[asyncio.Task] = None
+        self._redirects: "weakref.WeakKeyDictionary[AbstractConnection, int]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def ensure_connected(self) -> int:
+        """Connects and subscribes if needed, returns the listener client id"""
+        async with self._lock:
+            if self.client_id is not None:
+                return self.client_id
+            try:
+                await self._connection.connect()
+                await self._connection.send_command(
+                    "CLIENT", "ID", check_health=False
+                )
+                client_id = int(await self._connection.read_response())
+                await self._connection.send_command(
+                    "SUBSCRIBE", self.CHANNEL, check_health=False
+                )
+                await self._connection.read_response()
+            except BaseException:
+                await self._connection.disconnect()
+                raise
+            self.client_id = client_id
+            self._reader_task = asyncio.ensure_future(self._read_messages())
+            return client_id
+
+    async def enable_tracking(self, connection: AbstractConnection) -> None:
+        """Connect callback redirecting the connection's key tracking here"""
+        try:
+            client_id = await self.ensure_connected()
+            await connection.send_command(
+                "CLIENT", "TRACKING", "ON", "REDIRECT", client_id, check_health=False
+            )
+            await connection.read_response()
+        except BaseException:
+            await connection.disconnect()
+            raise
+        self._redirects[connection] = client_id
+
+    def is_tracking(self, connection: AbstractConnection) -> bool:
+        """Return True if the connection redirects to the current listener"""
+        client_id = self._redirects.get(connection)
+        return client_id is not None and client_id == self.client_id
+
+    def get_entry(self, cache_key: CacheKey) -> Optional[CacheEntry]:
+        """
+        Returns the valid entry of ``cache_key``. On a miss the entry is
+        reserved, so a reply invalidated while in flight is not cached.
+        """
+        entry = self._cache.get(cache_key)
+        if entry is None:
+            self._cache.set(
+                CacheEntry(
+                    cache_key=cache_key,
+                    cache_value=self.DUMMY_CACHE_VALUE,
+                    status=CacheEntryStatus.IN_PROGRESS,
+                    connection_ref=None,
+                )
+            )
+            return None
+        if entry.status != CacheEntryStatus.VALID:
+            return None
+        return entry
+
+    def cache_response(
+        self, connection: AbstractConnection, cache_key: CacheKey, response: Any
+    ) -> None:
+        """Caches the reply read from ``connection`` if still reserved"""
+        entry = self._cache.collection.get(cache_key)
+        if entry is None:
+            # invalidated while the command was in flight
+            return
+        if response is None or not self.is_tracking(connection):
+            self._cache.delete_by_cache_keys([cache_key])
+            return
+        entry.status = CacheEntryStatus.VALID
+        entry.cache_value = response
+        self._cache.set(entry)
+
+    async def disconnect(self) -> None:
+        task, self._reader_task = self._reader_task, None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self.client_id = None
+        self._cache.flush()
+        await self._connection.disconnect()
+
+    async def _read_messages(self) -> None:
+        try:
+            while True:
+                self._handle_message(await self._connection.read_response())
+        except Exception:
+            # read_response already dropped the connection on errors
+            self.client_id = None
+            self._cache.flush()
+            await self._connection.disconnect(nowait=True)
+
+    def _handle_message(self, message) -> None:
+        if not isinstance(message, list) or str_if_bytes(message[0]) != "message":
+            return
+        # Flush cache when DB flushed on server-side
+        if message[2] is None:
+            self._cache.flush()
+        else:
+            self._cache.delete_by_redis_keys(message[2])
+
+
+async def _maintain_pool(pool_ref: "weakref.ref[ConnectionPool]") -> None:
+    # Only a weak reference is kept, so the task doesn't keep an otherwise
+    # unused pool alive.
+    while True:
+        pool = pool_ref()
+        if pool is None:
+            return
+        interval = pool.maintenance_interval
+        try:
+            await pool.maintain()
+        except Exception:
+            # the next pass will retry, the request path still validates
+            # every connection it hands out
+            pass
+        del pool
+        await asyncio.sleep(interval)
+
+
 class ConnectionPool:
     """
     Create a connection pool. ``If max_connections`` is set, then this
@@ -1044,6 +1225,11 @@ class ConnectionPool:
     unix sockets.
     :py:class:`~redis.SSLConnection` can be used for SSL enabled connections.
 
+    If any of ``min_idle``, ``max_idle_time`` or ``max_lifetime`` is set, a
+    task started with the first ``get_connection()`` maintains the pool
+    every ``maintenance_interval`` seconds, like the maintenance thread of
+    :py:class:`~redis.ConnectionPool`.
+
     Any additional keyword arguments are passed to the constructor of
     ``connection_class``.
     """
@@ -1099,15 +1285,65 @@ class ConnectionPool:
         self,
         connection_class: Type[AbstractConnection] = Connection,
         max_connections: Optional[int] = None,
+        cache_factory: Optional[CacheFactoryInterface] = None,
+        min_idle: int = 0,
+        max_idle_time: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+        maintenance_interval: float = 1.0,
         **connection_kwargs,
     ):
         max_connections = max_connections or 2**31
         if not isinstance(max_connections, int) or max_connections < 0:
             raise ValueError('"max_connections" must be a positive integer')
+        if not isinstance(min_idle, int) or not 0 <= min_idle <= max_connections:
+            raise ValueError('"min_idle" must be between 0 and "max_connections"')
 
         self.connection_class = connection_class
         self.connection_kwargs = connection_kwargs
         self.max_connections = max_connections
+        self.min_idle = min_idle
+        self.max_idle_time = max_idle_time
+        self.max_lifetime = max_lifetime
+        self.maintenance_interval = maintenance_interval
+        self._maintenance_enabled = bool(
+            min_idle or max_idle_time is not None or max_lifetime is not None
+        )
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._idle_since: Dict[AbstractConnection, float] = {}
+        self.cache = None
+        self._cache_factory = cache_factory
+        self._invalidation_listener: Optional[CacheInvalidationListener] = None
+
+        if connection_kwargs.get("cache_config") or connection_kwargs.get("cache"):
+            cache = self.connection_kwargs.get("cache")
+
+            if cache is not None:
+                if not isinstance(cache, CacheInterface):
+                    raise ValueError("Cache must implement CacheInterface")
+
+                self.cache = cache
+            else:
+                if self._cache_factory is not None:
+                    self.cache = self._cache_factory.get_cache()
+                else:
+                    self.cache = CacheFactory(
+                        self.connection_kwargs.get("cache_config")
+                    ).get_cache()
+
+        connection_kwargs.pop("cache", None)
+        connection_kwargs.pop("cache_config", None)
+
+        if self.cache is not None:
+            # Invalidations are redirected to a dedicated RESP2 Pub/Sub
+            # connection that is read in the background, regardless of the
+            # protocol, since push messages on pool connections would only
+            # be seen when their next reply is read.
+            self._invalidation_listener = CacheInvalidationListener(
+                self.connection_class(
+                    **{**self.connection_kwargs, "protocol": 2, "socket_timeout": None}
+                ),
+                self.cache,
+            )
 
         self._available_connections: List[AbstractConnection] = []
         self._in_use_connections: Set[AbstractConnection] = set()
@@ -1116,6 +1352,7 @@ class ConnectionPool:
         self._event_dispatcher = self.connection_kwargs.get("event_dispatcher", None)
         if self._event_dispatcher is None:
             self._event_dispatcher = EventDispatcher()
+        self.metrics: Optional[ClientMetrics] = self.connection_kwargs.get("metrics")
 
     def __repr__(self):
         conn_kwargs = ",".join([f"{k}={v}" for k, v in self.connection_kwargs.items()])
@@ -1142,6 +1379,8 @@ class ConnectionPool:
         version="5.3.0",
     )
     async def get_connection(self, command_name=None, *keys, **options):
+        if self.metrics is not None:
+            started = time.perf_counter()
         async with self._lock:
             """Get a connected connection from the pool"""
             connection = self.get_available_connection()
@@ -1151,19 +1390,39 @@ class ConnectionPool:
                 await self.release(connection)
                 raise
 
+        if self.metrics is not None:
+            self.metrics.record_pool_wait(time.perf_counter() - started)
         return connection
 
     def get_available_connection(self):
         """Get a connection from the pool, without making sure it is connected"""
+        if self._maintenance_enabled and (
+            self._maintenance_task is None or self._maintenance_task.done()
+        ):
+            self._maintenance_task = asyncio.create_task(
+                _maintain_pool(weakref.ref(self))
+            )
         try:
             connection = self._available_connections.pop()
         except IndexError:
             if len(self._in_use_connections) >= self.max_connections:
+                if self.metrics is not None:
+                    self.metrics.record_pool_exhausted()
                 raise ConnectionError("Too many connections") from None
             connection = self.make_connection()
         self._in_use_connections.add(connection)
         return connection
 
+    def get_cache_entry(self, cache_key: CacheKey) -> Optional[CacheEntry]:
+        """Return the valid cached entry of ``cache_key``, if any"""
+        return self._invalidation_listener.get_entry(cache_key)
+
+    def cache_response(
+        self, connection: AbstractConnection, cache_key: CacheKey, response: Any
+    ) -> None:
+        """Cache the reply of a command looked up with get_cache_entry()"""
+        self._invalidation_listener.cache_response(connection, cache_key, response)
+
     def get_encoder(self):
         """Return an encoder based on encoding settings"""
         kwargs = self.connection_kwargs
@@ -1175,10 +1434,23 @@ class ConnectionPool:
 
     def make_connection(self):
         """Create a new connection.  Can be overridden by child classes."""
-        return self.connection_class(**self.connection_kwargs)
+        connection = self.connection_class(**self.connection_kwargs)
+        if self._invalidation_listener is not None:
+            connection.register_connect_callback(
+                self._invalidation_listener.enable_tracking
+            )
+        return connection
 
     async def ensure_connection(self, connection: AbstractConnection):
         """Ensure that the connection object is connected and valid"""
+        if (
+            self._invalidation_listener is not None
+            and connection.is_connected
+            and not self._invalidation_listener.is_tracking(connection)
+        ):
+            # Tracking was redirected to a listener connection that was lost,
+            # reconnecting redirects it to the new one.
+            await connection.disconnect()
         await connection.connect()
         # connections that the pool provides should be ready to send
         # a command. if not, the connection was either returned to the
@@ -1198,6 +1470,14 @@ class ConnectionPool:
         # Connections should always be returned to the correct pool,
         # not doing so is an error that will cause an exception here.
         self._in_use_connections.remove(connection)
+        if self._maintenance_enabled:
+            if self._is_expired(connection):
+                # closed here, so no request gets a connection past its
+                # lifetime
+                self._forget_connection(connection)
+                await connection.disconnect()
+                return
+            self._idle_since[connection] = time.monotonic()
         self._available_connections.append(connection)
         await self._event_dispatcher.dispatch_async(
             AsyncAfterConnectionReleasedEvent(connection)
@@ -1211,6 +1491,10 @@ class ConnectionPool:
         current in use, potentially by other tasks. Otherwise only disconnect
         connections that are idle in the pool.
         """
+        if self._maintenance_task is not None:
+            # restarted by the next get_connection()
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
         if inuse_connections:
             connections: Iterable[AbstractConnection] = chain(
                 self._available_connections, self._in_use_connections
@@ -1221,6 +1505,8 @@ class ConnectionPool:
             *(connection.disconnect() for connection in connections),
             return_exceptions=True,
         )
+        if self._invalidation_listener is not None:
+            await self._invalidation_listener.disconnect()
         exc = next((r for r in resp if isinstance(r, BaseException)), None)
         if exc:
             raise exc
@@ -1229,6 +1515,97 @@ class ConnectionPool:
         """Close the pool, disconnecting all connections"""
         await self.disconnect()
 
+    async def collect_metrics(self) -> Optional[MetricsSnapshot]:
+        """
+        Return a snapshot of the pool's ``metrics``, with the number of
+        connections in use and idle, and dispatch it as a
+        :py:class:`~redis.event.PoolMetricsCollectedEvent`. Returns None if
+        the pool has no ``metrics``.
+        """
+        if self.metrics is None:
+            return None
+        snapshot = self.metrics.snapshot()
+        snapshot.idle_connections = len(self._available_connections)
+        snapshot.in_use_connections = len(self._in_use_connections)
+        await self._event_dispatcher.dispatch_async(
+            PoolMetricsCollectedEvent(self, snapshot)
+        )
+        return snapshot
+
+    async def maintain(self) -> None:
+        """
+        Run a single maintenance pass, see the class docstring. Idle
+        connections are checked one at a time, so the others stay available.
+        """
+        now = time.monotonic()
+        idle = sorted(
+            self._available_connections,
+            key=lambda conn: self._idle_since.get(conn, now),
+            reverse=True,
+        )
+        kept = 0
+        for connection in idle:
+            if connection not in self._available_connections:
+                # checked out in the meantime
+                continue
+            reap = self._is_expired(connection, now) or (
+                self.max_idle_time is not None
+                and kept >= self.min_idle
+                and now - self._idle_since.get(connection, now) > self.max_idle_time
+            )
+            self._available_connections.remove(connection)
+            self._in_use_connections.add(connection)
+            if not reap and await self._is_healthy(connection):
+                self._in_use_connections.discard(connection)
+                # least recently used end, the order of use is kept
+                self._available_connections.insert(0, connection)
+                kept += 1
+                continue
+            self._in_use_connections.discard(connection)
+            self._forget_connection(connection)
+            await connection.disconnect()
+        while (
+            kept < self.min_idle
+            and len(self._available_connections) + len(self._in_use_connections)
+            < self.max_connections
+        ):
+            connection = self.make_connection()
+            self._in_use_connections.add(connection)
+            try:
+                await connection.connect()
+            except (ConnectionError, TimeoutError, OSError):
+                self._in_use_connections.discard(connection)
+                break
+            self._in_use_connections.discard(connection)
+            self._idle_since[connection] = time.monotonic()
+            self._available_connections.insert(0, connection)
+            kept += 1
+
+    def _is_expired(
+        self, connection: AbstractConnection, now: Optional[float] = None
+    ) -> bool:
+        if self.max_lifetime is None:
+            return False
+        connected_at = connection.connected_at
+        if connected_at is None:
+            return False
+        if now is None:
+            now = time.monotonic()
+        return now - connected_at > self.max_lifetime
+
+    async def _is_healthy(self, connection: AbstractConnection) -> bool:
+        try:
+            if await connection.can_read_destructive():
+                return False
+            # check_health() only pings every health_check_interval
+            await connection.send_command("PING", check_health=False)
+            return str_if_bytes(await connection.read_response()) == "PONG"
+        except (ConnectionError, TimeoutError, OSError):
+            return False
+
+    def _forget_connection(self, connection: AbstractConnection) -> None:
+        self._idle_since.pop(connection, None)
+
     def set_retry(self, retry: "Retry") -> None:
         for conn in self._available_connections:
             conn.retry = retry
@@ -1316,17 +1693,23 @@ class BlockingConnectionPool(ConnectionPool):
     )
     async def get_connection(self, command_name=None, *keys, **options):
         """Gets a connection from the pool, blocking until one is available"""
+        if self.metrics is not None:
+            started = time.perf_counter()
         try:
             async with self._condition:
                 async with async_timeout(self.timeout):
                     await self._condition.wait_for(self.can_get_connection)
                     connection = super().get_available_connection()
         except asyncio.TimeoutError as err:
+            if self.metrics is not None:
+                self.metrics.record_pool_exhausted()
             raise ConnectionError("No connection available.") from err
 
         # We now perform the connection check outside of the lock.
         try:
             await self.ensure_connection(connection)
+            if self.metrics is not None:
+                self.metrics.record_pool_wait(time.perf_counter() - started)
             return connection
         except BaseException:
             await self.release(connection)
@@ -1337,3 +1720,9 @@ class BlockingConnectionPool(ConnectionPool):
         async with self._condition:
             await super().release(connection)
             self._condition.notify()
+
+    async def maintain(self) -> None:
+        await super().maintain()
+        # connections were taken out and put back, or closed
+        async with self._condition:
+            self._condition.notify_all()
@@ -7,8 +7,8 @@ if TYPE_CHECKING:
     from .bf import BFBloom, CFBloom, CMSBloom, TDigestBloom, TOPKBloom
     from .json import JSON
     from .search import AsyncSearch, Search
-    from .timeseries import TimeSeries
-    from .vectorset import VectorSet
+    from .timeseries import AsyncTimeSeries, TimeSeries
+    from .vectorset import AsyncVectorSet, VectorSet
 
 
 class RedisModuleCommands:
@@ -16,12 +16,12 @@ class RedisModuleCommands:
     modules into the command namespace.
     """
 
-    def json(self, encoder=JSONEncoder(), decoder=JSONDecoder()) -> JSON:
+    def json(self, encoder=JSONEncoder(), decoder=JSONDecoder(), loads=None) -> JSON:
         """Access the json namespace, providing support for redis json."""
 
         from .json import JSON
 
-        jj = JSON(client=self, encoder=encoder, decoder=decoder)
+        jj = JSON(client=self, encoder=encoder, decoder=decoder, loads=loads)
         return jj
 
     def ft(self, index_name="idx") -> Search:
@@ -99,3 +99,21 @@ class AsyncRedisModuleCommands(RedisModuleCommands):
 
         s = AsyncSearch(client=self, index_name=index_name)
         return s
+
+    def ts(self) -> AsyncTimeSeries:
+        """Access the timeseries namespace, providing support for
+        redis timeseries data.
+        """
+
+        from .timeseries import AsyncTimeSeries
+
+        s = AsyncTimeSeries(client=self)
+        return s
+
+    def vset(self) -> AsyncVectorSet:
+        """Access the VectorSet commands namespace."""
+
+        from .vectorset import AsyncVectorSet
+
+        vset = AsyncVectorSet(client=self)
+        return vset
@@ -1,23 +1,64 @@
+from array import array
+from operator import itemgetter
+
 from ..helpers import nativestr
 
+_timestamp = itemgetter(0)
+_value = itemgetter(1)
+
 
 def list_to_dict(aList):
     return {nativestr(aList[i][0]): nativestr(aList[i][1]) for i in range(len(aList))}
 
 
-def parse_range(response, **kwargs):
+def parse_range(response, columnar=False, **kwargs):
     """Parse range response. Used by TS.RANGE and TS.REVRANGE."""
+    if columnar:
+        return parse_range_columns(response)
     return [tuple((r[0], float(r[1]))) for r in response]
 
 
-def parse_m_range(response):
+def parse_range_columns(response):
+    """
+    Parse the samples of a range response into an ``array("q")`` of
+    timestamps and an ``array("d")`` of values, without a tuple per sample.
+    """
+    timestamps = array("q", map(int, map(_timestamp, response)))
+    values = array("d", map(float, map(_value, response)))
+    return timestamps, values
+
+
+def parse_m_range(response, columnar=False, **kwargs):
     """Parse multi range response. Used by TS.MRANGE and TS.MREVRANGE."""
     res = []
     for item in response:
-        res.append({nativestr(item[0]): [list_to_dict(item[1]), parse_range(item[2])]})
+        res.append(
+            {
+                nativestr(item[0]): [
+                    list_to_dict(item[1]),
+                    parse_range(item[2], columnar=columnar),
+                ]
+            }
+        )
     return sorted(res, key=lambda d: list(d.keys()))
 
 
+def parse_range_resp3(response, columnar=False, **kwargs):
+    """Parse range response with the ``columnar`` option under RESP3."""
+    if columnar:
+        return parse_range_columns(response)
+    return response
+
+
+def parse_m_range_resp3(response, columnar=False, **kwargs):
+    """Parse multi range response with the ``columnar`` option under RESP3."""
+    if columnar:
+        # the samples are the last item of every series
+        for series in response.values():
+            series[-1] = parse_range_columns(series[-1])
+    return response
+
+
 def parse_get(response):
     """Parse get response. Used by TS.GET."""
     if not response:
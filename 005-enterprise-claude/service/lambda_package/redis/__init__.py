@@ -6,6 +6,7 @@ from redis.connection import (
     BlockingConnectionPool,
     Connection,
     ConnectionPool,
+    ShardedConnectionPool,
     SSLConnection,
     UnixDomainSocketConnection,
 )
@@ -79,6 +80,7 @@ __all__ = [
     "SentinelConnectionPool",
     "SentinelManagedConnection",
     "SentinelManagedSSLConnection",
+    "ShardedConnectionPool",
     "SSLConnection",
     "UsernamePasswordCredentialProvider",
     "StrictRedis",
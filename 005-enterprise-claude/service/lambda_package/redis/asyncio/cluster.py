@@ -5,8 +5,9 @@ import socket
 import threading
 import time
 import warnings
+import weakref
 from abc import ABC, abstractmethod
-from copy import copy
+from copy import copy, deepcopy
 from itertools import chain
 from typing import (
     Any,
@@ -32,13 +33,28 @@ from redis._parsers.helpers import (
     _RedisCallbacksRESP3,
 )
 from redis.asyncio.client import ResponseCallbackT
-from redis.asyncio.connection import Connection, SSLConnection, parse_url
+from redis.asyncio.connection import (
+    CACHE_KEY,
+    CacheInvalidationListener,
+    Connection,
+    SSLConnection,
+    parse_url,
+)
 from redis.asyncio.lock import Lock
 from redis.asyncio.retry import Retry
 from redis.auth.token import TokenInterface
 from redis.backoff import ExponentialWithJitterBackoff, NoBackoff
+from redis.cache import (
+    CacheConfig,
+    CacheEntry,
+    CacheFactory,
+    CacheFactoryInterface,
+    CacheInterface,
+    CacheKey,
+)
 from redis.client import EMPTY_RESPONSE, NEVER_DECODE, AbstractRedis
 from redis.cluster import (
+    KEYSLOT_CACHE_SIZE,
     PIPELINE_BLOCKED_COMMANDS,
     PRIMARY,
     REPLICA,
@@ -47,7 +63,9 @@ from redis.cluster import (
     LoadBalancer,
     LoadBalancingStrategy,
     block_pipeline_command,
+    build_slot_primaries,
     get_node_name,
+    invalidate_cached_slots,
     parse_cluster_slots,
 )
 from redis.commands import READ_COMMANDS, AsyncRedisClusterCommands
@@ -74,6 +92,7 @@ from redis.exceptions import (
     TryAgainError,
     WatchError,
 )
+from redis.metrics import ClientMetrics
 from redis.typing import AnyKeyT, EncodableT, KeyT
 from redis.utils import (
     SSL_AVAILABLE,
@@ -145,6 +164,8 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
         | Enable read from replicas in READONLY mode and defines the load balancing
           strategy that will be used for cluster node selection.
           The data read from replicas is eventually consistent with the data in primary nodes.
+          ``LoadBalancingStrategy.LEAST_LATENCY`` sends reads to the healthy replica
+          with the lowest latency, weighted by its number of outstanding commands.
     :param dynamic_startup_nodes:
         | Set the RedisCluster's startup nodes to all the discovered nodes.
           If true (default value), the cluster's discovered nodes will be used to
@@ -185,6 +206,21 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
           where the node is reachable.  This can be used to map the addresses at
           which the nodes _think_ they are, to addresses at which a client may
           reach them, such as when they sit behind a proxy.
+    :param cache:
+        | A :class:`~redis.cache.CacheInterface` shared by all nodes to cache
+          replies of read-only commands locally. Every node redirects the key
+          tracking of its connections to a dedicated invalidation connection,
+          and entries of slots that move to another node are dropped.
+    :param cache_config:
+        | Configuration used to create the cache when ``cache`` is not set.
+    :param metrics:
+        | A :class:`~redis.metrics.ClientMetrics` shared by the connections of
+          all nodes, recording connects, disconnects, bytes sent and received
+          and command latencies.
+    :param topology_refresh_interval:
+        | Seconds between refreshes of the cluster topology by a background task,
+          in addition to the refreshes triggered by redirections and connection
+          errors. Disabled by default.
 
     | Rest of the arguments will be passed to the
       :class:`~redis.asyncio.connection.Connection` instances when created
@@ -233,6 +269,7 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
 
     __slots__ = (
         "_initialize",
+        "_keyslot_cache",
         "_lock",
         "retry",
         "command_flags",
@@ -306,7 +343,12 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
         ssl_ciphers: Optional[str] = None,
         protocol: Optional[int] = 2,
         address_remap: Optional[Callable[[Tuple[str, int]], Tuple[str, int]]] = None,
+        cache: Optional[CacheInterface] = None,
+        cache_config: Optional[CacheConfig] = None,
+        cache_factory: Optional[CacheFactoryInterface] = None,
         event_dispatcher: Optional[EventDispatcher] = None,
+        metrics: Optional[ClientMetrics] = None,
+        topology_refresh_interval: Optional[float] = None,
     ) -> None:
         if db:
             raise RedisClusterException(
@@ -380,6 +422,20 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
         if retry_on_error:
             self.retry.update_supported_errors(retry_on_error)
 
+        if cache is None and cache_config is not None:
+            if cache_factory is None:
+                cache = CacheFactory(cache_config).get_cache()
+            else:
+                cache = cache_factory.get_cache()
+        if cache is not None:
+            if not isinstance(cache, CacheInterface):
+                raise ValueError("Cache must implement CacheInterface")
+            # Shared by all nodes, each node redirects the key tracking of
+            # its connections to its own invalidation connection.
+            kwargs["cache"] = cache
+        if metrics is not None:
+            kwargs["metrics"] = metrics
+
         kwargs["response_callbacks"] = _RedisCallbacks.copy()
         if kwargs.get("protocol") in ["3", 3]:
             kwargs["response_callbacks"].update(_RedisCallbacksRESP3)
@@ -411,6 +467,7 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
             dynamic_startup_nodes=dynamic_startup_nodes,
             address_remap=address_remap,
             event_dispatcher=self._event_dispatcher,
+            topology_refresh_interval=topology_refresh_interval,
         )
         self.encoder = Encoder(encoding, encoding_errors, decode_responses)
         self.read_from_replicas = read_from_replicas
@@ -418,6 +475,7 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
         self.reinitialize_steps = reinitialize_steps
         self.reinitialize_counter = 0
         self.commands_parser = AsyncCommandsParser()
+        self._keyslot_cache: Dict[Union[bytes, str], int] = {}
         self.node_flags = self.__class__.NODE_FLAGS.copy()
         self.command_flags = self.__class__.COMMAND_FLAGS.copy()
         self.response_callbacks = kwargs["response_callbacks"]
@@ -576,12 +634,24 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
 
         See: https://redis.io/docs/manual/scaling/#redis-cluster-data-sharding
         """
-        return key_slot(self.encoder.encode(key))
+        if key.__class__ is not str and key.__class__ is not bytes:
+            return key_slot(self.encoder.encode(key))
+        cache = self._keyslot_cache
+        try:
+            return cache[key]
+        except KeyError:
+            if len(cache) >= KEYSLOT_CACHE_SIZE:
+                cache.clear()
+            slot = cache[key] = key_slot(self.encoder.encode(key))
+            return slot
 
     def get_encoder(self) -> Encoder:
         """Get the encoder object of the client."""
         return self.encoder
 
+    def get_cache(self) -> Optional[CacheInterface]:
+        return self.connection_kwargs.get("cache")
+
     def get_connection_kwargs(self) -> Dict[str, Optional[Any]]:
         """Get the kwargs passed to :class:`~redis.asyncio.connection.Connection`."""
         return self.connection_kwargs
@@ -786,6 +856,24 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
                     # raise the exception
                     raise e
 
+    async def _execute_on_balanced_node(
+        self, target_node: "ClusterNode", *args: Union[KeyT, EncodableT], **kwargs: Any
+    ) -> Any:
+        # report the latency and failures of the node to the load balancer
+        load_balancer = self.nodes_manager.read_load_balancer
+        load_balancer.command_started(target_node.name)
+        started = time.perf_counter()
+        failed = False
+        try:
+            return await target_node.execute_command(*args, **kwargs)
+        except (ConnectionError, TimeoutError):
+            failed = True
+            raise
+        finally:
+            load_balancer.command_finished(
+                target_node.name, time.perf_counter() - started, failed
+            )
+
     async def _execute_command(
         self, target_node: "ClusterNode", *args: Union[KeyT, EncodableT], **kwargs: Any
     ) -> Any:
@@ -813,6 +901,10 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
                     )
                     moved = False
 
+                if self.load_balancing_strategy is LoadBalancingStrategy.LEAST_LATENCY:
+                    return await self._execute_on_balanced_node(
+                        target_node, *args, **kwargs
+                    )
                 return await target_node.execute_command(*args, **kwargs)
             except BusyLoadingError:
                 raise
@@ -828,9 +920,10 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
                 # Remove the failed node from the startup nodes before we try
                 # to reinitialize the cluster
                 self.nodes_manager.startup_nodes.pop(target_node.name, None)
-                # Hard force of reinitialize of the node/slots setup
-                # and try again with the new setup
-                await self.aclose()
+                # Reinitialize the node/slots setup and try again with the new
+                # setup, only the failed node loses its connections
+                await target_node.disconnect()
+                self._initialize = True
                 raise
             except (ClusterDownError, SlotNotCoveredError):
                 # ClusterDownError can occur during a failover and to get
@@ -859,7 +952,12 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
                     self.reinitialize_steps
                     and self.reinitialize_counter % self.reinitialize_steps == 0
                 ):
-                    await self.aclose()
+                    # Refresh the topology in place, the nodes that are still
+                    # part of the cluster keep their connections
+                    try:
+                        await self.nodes_manager.initialize()
+                    except Exception:
+                        await self.aclose()
                     # Reset the counter
                     self.reinitialize_counter = 0
                 else:
@@ -899,6 +997,7 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
         lock_class: Optional[Type[Lock]] = None,
         thread_local: bool = True,
         raise_on_release_error: bool = True,
+        notify: bool = False,
     ) -> Lock:
         """
         Return a new Lock object using key ``name`` that mimics
@@ -950,6 +1049,9 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
         this is True, meaning an exception will be raised. If False, the warning
         will be logged and the exception will be suppressed.
 
+        ``notify`` makes blocking acquires wait for a signal pushed on release
+        instead of polling every ``sleep`` seconds, see :class:`Lock`.
+
         In some use cases it's necessary to disable thread local storage. For
         example, if you have code where one thread acquires a lock and passes
         that lock instance to a worker thread to release later. If thread
@@ -968,6 +1070,7 @@ class RedisCluster(AbstractRedis, AbstractRedisCluster, AsyncRedisClusterCommand
             blocking_timeout=blocking_timeout,
             thread_local=thread_local,
             raise_on_release_error=raise_on_release_error,
+            notify=notify,
         )
 
     async def transaction(
@@ -1006,8 +1109,10 @@ class ClusterNode:
     __slots__ = (
         "_connections",
         "_free",
+        "_invalidation_listener",
         "_lock",
         "_event_dispatcher",
+        "cache",
         "connection_class",
         "connection_kwargs",
         "host",
@@ -1042,6 +1147,20 @@ class ClusterNode:
         self.connection_class = connection_class
         self.connection_kwargs = connection_kwargs
         self.response_callbacks = connection_kwargs.pop("response_callbacks", {})
+        self.cache: Optional[CacheInterface] = connection_kwargs.pop("cache", None)
+        self._invalidation_listener: Optional[CacheInvalidationListener] = None
+        if self.cache is not None:
+            self._invalidation_listener = CacheInvalidationListener(
+                self.connection_class(
+                    **{
+                        **self.connection_kwargs,
+                        "protocol": 2,
+                        "socket_timeout": None,
+                        "retry": Retry(NoBackoff(), 0),
+                    }
+                ),
+                self.cache,
+            )
 
         self._connections: List[Connection] = []
         self._free: Deque[Connection] = collections.deque(maxlen=self.max_connections)
@@ -1084,6 +1203,8 @@ class ClusterNode:
             ),
             return_exceptions=True,
         )
+        if self._invalidation_listener is not None:
+            await self._invalidation_listener.disconnect()
         exc = next((res for res in ret if isinstance(res, Exception)), None)
         if exc:
             raise exc
@@ -1110,6 +1231,10 @@ class ClusterNode:
                 connection_kwargs = self.connection_kwargs.copy()
                 connection_kwargs["retry"] = retry
                 connection = self.connection_class(**connection_kwargs)
+                if self._invalidation_listener is not None:
+                    connection.register_connect_callback(
+                        self._invalidation_listener.enable_tracking
+                    )
                 self._connections.append(connection)
                 return connection
 
@@ -1127,7 +1252,6 @@ class ClusterNode:
         try:
             if NEVER_DECODE in kwargs:
                 response = await connection.read_response(disable_decoding=True)
-                kwargs.pop(NEVER_DECODE)
             else:
                 response = await connection.read_response()
         except ResponseError:
@@ -1135,8 +1259,14 @@ class ClusterNode:
                 return kwargs[EMPTY_RESPONSE]
             raise
 
-        if EMPTY_RESPONSE in kwargs:
-            kwargs.pop(EMPTY_RESPONSE)
+        cache_key = kwargs.pop(CACHE_KEY, None)
+        if cache_key is not None:
+            self._invalidation_listener.cache_response(connection, cache_key, response)
+        return self._handle_response(command, response, **kwargs)
+
+    def _handle_response(self, command: str, response: Any, **kwargs: Any) -> Any:
+        kwargs.pop(NEVER_DECODE, None)
+        kwargs.pop(EMPTY_RESPONSE, None)
 
         # Remove keys entry, it needs only for cache.
         kwargs.pop("keys", None)
@@ -1147,10 +1277,41 @@ class ClusterNode:
 
         return response
 
+    def _get_cache_entry(
+        self, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Optional[CacheEntry]:
+        if self.cache is None or not kwargs.get("keys"):
+            return None
+        cache_key = CacheKey(command=args[0], redis_keys=tuple(kwargs["keys"]))
+        if not self.cache.is_cachable(cache_key):
+            return None
+        entry = self._invalidation_listener.get_entry(cache_key)
+        if entry is None:
+            kwargs[CACHE_KEY] = cache_key
+        return entry
+
     async def execute_command(self, *args: Any, **kwargs: Any) -> Any:
+        entry = self._get_cache_entry(args, kwargs)
+        if entry is not None:
+            return self._handle_response(
+                args[0], deepcopy(entry.cache_value), **kwargs
+            )
+
         # Acquire connection
         connection = self.acquire_connection()
 
+        if (
+            self._invalidation_listener is not None
+            and connection.is_connected
+            and not self._invalidation_listener.is_tracking(connection)
+        ):
+            # Tracking was redirected to a listener connection that was lost,
+            # reconnecting redirects it to the new one.
+            await connection.disconnect()
+
+        if connection.metrics is not None:
+            started = time.perf_counter()
+
         # Execute command
         await connection.send_packed_command(connection.pack_command(*args), False)
 
@@ -1160,6 +1321,10 @@ class ClusterNode:
         finally:
             # Release connection
             self._free.append(connection)
+            if connection.metrics is not None:
+                connection.metrics.record_command(
+                    args[0], time.perf_counter() - started
+                )
 
     async def execute_pipeline(self, commands: List["PipelineCommand"]) -> bool:
         # Acquire connection
@@ -1214,6 +1379,28 @@ class ClusterNode:
         pass
 
 
+async def _refresh_topology(nodes_manager_ref: "weakref.ref[NodesManager]") -> None:
+    # Only a weak reference is kept, so the task doesn't keep an otherwise
+    # unused client alive.
+    while True:
+        nodes_manager = nodes_manager_ref()
+        if nodes_manager is None:
+            return
+        interval = nodes_manager.topology_refresh_interval
+        del nodes_manager
+        await asyncio.sleep(interval)
+        nodes_manager = nodes_manager_ref()
+        if nodes_manager is None:
+            return
+        try:
+            await nodes_manager.initialize()
+        except Exception:
+            # commands keep using the current topology and refresh it
+            # themselves when they are redirected
+            pass
+        del nodes_manager
+
+
 class NodesManager:
     __slots__ = (
         "_dynamic_startup_nodes",
@@ -1225,8 +1412,15 @@ class NodesManager:
         "read_load_balancer",
         "require_full_coverage",
         "slots_cache",
+        "_slot_primaries",
         "startup_nodes",
         "address_remap",
+        "topology_refresh_interval",
+        "_refresh_lock",
+        "_refresh_task",
+        "_refreshes_started",
+        "_refreshes_completed",
+        "__weakref__",
     )
 
     def __init__(
@@ -1237,7 +1431,10 @@ class NodesManager:
         dynamic_startup_nodes: bool = True,
         address_remap: Optional[Callable[[Tuple[str, int]], Tuple[str, int]]] = None,
         event_dispatcher: Optional[EventDispatcher] = None,
+        topology_refresh_interval: Optional[float] = None,
     ) -> None:
+        if topology_refresh_interval is not None and topology_refresh_interval <= 0:
+            raise ValueError('"topology_refresh_interval" must be a positive number')
         self.startup_nodes = {node.name: node for node in startup_nodes}
         self.require_full_coverage = require_full_coverage
         self.connection_kwargs = connection_kwargs
@@ -1246,10 +1443,18 @@ class NodesManager:
         self.default_node: "ClusterNode" = None
         self.nodes_cache: Dict[str, "ClusterNode"] = {}
         self.slots_cache: Dict[int, List["ClusterNode"]] = {}
+        # primary of every slot, the lookup path of most commands
+        self._slot_primaries = [None] * REDIS_CLUSTER_HASH_SLOTS
         self.read_load_balancer = LoadBalancer()
 
         self._dynamic_startup_nodes: bool = dynamic_startup_nodes
         self._moved_exception: MovedError = None
+        # refreshes run one at a time, see initialize()
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._refreshes_started = 0
+        self._refreshes_completed = 0
+        self.topology_refresh_interval = topology_refresh_interval
+        self._refresh_task: Optional[asyncio.Task] = None
         if event_dispatcher is None:
             self._event_dispatcher = EventDispatcher()
         else:
@@ -1329,6 +1534,19 @@ class NodesManager:
             # shard. We need to remove all current nodes from the slot's list
             # (including replications) and add just the new node.
             self.slots_cache[e.slot_id] = [redirected_node]
+        self._slot_primaries[e.slot_id] = self.slots_cache[e.slot_id][0]
+        cache = self.connection_kwargs.get("cache")
+        if cache is not None:
+            # Entries of the slot were tracked by the node that lost it
+            invalidate_cached_slots(
+                cache,
+                {e.slot_id},
+                Encoder(
+                    self.connection_kwargs["encoding"],
+                    self.connection_kwargs["encoding_errors"],
+                    self.connection_kwargs["decode_responses"],
+                ),
+            )
         # Reset moved_exception
         self._moved_exception = None
 
@@ -1341,6 +1559,14 @@ class NodesManager:
         if self._moved_exception:
             self._update_moved_slots()
 
+        if not read_from_replicas and load_balancing_strategy is None:
+            try:
+                node = self._slot_primaries[slot] if slot >= 0 else None
+            except (IndexError, TypeError):
+                node = None
+            if node is not None:
+                return node
+
         if read_from_replicas is True and load_balancing_strategy is None:
             load_balancing_strategy = LoadBalancingStrategy.ROUND_ROBIN
 
@@ -1349,7 +1575,10 @@ class NodesManager:
                 # get the server index using the strategy defined in load_balancing_strategy
                 primary_name = self.slots_cache[slot][0].name
                 node_idx = self.read_load_balancer.get_server_index(
-                    primary_name, len(self.slots_cache[slot]), load_balancing_strategy
+                    primary_name,
+                    len(self.slots_cache[slot]),
+                    load_balancing_strategy,
+                    self.slots_cache[slot],
                 )
                 return self.slots_cache[slot][node_idx]
             return self.slots_cache[slot][0]
@@ -1367,6 +1596,50 @@ class NodesManager:
         ]
 
     async def initialize(self) -> None:
+        """
+        Refresh the nodes and slots caches. Concurrent calls are coalesced:
+        callers that wait for a refresh which started after they were called
+        return once it completes instead of running another one.
+        """
+        started = self._refreshes_started
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if self._refreshes_completed > started:
+                return
+            self._refreshes_started += 1
+            refresh = self._refreshes_started
+            await self._initialize()
+            self._refreshes_completed = refresh
+        if self.topology_refresh_interval is not None and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(
+                _refresh_topology(weakref.ref(self))
+            )
+
+    def _get_or_create_node(
+        self,
+        host: str,
+        port: int,
+        server_type: str,
+        tmp_nodes_cache: Dict[str, "ClusterNode"],
+    ) -> "ClusterNode":
+        node_name = get_node_name(host, port)
+        target_node = tmp_nodes_cache.get(node_name)
+        if target_node is None:
+            # reuse the node of the current topology with its connections
+            target_node = self.nodes_cache.get(node_name)
+            if target_node is None:
+                target_node = ClusterNode(
+                    host, port, server_type, **self.connection_kwargs
+                )
+            target_node.server_type = server_type
+            # add this node to the nodes cache
+            tmp_nodes_cache[node_name] = target_node
+        return target_node
+
+    async def _initialize(self) -> None:
         self.read_load_balancer.reset()
         tmp_nodes_cache: Dict[str, "ClusterNode"] = {}
         tmp_slots: Dict[int, List["ClusterNode"]] = {}
@@ -1424,13 +1697,9 @@ class NodesManager:
 
                 nodes_for_slot = []
 
-                target_node = tmp_nodes_cache.get(get_node_name(host, port))
-                if not target_node:
-                    target_node = ClusterNode(
-                        host, port, PRIMARY, **self.connection_kwargs
-                    )
-                # add this node to the nodes cache
-                tmp_nodes_cache[target_node.name] = target_node
+                target_node = self._get_or_create_node(
+                    host, port, PRIMARY, tmp_nodes_cache
+                )
                 nodes_for_slot.append(target_node)
 
                 replica_nodes = slot[3:]
@@ -1439,13 +1708,9 @@ class NodesManager:
                     port = replica_node[1]
                     host, port = self.remap_host_port(host, port)
 
-                    target_replica_node = tmp_nodes_cache.get(get_node_name(host, port))
-                    if not target_replica_node:
-                        target_replica_node = ClusterNode(
-                            host, port, REPLICA, **self.connection_kwargs
-                        )
-                    # add this node to the nodes cache
-                    tmp_nodes_cache[target_replica_node.name] = target_replica_node
+                    target_replica_node = self._get_or_create_node(
+                        host, port, REPLICA, tmp_nodes_cache
+                    )
                     nodes_for_slot.append(target_replica_node)
 
                 for i in range(int(slot[0]), int(slot[1]) + 1):
@@ -1493,6 +1758,7 @@ class NodesManager:
 
         # Set the tmp variables to the real variables
         self.slots_cache = tmp_slots
+        self._slot_primaries = build_slot_primaries(tmp_slots)
         self.set_nodes(self.nodes_cache, tmp_nodes_cache, remove_old=True)
 
         if self._dynamic_startup_nodes:
@@ -1505,6 +1771,10 @@ class NodesManager:
         self._moved_exception = None
 
     async def aclose(self, attr: str = "nodes_cache") -> None:
+        if attr == "nodes_cache" and self._refresh_task is not None:
+            # restarted by the next initialize()
+            self._refresh_task.cancel()
+            self._refresh_task = None
         self.default_node = None
         await asyncio.gather(
             *(
@@ -1873,11 +2143,11 @@ class PipelineStrategy(AbstractStrategy):
     def mset_nonatomic(
         self, mapping: Mapping[AnyKeyT, EncodableT]
     ) -> "ClusterPipeline":
-        encoder = self._pipe.cluster_client.encoder
+        keyslot = self._pipe.cluster_client.keyslot
 
         slots_pairs = {}
         for pair in mapping.items():
-            slot = key_slot(encoder.encode(pair[0]))
+            slot = keyslot(pair[0])
             slots_pairs.setdefault(slot, []).extend(pair)
 
         for pairs in slots_pairs.values():
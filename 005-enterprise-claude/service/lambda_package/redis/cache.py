@@ -1,8 +1,13 @@
+import sys
+import time
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from redis.crc import key_slot
+from redis.typing import KeyT
 
 
 class CacheEntryStatus(Enum):
@@ -21,6 +26,18 @@ class CacheKey:
     redis_keys: tuple
 
 
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
 class CacheEntry:
     def __init__(
         self,
@@ -70,6 +87,26 @@ class EvictionPolicyInterface(ABC):
     def touch(self, cache_key: CacheKey) -> None:
         pass
 
+    def remove(self, cache_key: CacheKey) -> None:
+        """
+        Called after an entry was removed from the cache by anything other
+        than the policy itself, e.g. an invalidation.
+        """
+        pass
+
+    def exceeds_capacity(self) -> bool:
+        """
+        Returns True if entries should be evicted regardless of the cache
+        size, e.g. because of a memory budget.
+        """
+        return False
+
+    def is_expired(self, cache_key: CacheKey) -> bool:
+        """
+        Returns True if the entry must not be served anymore.
+        """
+        return False
+
 
 class CacheConfigurationInterface(ABC):
     @abstractmethod
@@ -92,6 +129,10 @@ class CacheConfigurationInterface(ABC):
     def is_allowed_to_cache(self, command: str) -> bool:
         pass
 
+    def is_exceeds_max_memory(self, memory_usage: int) -> bool:
+        # no memory limit unless the configuration sets one
+        return False
+
 
 class CacheInterface(ABC):
     @property
@@ -139,15 +180,30 @@ class CacheInterface(ABC):
         pass
 
 
+def _index_key(redis_key: KeyT) -> str:
+    # commands name keys as given, invalidations as bytes: decode losslessly,
+    # so binary keys that aren't UTF-8 are indexed too
+    if isinstance(redis_key, bytes):
+        return redis_key.decode(errors="surrogateescape")
+    return str(redis_key)
+
+
 class DefaultCache(CacheInterface):
     def __init__(
         self,
         cache_config: CacheConfigurationInterface,
     ) -> None:
         self._cache = OrderedDict()
+        # Maps redis key to the cache keys of every entry that depends on it,
+        # so invalidations don't have to scan the whole cache.
+        self._redis_keys_index: Dict[str, Set[CacheKey]] = {}
+        # Maps cluster slot to the indexed redis keys hashing to it. Only
+        # cluster clients need it, so it's built on the first lookup.
+        self._slots_index: Optional[Dict[int, Set[str]]] = None
         self._cache_config = cache_config
         self._eviction_policy = self._cache_config.get_eviction_policy().value()
         self._eviction_policy.cache = self
+        self._stats = CacheStats()
 
     @property
     def collection(self) -> OrderedDict:
@@ -165,15 +221,26 @@ class DefaultCache(CacheInterface):
     def size(self) -> int:
         return len(self._cache)
 
+    @property
+    def stats(self) -> CacheStats:
+        return self._stats
+
     def set(self, entry: CacheEntry) -> bool:
         if not self.is_cachable(entry.cache_key):
             return False
 
+        if entry.cache_key not in self._cache:
+            self._index(entry.cache_key)
         self._cache[entry.cache_key] = entry
         self._eviction_policy.touch(entry.cache_key)
 
         if self._cache_config.is_exceeds_max_size(len(self._cache)):
-            self._eviction_policy.evict_next()
+            self._unindex(self._eviction_policy.evict_next())
+            self._stats.evictions += 1
+
+        while self._cache and self._eviction_policy.exceeds_capacity():
+            self._unindex(self._eviction_policy.evict_next())
+            self._stats.evictions += 1
 
         return True
 
@@ -181,17 +248,28 @@ class DefaultCache(CacheInterface):
         entry = self._cache.get(key, None)
 
         if entry is None:
+            self._stats.misses += 1
+            return None
+
+        if self._eviction_policy.is_expired(key):
+            self._remove(key)
+            self._stats.evictions += 1
+            self._stats.misses += 1
             return None
 
         self._eviction_policy.touch(key)
+        if entry.status == CacheEntryStatus.VALID:
+            self._stats.hits += 1
+        else:
+            self._stats.misses += 1
         return entry
 
     def delete_by_cache_keys(self, cache_keys: List[CacheKey]) -> List[bool]:
         response = []
 
         for key in cache_keys:
-            if self.get(key) is not None:
-                self._cache.pop(key)
+            if key in self._cache:
+                self._remove(key)
                 response.append(True)
             else:
                 response.append(False)
@@ -200,29 +278,84 @@ class DefaultCache(CacheInterface):
 
     def delete_by_redis_keys(self, redis_keys: List[bytes]) -> List[bool]:
         response = []
-        keys_to_delete = []
 
         for redis_key in redis_keys:
-            if isinstance(redis_key, bytes):
-                redis_key = redis_key.decode()
-            for cache_key in self._cache:
-                if redis_key in cache_key.redis_keys:
-                    keys_to_delete.append(cache_key)
+            redis_key = _index_key(redis_key)
+            self._unindex_slot(redis_key)
+            for cache_key in self._redis_keys_index.pop(redis_key, ()):
+                # Entry could be already removed while indexed by another key.
+                if cache_key in self._cache:
+                    self._remove(cache_key)
                     response.append(True)
 
-        for key in keys_to_delete:
-            self._cache.pop(key)
-
         return response
 
+    def delete_by_slots(self, slots: Set[int]) -> int:
+        """
+        Delete the entries depending on redis keys that hash to the cluster
+        ``slots`` and return how many were deleted.
+        """
+        if self._slots_index is None:
+            self._slots_index = {}
+            for redis_key in self._redis_keys_index:
+                self._index_slot(redis_key)
+        redis_keys = set()
+        for slot in slots:
+            redis_keys.update(self._slots_index.get(slot, ()))
+        return len(self.delete_by_redis_keys(list(redis_keys)))
+
     def flush(self) -> int:
         elem_count = len(self._cache)
+        for key in self._cache:
+            self._eviction_policy.remove(key)
         self._cache.clear()
+        self._redis_keys_index.clear()
+        self._slots_index = None
         return elem_count
 
     def is_cachable(self, key: CacheKey) -> bool:
         return self._cache_config.is_allowed_to_cache(key.command)
 
+    def _remove(self, cache_key: CacheKey) -> None:
+        self._cache.pop(cache_key)
+        self._unindex(cache_key)
+        self._eviction_policy.remove(cache_key)
+
+    def _index(self, cache_key: CacheKey) -> None:
+        for redis_key in cache_key.redis_keys:
+            redis_key = _index_key(redis_key)
+            cache_keys = self._redis_keys_index.get(redis_key)
+            if cache_keys is None:
+                cache_keys = self._redis_keys_index[redis_key] = set()
+                self._index_slot(redis_key)
+            cache_keys.add(cache_key)
+
+    def _unindex(self, cache_key: CacheKey) -> None:
+        for redis_key in cache_key.redis_keys:
+            redis_key = _index_key(redis_key)
+            cache_keys = self._redis_keys_index.get(redis_key)
+            if cache_keys is None:
+                continue
+            cache_keys.discard(cache_key)
+            if not cache_keys:
+                del self._redis_keys_index[redis_key]
+                self._unindex_slot(redis_key)
+
+    def _index_slot(self, redis_key: str) -> None:
+        if self._slots_index is not None:
+            slot = key_slot(redis_key.encode(errors="surrogateescape"))
+            self._slots_index.setdefault(slot, set()).add(redis_key)
+
+    def _unindex_slot(self, redis_key: str) -> None:
+        if self._slots_index is None:
+            return
+        slot = key_slot(redis_key.encode(errors="surrogateescape"))
+        redis_keys = self._slots_index.get(slot)
+        if redis_keys is not None:
+            redis_keys.discard(redis_key)
+            if not redis_keys:
+                del self._slots_index[slot]
+
 
 class LRUPolicy(EvictionPolicyInterface):
     def __init__(self):
@@ -271,8 +404,380 @@ class LRUPolicy(EvictionPolicyInterface):
             raise ValueError("Eviction policy should be associated with valid cache.")
 
 
+def _estimate_size(value: Any) -> int:
+    """
+    Estimates the memory footprint of a cached response, including nested
+    containers of RESP2/RESP3 replies.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class LRUMemoryPolicy(LRUPolicy):
+    """
+    LRU eviction bounded by the estimated memory used by cache keys and
+    responses instead of the number of entries. The budget is taken from
+    ``CacheConfig(max_memory=...)``.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # value reference and size, so unchanged entries aren't measured
+        # again on every touch
+        self._sizes: Dict[CacheKey, Tuple[Any, int]] = {}
+        self._memory_usage = 0
+
+    @property
+    def memory_usage(self) -> int:
+        return self._memory_usage
+
+    def evict_next(self) -> CacheKey:
+        cache_key = super().evict_next()
+        self.remove(cache_key)
+        return cache_key
+
+    def evict_many(self, count: int) -> List[CacheKey]:
+        cache_keys = super().evict_many(count)
+        for cache_key in cache_keys:
+            self.remove(cache_key)
+        return cache_keys
+
+    def touch(self, cache_key: CacheKey) -> None:
+        super().touch(cache_key)
+        value = self._cache.collection[cache_key].cache_value
+        previous = self._sizes.get(cache_key)
+        if previous is not None:
+            if previous[0] is value:
+                return
+            self._memory_usage -= previous[1]
+        size = _estimate_size(cache_key) + _estimate_size(value)
+        self._sizes[cache_key] = (value, size)
+        self._memory_usage += size
+
+    def remove(self, cache_key: CacheKey) -> None:
+        previous = self._sizes.pop(cache_key, None)
+        if previous is not None:
+            self._memory_usage -= previous[1]
+
+    def exceeds_capacity(self) -> bool:
+        self._assert_cache()
+        return self._cache.config.is_exceeds_max_memory(self._memory_usage)
+
+
+class LFUPolicy(EvictionPolicyInterface):
+    """
+    Least frequently used eviction in constant time. Entries sharing the
+    lowest access count are evicted in least recently used order.
+    """
+
+    def __init__(self):
+        self.cache = None
+        self._frequencies: Dict[CacheKey, int] = {}
+        self._buckets: Dict[int, OrderedDict] = {}
+        self._min_frequency = 0
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: CacheInterface):
+        self._cache = cache
+
+    @property
+    def type(self) -> EvictionPolicyType:
+        return EvictionPolicyType.frequency_based
+
+    def evict_next(self) -> CacheKey:
+        self._assert_cache()
+        if not self._frequencies:
+            raise ValueError("Cannot evict from an empty cache")
+
+        if self._min_frequency not in self._buckets:
+            self._min_frequency = min(self._buckets)
+        cache_key, _ = self._buckets[self._min_frequency].popitem(last=False)
+        self._discard_bucket(self._min_frequency)
+        del self._frequencies[cache_key]
+        self._cache.collection.pop(cache_key, None)
+        return cache_key
+
+    def evict_many(self, count: int) -> List[CacheKey]:
+        self._assert_cache()
+        if count > len(self._cache.collection):
+            raise ValueError("Evictions count is above cache size")
+
+        return [self.evict_next() for _ in range(count)]
+
+    def touch(self, cache_key: CacheKey) -> None:
+        self._assert_cache()
+
+        if self._cache.collection.get(cache_key) is None:
+            raise ValueError("Given entry does not belong to the cache")
+
+        frequency = self._frequencies.get(cache_key, 0)
+        if frequency:
+            del self._buckets[frequency][cache_key]
+            if not self._buckets[frequency]:
+                del self._buckets[frequency]
+                if self._min_frequency == frequency:
+                    self._min_frequency = frequency + 1
+        else:
+            self._min_frequency = 1
+        self._frequencies[cache_key] = frequency + 1
+        self._buckets.setdefault(frequency + 1, OrderedDict())[cache_key] = None
+
+    def remove(self, cache_key: CacheKey) -> None:
+        frequency = self._frequencies.pop(cache_key, None)
+        if frequency is not None:
+            del self._buckets[frequency][cache_key]
+            self._discard_bucket(frequency)
+
+    def _discard_bucket(self, frequency: int) -> None:
+        if not self._buckets[frequency]:
+            del self._buckets[frequency]
+
+    def _assert_cache(self):
+        if self.cache is None or not isinstance(self.cache, CacheInterface):
+            raise ValueError("Eviction policy should be associated with valid cache.")
+
+
+class TTLPolicy(EvictionPolicyInterface):
+    """
+    Expires entries once they are older than ``CacheConfig(max_age=...)``
+    seconds, regardless of how often they are read. When the cache is full
+    the oldest entry is evicted first.
+    """
+
+    def __init__(self):
+        self.cache = None
+        self._inserted_at: OrderedDict = OrderedDict()
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: CacheInterface):
+        self._cache = cache
+
+    @property
+    def type(self) -> EvictionPolicyType:
+        return EvictionPolicyType.time_based
+
+    def evict_next(self) -> CacheKey:
+        self._assert_cache()
+        cache_key, _ = self._inserted_at.popitem(last=False)
+        self._cache.collection.pop(cache_key, None)
+        return cache_key
+
+    def evict_many(self, count: int) -> List[CacheKey]:
+        self._assert_cache()
+        if count > len(self._cache.collection):
+            raise ValueError("Evictions count is above cache size")
+
+        return [self.evict_next() for _ in range(count)]
+
+    def touch(self, cache_key: CacheKey) -> None:
+        self._assert_cache()
+
+        if self._cache.collection.get(cache_key) is None:
+            raise ValueError("Given entry does not belong to the cache")
+
+        if cache_key not in self._inserted_at:
+            self._inserted_at[cache_key] = time.monotonic()
+
+    def remove(self, cache_key: CacheKey) -> None:
+        self._inserted_at.pop(cache_key, None)
+
+    def exceeds_capacity(self) -> bool:
+        # Entries are ordered by insertion time, so expired entries are
+        # evicted from the head on every write.
+        if not self._inserted_at:
+            return False
+        return self.is_expired(next(iter(self._inserted_at)))
+
+    def is_expired(self, cache_key: CacheKey) -> bool:
+        self._assert_cache()
+        max_age = self._cache.config.get_max_age()
+        inserted_at = self._inserted_at.get(cache_key)
+        if max_age is None or inserted_at is None:
+            return False
+        return time.monotonic() - inserted_at > max_age
+
+    def _assert_cache(self):
+        if self.cache is None or not isinstance(self.cache, CacheInterface):
+            raise ValueError("Eviction policy should be associated with valid cache.")
+
+
+class CountMinSketch:
+    """
+    Approximate access frequencies with 4 rows of saturating counters. All
+    counters are halved once ``sample_size`` increments were recorded, so
+    the estimates favour recent popularity.
+    """
+
+    SEEDS = (
+        0x9E3779B97F4A7C15,
+        0xC2B2AE3D27D4EB4F,
+        0x165667B19E3779F9,
+        0xD6E8FEB86659FD93,
+    )
+    MAX_COUNT = 15
+
+    def __init__(self, capacity: int):
+        width = 1
+        while width < max(capacity, 16):
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in self.SEEDS]
+        self._sample_size = 10 * max(capacity, 16)
+        self._additions = 0
+
+    def _indexes(self, item) -> List[int]:
+        h = hash(item) & 0xFFFFFFFFFFFFFFFF
+        return [((h * seed) >> 32) & self._mask for seed in self.SEEDS]
+
+    def estimate(self, item) -> int:
+        return min(row[i] for row, i in zip(self._rows, self._indexes(item)))
+
+    def increment(self, item) -> None:
+        for row, i in zip(self._rows, self._indexes(item)):
+            if row[i] < self.MAX_COUNT:
+                row[i] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._reset()
+
+    def _reset(self) -> None:
+        self._additions //= 2
+        for row in self._rows:
+            row[:] = bytes(count >> 1 for count in row)
+
+
+class WTinyLFUPolicy(EvictionPolicyInterface):
+    """
+    Window TinyLFU eviction.
+
+    New entries land in a small LRU window (1% of the cache). Entries leaving
+    the window are only admitted into the main segmented LRU if a count-min
+    sketch estimates them to be more popular than the main segment's
+    eviction victim, so bursts of one-off reads cannot flush hot entries.
+    """
+
+    WINDOW_RATIO = 0.01
+    PROTECTED_RATIO = 0.8
+
+    def __init__(self):
+        self.cache = None
+        self._sketch: Optional[CountMinSketch] = None
+        self._window: OrderedDict = OrderedDict()
+        self._probation: OrderedDict = OrderedDict()
+        self._protected: OrderedDict = OrderedDict()
+
+    @property
+    def cache(self):
+        return self._cache
+
+    @cache.setter
+    def cache(self, cache: CacheInterface):
+        self._cache = cache
+        if cache is not None:
+            max_size = cache.config.get_max_size()
+            self._window_size = max(1, int(max_size * self.WINDOW_RATIO))
+            main_size = max(1, max_size - self._window_size)
+            self._protected_size = max(1, int(main_size * self.PROTECTED_RATIO))
+            self._sketch = CountMinSketch(max_size)
+
+    @property
+    def type(self) -> EvictionPolicyType:
+        return EvictionPolicyType.frequency_based
+
+    def evict_next(self) -> CacheKey:
+        self._assert_cache()
+        main = self._probation or self._protected
+        if len(self._window) > self._window_size and main:
+            # The window candidate competes with the main segment's victim.
+            candidate = next(iter(self._window))
+            victim = next(iter(main))
+            if self._sketch.estimate(candidate) > self._sketch.estimate(victim):
+                del self._window[candidate]
+                self._probation[candidate] = None
+                cache_key = victim
+                del main[victim]
+            else:
+                cache_key = candidate
+                del self._window[candidate]
+        elif main:
+            cache_key, _ = main.popitem(last=False)
+        else:
+            cache_key, _ = self._window.popitem(last=False)
+
+        self._cache.collection.pop(cache_key, None)
+        return cache_key
+
+    def evict_many(self, count: int) -> List[CacheKey]:
+        self._assert_cache()
+        if count > len(self._cache.collection):
+            raise ValueError("Evictions count is above cache size")
+
+        return [self.evict_next() for _ in range(count)]
+
+    def touch(self, cache_key: CacheKey) -> None:
+        self._assert_cache()
+
+        if self._cache.collection.get(cache_key) is None:
+            raise ValueError("Given entry does not belong to the cache")
+
+        self._sketch.increment(cache_key)
+
+        if cache_key in self._window:
+            self._window.move_to_end(cache_key)
+        elif cache_key in self._protected:
+            self._protected.move_to_end(cache_key)
+        elif cache_key in self._probation:
+            del self._probation[cache_key]
+            self._protected[cache_key] = None
+            if len(self._protected) > self._protected_size:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+        else:
+            self._window[cache_key] = None
+            # Until the cache is full, window overflow moves to the main
+            # segment without competing for admission.
+            max_size = self._cache.config.get_max_size()
+            while (
+                len(self._window) > self._window_size
+                and len(self._cache.collection) <= max_size
+            ):
+                candidate, _ = self._window.popitem(last=False)
+                self._probation[candidate] = None
+
+    def remove(self, cache_key: CacheKey) -> None:
+        for segment in (self._window, self._probation, self._protected):
+            if cache_key in segment:
+                del segment[cache_key]
+                return
+
+    def _assert_cache(self):
+        if self.cache is None or not isinstance(self.cache, CacheInterface):
+            raise ValueError("Eviction policy should be associated with valid cache.")
+
+
 class EvictionPolicy(Enum):
     LRU = LRUPolicy
+    LRU_MEMORY = LRUMemoryPolicy
+    LFU = LFUPolicy
+    TTL = TTLPolicy
+    W_TINYLFU = WTinyLFUPolicy
 
 
 class CacheConfig(CacheConfigurationInterface):
@@ -362,10 +867,14 @@ class CacheConfig(CacheConfigurationInterface):
         max_size: int = DEFAULT_MAX_SIZE,
         cache_class: Any = DEFAULT_CACHE_CLASS,
         eviction_policy: EvictionPolicy = DEFAULT_EVICTION_POLICY,
+        max_memory: Optional[int] = None,
+        max_age: Optional[float] = None,
     ):
         self._cache_class = cache_class
         self._max_size = max_size
         self._eviction_policy = eviction_policy
+        self._max_memory = max_memory
+        self._max_age = max_age
 
     def get_cache_class(self):
         return self._cache_class
@@ -376,9 +885,18 @@ class CacheConfig(CacheConfigurationInterface):
     def get_eviction_policy(self) -> EvictionPolicy:
         return self._eviction_policy
 
+    def get_max_memory(self) -> Optional[int]:
+        return self._max_memory
+
+    def get_max_age(self) -> Optional[float]:
+        return self._max_age
+
     def is_exceeds_max_size(self, count: int) -> bool:
         return count > self._max_size
 
+    def is_exceeds_max_memory(self, memory_usage: int) -> bool:
+        return self._max_memory is not None and memory_usage > self._max_memory
+
     def is_allowed_to_cache(self, command: str) -> bool:
         return command in self.DEFAULT_ALLOW_LIST
 
@@ -1,8 +1,10 @@
 import random
+import selectors
 import socket
 import sys
 import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
 from collections import OrderedDict
 from copy import copy
@@ -13,9 +15,16 @@ from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 from redis._parsers import CommandsParser, Encoder
 from redis._parsers.helpers import parse_scan
 from redis.backoff import ExponentialWithJitterBackoff, NoBackoff
-from redis.cache import CacheConfig, CacheFactory, CacheFactoryInterface, CacheInterface
+from redis.cache import (
+    CacheConfig,
+    CacheFactory,
+    CacheFactoryInterface,
+    CacheInterface,
+    DefaultCache,
+)
 from redis.client import EMPTY_RESPONSE, CaseInsensitiveDict, PubSub, Redis
 from redis.commands import READ_COMMANDS, RedisClusterCommands
+from redis.commands.core import EVALSHA_COMMANDS, ScriptRegistry
 from redis.commands.helpers import list_or_args
 from redis.connection import (
     Connection,
@@ -75,6 +84,40 @@ def get_connection(redis_node: Redis, *args, **options) -> Connection:
     return redis_node.connection or redis_node.connection_pool.get_connection()
 
 
+def _refresh_topology(nodes_manager_ref: "weakref.ref", stop: threading.Event) -> None:
+    # Only a weak reference is kept, so the thread doesn't keep an otherwise
+    # unused client alive.
+    while True:
+        nodes_manager = nodes_manager_ref()
+        if nodes_manager is None:
+            return
+        interval = nodes_manager.topology_refresh_interval
+        del nodes_manager
+        if stop.wait(interval):
+            return
+        nodes_manager = nodes_manager_ref()
+        if nodes_manager is None:
+            return
+        try:
+            nodes_manager.initialize()
+        except Exception:
+            # commands keep using the current topology and refresh it
+            # themselves when they are redirected
+            pass
+        del nodes_manager
+
+
+def build_slot_primaries(slots_cache):
+    """
+    Return a list with the primary of every slot of ``slots_cache``, or None
+    for the slots that are not covered.
+    """
+    return [
+        slot_nodes[0] if slot_nodes else None
+        for slot_nodes in map(slots_cache.get, range(REDIS_CLUSTER_HASH_SLOTS))
+    ]
+
+
 def parse_scan_result(command, res, **options):
     cursors = {}
     ret = []
@@ -152,6 +195,9 @@ PRIMARY = "primary"
 REPLICA = "replica"
 SLOT_ID = "slot-id"
 
+# Number of key -> slot lookups remembered by a cluster client
+KEYSLOT_CACHE_SIZE = 1024
+
 REDIS_ALLOWED_KEYS = (
     "connection_class",
     "connection_pool",
@@ -190,6 +236,7 @@ REDIS_ALLOWED_KEYS = (
     "username",
     "cache",
     "cache_config",
+    "metrics",
 )
 KWARGS_DISABLED_KEYS = ("host", "port", "retry")
 
@@ -207,6 +254,29 @@ def cleanup_kwargs(**kwargs):
     return connection_kwargs
 
 
+def invalidate_cached_slots(
+    cache: CacheInterface, slots: Set[int], encoder: Encoder
+) -> int:
+    """
+    Delete the cached entries depending on keys that hash to ``slots``.
+
+    Key tracking is kept per node, so entries read from a node that no
+    longer serves their slot would not be invalidated anymore.
+    """
+    if not slots or not cache.size:
+        return 0
+    if isinstance(cache, DefaultCache):
+        return cache.delete_by_slots(slots)
+    # other caches are scanned
+    stale = [
+        cache_key
+        for cache_key in list(cache.collection)
+        if any(key_slot(encoder.encode(key)) in slots for key in cache_key.redis_keys)
+    ]
+    cache.delete_by_cache_keys(stale)
+    return len(stale)
+
+
 class AbstractRedisCluster:
     RedisClusterRequestTTL = 16
 
@@ -528,6 +598,7 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
         cache: Optional[CacheInterface] = None,
         cache_config: Optional[CacheConfig] = None,
         event_dispatcher: Optional[EventDispatcher] = None,
+        topology_refresh_interval: Optional[float] = None,
         **kwargs,
     ):
         """
@@ -559,6 +630,8 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
              Enable read from replicas in READONLY mode and defines the load balancing
              strategy that will be used for cluster node selection.
              The data read from replicas is eventually consistent with the data in primary nodes.
+             ``LoadBalancingStrategy.LEAST_LATENCY`` sends reads to the healthy replica
+             with the lowest latency, weighted by its number of outstanding commands.
         :param dynamic_startup_nodes:
              Set the RedisCluster's startup nodes to all of the discovered nodes.
              If true (default value), the cluster's discovered nodes will be used to
@@ -597,6 +670,10 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
             where the node is reachable.  This can be used to map the addresses at
             which the nodes _think_ they are, to addresses at which a client may
             reach them, such as when they sit behind a proxy.
+        :param topology_refresh_interval:
+            Seconds between refreshes of the cluster topology by a background
+            thread, in addition to the refreshes triggered by redirections and
+            connection errors. Disabled by default.
 
          :**kwargs:
              Extra arguments that will be sent into Redis instance when created
@@ -678,10 +755,6 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
             kwargs.get("encoding_errors", "strict"),
             kwargs.get("decode_responses", False),
         )
-        protocol = kwargs.get("protocol", None)
-        if (cache_config or cache) and protocol not in [3, "3"]:
-            raise RedisError("Client caching is only supported with RESP version 3")
-
         self.command_flags = self.__class__.COMMAND_FLAGS.copy()
         self.node_flags = self.__class__.NODE_FLAGS.copy()
         self.read_from_replicas = read_from_replicas
@@ -701,6 +774,7 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
             cache=cache,
             cache_config=cache_config,
             event_dispatcher=self._event_dispatcher,
+            topology_refresh_interval=topology_refresh_interval,
             **kwargs,
         )
 
@@ -710,7 +784,10 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
         self.result_callbacks = CaseInsensitiveDict(self.__class__.RESULT_CALLBACKS)
 
         self.commands_parser = CommandsParser(self)
+        self._keyslot_cache = {}
         self._lock = threading.RLock()
+        # scripts are loaded per node, through the connections running them
+        self.script_registry = ScriptRegistry()
 
     def __enter__(self):
         return self
@@ -875,6 +952,8 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
         lock_class=None,
         thread_local=True,
         raise_on_release_error: bool = True,
+        notify: bool = False,
+        auto_renew: bool = False,
     ):
         """
         Return a new Lock object using key ``name`` that mimics
@@ -926,6 +1005,12 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
         this is True, meaning an exception will be raised. If False, the warning
         will be logged and the exception will be suppressed.
 
+        ``notify`` makes blocking acquires wait for a signal pushed on release
+        instead of polling every ``sleep`` seconds, see :class:`Lock`.
+
+        ``auto_renew`` keeps renewing the lease of the lock in a background
+        thread until it's released, see :class:`Lock`.
+
         In some use cases it's necessary to disable thread local storage. For
         example, if you have code where one thread acquires a lock and passes
         that lock instance to a worker thread to release later. If thread
@@ -944,6 +1029,8 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
             blocking_timeout=blocking_timeout,
             thread_local=thread_local,
             raise_on_release_error=raise_on_release_error,
+            notify=notify,
+            auto_renew=auto_renew,
         )
 
     def set_response_callback(self, command, callback):
@@ -1006,8 +1093,16 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
         Calculate keyslot for a given key.
         See Keys distribution model in https://redis.io/topics/cluster-spec
         """
-        k = self.encoder.encode(key)
-        return key_slot(k)
+        if key.__class__ is not str and key.__class__ is not bytes:
+            return key_slot(self.encoder.encode(key))
+        cache = self._keyslot_cache
+        try:
+            return cache[key]
+        except KeyError:
+            if len(cache) >= KEYSLOT_CACHE_SIZE:
+                cache.clear()
+            slot = cache[key] = key_slot(self.encoder.encode(key))
+            return slot
 
     def _get_command_keys(self, *args):
         """
@@ -1223,8 +1318,32 @@ class RedisCluster(AbstractRedisCluster, RedisClusterCommands):
                     connection.send_command("ASKING")
                     redis_node.parse_response(connection, "ASKING", **kwargs)
                     asking = False
-                connection.send_command(*args, **kwargs)
-                response = redis_node.parse_response(connection, command, **kwargs)
+                if command in EVALSHA_COMMANDS:
+                    self.script_registry.attach(connection)
+                metrics = getattr(connection, "metrics", None)
+                if self.load_balancing_strategy is LoadBalancingStrategy.LEAST_LATENCY:
+                    load_balancer = self.nodes_manager.read_load_balancer
+                    load_balancer.command_started(target_node.name)
+                else:
+                    load_balancer = None
+                if metrics is not None or load_balancer is not None:
+                    started = time.perf_counter()
+                failed = False
+                try:
+                    connection.send_command(*args, **kwargs)
+                    response = redis_node.parse_response(connection, command, **kwargs)
+                except (ConnectionError, TimeoutError):
+                    failed = True
+                    raise
+                finally:
+                    if metrics is not None or load_balancer is not None:
+                        elapsed = time.perf_counter() - started
+                        if metrics is not None:
+                            metrics.record_command(command, elapsed)
+                        if load_balancer is not None:
+                            load_balancer.command_finished(
+                                target_node.name, elapsed, failed
+                            )
 
                 # Remove keys entry, it needs only for cache.
                 kwargs.pop("keys", None)
@@ -1402,25 +1521,72 @@ class LoadBalancingStrategy(Enum):
     ROUND_ROBIN = "round_robin"
     ROUND_ROBIN_REPLICAS = "round_robin_replicas"
     RANDOM_REPLICA = "random_replica"
+    # the healthy replica with the lowest latency EWMA weighted by its number
+    # of outstanding commands
+    LEAST_LATENCY = "least_latency"
+
+
+class NodeLoad:
+    """
+    Latency and health of a node as seen by the client, maintained by
+    :class:`LoadBalancer` for ``LoadBalancingStrategy.LEAST_LATENCY``.
+    """
+
+    __slots__ = ("outstanding", "latency", "sampled_at", "errors", "unhealthy_until")
+
+    def __init__(self) -> None:
+        self.outstanding = 0
+        # EWMA of the command latency in seconds, None until sampled
+        self.latency: Optional[float] = None
+        self.sampled_at = 0.0
+        # consecutive failed commands
+        self.errors = 0
+        self.unhealthy_until = 0.0
 
 
 class LoadBalancer:
     """
-    Round-Robin Load Balancing
+    Round-Robin Load Balancing, and latency aware replica selection for
+    ``LoadBalancingStrategy.LEAST_LATENCY``.
+
+    The latter uses the samples reported by the client through
+    :meth:`command_started` and :meth:`command_finished`. A node that fails
+    ``error_threshold`` commands in a row is skipped for
+    ``unhealthy_duration`` seconds, and the latency of a node that wasn't
+    used for ``sample_ttl`` seconds is sampled again.
     """
 
-    def __init__(self, start_index: int = 0) -> None:
+    def __init__(
+        self,
+        start_index: int = 0,
+        ewma_alpha: float = 0.2,
+        error_threshold: int = 3,
+        unhealthy_duration: float = 5.0,
+        sample_ttl: float = 10.0,
+    ) -> None:
         self.primary_to_idx = {}
         self.start_index = start_index
+        self.ewma_alpha = ewma_alpha
+        self.error_threshold = error_threshold
+        self.unhealthy_duration = unhealthy_duration
+        self.sample_ttl = sample_ttl
+        self.node_loads: Dict[str, NodeLoad] = {}
+        self._lock = threading.Lock()
 
     def get_server_index(
         self,
         primary: str,
         list_size: int,
         load_balancing_strategy: LoadBalancingStrategy = LoadBalancingStrategy.ROUND_ROBIN,
+        nodes: Optional[List[Any]] = None,
     ) -> int:
         if load_balancing_strategy == LoadBalancingStrategy.RANDOM_REPLICA:
             return self._get_random_replica_index(list_size)
+        elif (
+            load_balancing_strategy == LoadBalancingStrategy.LEAST_LATENCY
+            and nodes is not None
+        ):
+            return self._get_least_latency_index(nodes)
         else:
             return self._get_round_robin_index(
                 primary,
@@ -1428,9 +1594,75 @@ class LoadBalancer:
                 load_balancing_strategy == LoadBalancingStrategy.ROUND_ROBIN_REPLICAS,
             )
 
+    def command_started(self, node_name: str) -> None:
+        with self._lock:
+            try:
+                load = self.node_loads[node_name]
+            except KeyError:
+                load = self.node_loads[node_name] = NodeLoad()
+            load.outstanding += 1
+
+    def command_finished(
+        self, node_name: str, seconds: float, failed: bool = False
+    ) -> None:
+        with self._lock:
+            load = self.node_loads.get(node_name)
+            if load is None:
+                return
+            load.outstanding = max(load.outstanding - 1, 0)
+            if failed:
+                load.errors += 1
+                if load.errors >= self.error_threshold:
+                    load.unhealthy_until = time.monotonic() + self.unhealthy_duration
+                    # a single failure of the next probe marks it again
+                    load.errors = self.error_threshold - 1
+                return
+            load.errors = 0
+            load.unhealthy_until = 0.0
+            if load.latency is None:
+                load.latency = seconds
+            else:
+                load.latency += self.ewma_alpha * (seconds - load.latency)
+            load.sampled_at = time.monotonic()
+
     def reset(self) -> None:
+        # the node loads survive a topology refresh, they describe the nodes
+        # rather than their place in the slots cache
         self.primary_to_idx.clear()
 
+    def _get_least_latency_index(self, nodes: List[Any]) -> int:
+        now = time.monotonic()
+        candidates = []
+        with self._lock:
+            for index in range(1, len(nodes)):
+                load = self.node_loads.get(nodes[index].name)
+                if load is None:
+                    candidates.append((index, None, 0))
+                elif load.unhealthy_until <= now:
+                    latency = load.latency
+                    if latency is not None and now - load.sampled_at > self.sample_ttl:
+                        latency = None
+                    candidates.append((index, latency, load.outstanding))
+        if not candidates:
+            # every replica is unhealthy
+            return 0
+        # nodes without a fresh sample are assumed to be as fast as the
+        # fastest one, so they get commands and thereby a sample
+        fastest = min(
+            (latency for _, latency, _ in candidates if latency is not None),
+            default=1.0,
+        )
+        best_index = best_score = None
+        for index, latency, outstanding in candidates:
+            # on a tie the node without a sample wins
+            score = (
+                (fastest if latency is None else latency) * (outstanding + 1),
+                latency is not None,
+            )
+            if best_score is None or score < best_score:
+                best_index, best_score = index, score
+        return best_index
+
     def _get_random_replica_index(self, list_size: int) -> int:
         return random.randint(1, list_size - 1)
 
@@ -1460,10 +1692,15 @@ class NodesManager:
         cache_config: Optional[CacheConfig] = None,
         cache_factory: Optional[CacheFactoryInterface] = None,
         event_dispatcher: Optional[EventDispatcher] = None,
+        topology_refresh_interval: Optional[float] = None,
         **kwargs,
     ):
+        if topology_refresh_interval is not None and topology_refresh_interval <= 0:
+            raise ValueError('"topology_refresh_interval" must be a positive number')
         self.nodes_cache: Dict[str, Redis] = {}
         self.slots_cache = {}
+        # primary of every slot, the lookup path of most commands
+        self._slot_primaries = [None] * REDIS_CLUSTER_HASH_SLOTS
         self.startup_nodes = {}
         self.default_node = None
         self.populate_startup_nodes(startup_nodes)
@@ -1481,6 +1718,12 @@ class NodesManager:
         if lock is None:
             lock = threading.RLock()
         self._lock = lock
+        # refreshes run one at a time, see initialize()
+        self._refresh_lock = threading.Lock()
+        self._refreshes_started = 0
+        self._refreshes_completed = 0
+        self.topology_refresh_interval = topology_refresh_interval
+        self._refresh_stop: Optional[threading.Event] = None
         if event_dispatcher is None:
             self._event_dispatcher = EventDispatcher()
         else:
@@ -1545,6 +1788,18 @@ class NodesManager:
             # shard. We need to remove all current nodes from the slot's list
             # (including replications) and add just the new node.
             self.slots_cache[e.slot_id] = [redirected_node]
+        self._slot_primaries[e.slot_id] = self.slots_cache[e.slot_id][0]
+        if self._cache is not None:
+            # Entries of the slot were tracked by the node that lost it
+            invalidate_cached_slots(
+                self._cache,
+                {e.slot_id},
+                Encoder(
+                    self.connection_kwargs.get("encoding", "utf-8"),
+                    self.connection_kwargs.get("encoding_errors", "strict"),
+                    self.connection_kwargs.get("decode_responses", False),
+                ),
+            )
         # Reset moved_exception
         self._moved_exception = None
 
@@ -1571,6 +1826,18 @@ class NodesManager:
                 if self._moved_exception:
                     self._update_moved_slots()
 
+        if (
+            not read_from_replicas
+            and load_balancing_strategy is None
+            and server_type != REPLICA
+        ):
+            try:
+                node = self._slot_primaries[slot] if slot >= 0 else None
+            except (IndexError, TypeError):
+                node = None
+            if node is not None:
+                return node
+
         if self.slots_cache.get(slot) is None or len(self.slots_cache[slot]) == 0:
             raise SlotNotCoveredError(
                 f'Slot "{slot}" not covered by the cluster. '
@@ -1584,7 +1851,10 @@ class NodesManager:
             # get the server index using the strategy defined in load_balancing_strategy
             primary_name = self.slots_cache[slot][0].name
             node_idx = self.read_load_balancer.get_server_index(
-                primary_name, len(self.slots_cache[slot]), load_balancing_strategy
+                primary_name,
+                len(self.slots_cache[slot]),
+                load_balancing_strategy,
+                self.slots_cache[slot],
             )
         elif (
             server_type is None
@@ -1700,7 +1970,42 @@ class NodesManager:
         Initializes the nodes cache, slots cache and redis connections.
         :startup_nodes:
             Responsible for discovering other nodes in the cluster
-        """
+
+        Concurrent calls are coalesced: callers that wait for a refresh which
+        started after they were called return once it completes instead of
+        running another one.
+        """
+        started = self._refreshes_started
+        with self._refresh_lock:
+            if self._refreshes_completed > started:
+                return
+            self._refreshes_started += 1
+            refresh = self._refreshes_started
+            self._initialize()
+            self._refreshes_completed = refresh
+        if self.topology_refresh_interval is not None:
+            self._start_refresh()
+
+    def _start_refresh(self) -> None:
+        with self._lock:
+            if self._refresh_stop is not None:
+                return
+            self._refresh_stop = threading.Event()
+            threading.Thread(
+                target=_refresh_topology,
+                args=(weakref.ref(self), self._refresh_stop),
+                name=f"redis-cluster-refresh-{id(self):x}",
+                daemon=True,
+            ).start()
+
+    def _stop_refresh(self) -> None:
+        # restarted by the next initialize()
+        with self._lock:
+            if self._refresh_stop is not None:
+                self._refresh_stop.set()
+                self._refresh_stop = None
+
+    def _initialize(self):
         self.reset()
         tmp_nodes_cache = {}
         tmp_slots = {}
@@ -1724,7 +2029,10 @@ class NodesManager:
                 # Make sure cluster mode is enabled on this node
                 try:
                     cluster_slots = str_if_bytes(r.execute_command("CLUSTER SLOTS"))
-                    r.connection_pool.disconnect()
+                    if self.nodes_cache.get(startup_node.name) is not startup_node:
+                        # keep the connections of the nodes in use, they are
+                        # reused when the node is still part of the cluster
+                        r.connection_pool.disconnect()
                 except ResponseError:
                     raise RedisClusterException(
                         "Cluster mode is not enabled on this node"
@@ -1827,6 +2135,7 @@ class NodesManager:
         # Set the tmp variables to the real variables
         self.nodes_cache = tmp_nodes_cache
         self.slots_cache = tmp_slots
+        self._slot_primaries = build_slot_primaries(tmp_slots)
         # Set the default node
         self.default_node = self.get_nodes_by_server_type(PRIMARY)[0]
         if self._dynamic_startup_nodes:
@@ -1836,6 +2145,7 @@ class NodesManager:
         self._moved_exception = None
 
     def close(self) -> None:
+        self._stop_refresh()
         self.default_node = None
         for node in self.nodes_cache.values():
             if node.redis_connection:
@@ -2158,6 +2468,7 @@ class ClusterPipeline(RedisCluster):
         self.command_stack = []
         self.nodes_manager = nodes_manager
         self.commands_parser = commands_parser
+        self._keyslot_cache = {}
         self.refresh_table_asap = False
         self.result_callbacks = (
             result_callbacks or self.__class__.RESULT_CALLBACKS.copy()
@@ -2823,16 +3134,14 @@ class PipelineStrategy(AbstractStrategy):
         # before reading anything
         # this allows us to flush all the requests out across the
         # network
-        # so that we can read them from different sockets as they come back.
-        # we dont' multiplex on the sockets as they come available,
-        # but that shouldn't make too much difference.
+        # so that we can read them from different sockets as they come back,
+        # in the order they come back.
         try:
             node_commands = nodes.values()
             for n in node_commands:
                 n.write()
 
-            for n in node_commands:
-                n.read()
+            self._read_node_commands(node_commands)
         finally:
             # release all of the redis connections we allocated earlier
             # back into the connection pool.
@@ -2918,6 +3227,49 @@ class PipelineStrategy(AbstractStrategy):
 
         return response
 
+    def _read_node_commands(self, node_commands):
+        """
+        Read the replies of every node, starting with the nodes whose replies
+        arrive first, so parsing them overlaps waiting for the slower nodes.
+        """
+        if len(node_commands) < 2:
+            for n in node_commands:
+                n.read()
+            return
+
+        timeout = 0
+        with selectors.DefaultSelector() as selector:
+            for n in node_commands:
+                sock = getattr(n.connection, "_sock", None)
+                if sock is None or all(c.result is not None for c in n.commands):
+                    # nothing to wait for, read() reports the write errors
+                    n.read()
+                    continue
+                selector.register(sock, selectors.EVENT_READ, n)
+                if timeout is not None:
+                    sock_timeout = sock.gettimeout()
+                    timeout = (
+                        None if sock_timeout is None else max(timeout, sock_timeout)
+                    )
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while selector.get_map():
+                if deadline is not None:
+                    timeout = max(deadline - time.monotonic(), 0)
+                events = selector.select(timeout)
+                if not events:
+                    break
+                for key, _ in events:
+                    selector.unregister(key.fileobj)
+                    key.data.read()
+            # the nodes still waiting did not reply within the socket timeout
+            for key in list(selector.get_map().values()):
+                n = key.data
+                e = TimeoutError(f"Timeout reading from {n.connection._host_error()}")
+                n.connection.disconnect()
+                for c in n.commands:
+                    if c.result is None:
+                        c.result = e
+
     def _is_nodes_flag(self, target_nodes):
         return isinstance(target_nodes, str) and target_nodes in self._pipe.node_flags
 
@@ -1,6 +1,8 @@
+import asyncio
+import copy
 import itertools
 import time
-from typing import Dict, List, Optional, Union
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 
 from redis.client import NEVER_DECODE, Pipeline
 from redis.utils import deprecated_function
@@ -8,12 +10,12 @@ from redis.utils import deprecated_function
 from ..helpers import get_protocol_version
 from ._util import to_string
 from .aggregation import AggregateRequest, AggregateResult, Cursor
-from .document import Document
+from .document import Document, StreamedDocument
 from .field import Field
 from .index_definition import IndexDefinition
 from .profile_information import ProfileInformation
 from .query import Query
-from .result import Result
+from .result import Result, iter_rows
 from .suggestion import SuggestionParser
 
 NUMERIC = "NUMERIC"
@@ -594,6 +596,135 @@ class SearchCommands:
 
         return AggregateResult(rows, cursor, schema)
 
+    def search_iter(
+        self,
+        query: Union[str, Query],
+        query_params: Optional[Dict[str, Union[str, int, float, bytes]]] = None,
+        page_size: int = 1000,
+        read_ahead: int = 1,
+        raw: bool = False,
+    ) -> Iterator[Union[StreamedDocument, Tuple]]:
+        """
+        Iterate over the results of a query from its offset on, reading
+        `page_size` documents per FT.SEARCH call.
+
+        Only one page is held in memory at a time. Once the number of results
+        is known, `read_ahead` pages are requested per round trip.
+
+        ### Parameters
+
+        - **query**: the search query, see `search`. Its paging is ignored,
+                     except for the offset.
+        - **raw**: yield `(id, score, payload, fields)` tuples of the values
+                   as sent by the server, the fields a flat list of names and
+                   values, instead of `StreamedDocument` objects.
+
+        The pages are read at increasing offsets, documents indexed or
+        deleted meanwhile may be skipped or returned twice. The offset is
+        bounded by the MAXSEARCHRESULTS option of the server, use
+        `aggregate_iter` for larger result sets.
+        """
+        query = copy.copy(Query(query) if isinstance(query, str) else query)
+        offset = query._offset
+        total = None
+        while total is None or offset < total:
+            pages = 1
+            if total is not None:
+                remaining = -(-(total - offset) // page_size)
+                pages = max(1, min(read_ahead, remaining))
+            replies = self._search_pages(query, query_params, offset, page_size, pages)
+            for res in replies:
+                total, rows = self._page_rows(res, query, raw)
+                count = 0
+                for row in rows:
+                    count += 1
+                    yield row
+                offset += page_size
+                if count < page_size:
+                    return
+
+    def _search_pages(self, query, query_params, offset, page_size, pages):
+        options = {}
+        if get_protocol_version(self.client) not in ["3", 3]:
+            options[NEVER_DECODE] = True
+        commands = []
+        for page in range(pages):
+            query.paging(offset + page * page_size, page_size)
+            args, _ = self._mk_query_args(query, query_params=query_params)
+            commands.append(args)
+        if pages == 1:
+            return [self.execute_command(SEARCH_CMD, *commands[0], **options)]
+        pipe = self.client.pipeline(transaction=False)
+        for args in commands:
+            pipe.execute_command(SEARCH_CMD, *args, **options)
+        return pipe.execute()
+
+    @staticmethod
+    def _page_rows(res, query: Query, raw: bool):
+        if isinstance(res, dict):
+            # RESP3 results are returned as they are, like by `search`
+            total = res.get("total_results", res.get(b"total_results"))
+            return total, iter(res.get("results", res.get(b"results", [])))
+        rows = iter_rows(
+            res,
+            not query._no_content,
+            query._with_payloads,
+            query._with_scores,
+            query._return_fields_decode_as,
+            decode=not raw,
+        )
+        if not raw:
+            rows = itertools.starmap(StreamedDocument, rows)
+        return res[0], rows
+
+    def aggregate_iter(
+        self,
+        query: AggregateRequest,
+        query_params: Optional[Dict[str, Union[str, int, float]]] = None,
+        count: int = 1000,
+    ) -> Iterator:
+        """
+        Iterate over the rows of an aggregation, reading them through a
+        cursor, `count` rows per FT.CURSOR READ call.
+
+        The cursor options of `query` are used if set. The cursor is deleted
+        if the iteration stops before the last row.
+
+        For more information see `FT.CURSOR <https://redis.io/commands/ft.cursor-read>`_.
+        """  # noqa
+        query = copy.copy(query)
+        if not query._cursor:
+            query.cursor(count=count)
+        cmd = [AGGREGATE_CMD, self.index_name] + query.build_args()
+        cmd += self.get_params_args(query_params)
+        rows, cid = self._cursor_page(self.execute_command(*cmd), query)
+        try:
+            while True:
+                yield from rows
+                if not cid:
+                    return
+                rows, cid = self._cursor_page(
+                    self.execute_command(CURSOR_CMD, "READ", self.index_name, cid),
+                    Cursor(cid),
+                )
+        finally:
+            if cid:
+                try:
+                    self.execute_command(CURSOR_CMD, "DEL", self.index_name, cid)
+                except Exception:
+                    pass
+
+    def _cursor_page(
+        self, raw, query: Union[AggregateRequest, Cursor]
+    ) -> Tuple[list, int]:
+        """Return the rows and the id of the cursor, 0 once it is exhausted"""
+        if isinstance(raw[0], dict):
+            # RESP3 rows are returned as they are, like by `aggregate`
+            results = raw[0].get("results", raw[0].get(b"results", []))
+            return results, int(raw[1])
+        result = self._get_aggregate_result(raw, query, True)
+        return result.rows, int(result.cursor.cid)
+
     def profile(
         self,
         query: Union[Query, AggregateRequest],
@@ -997,6 +1128,109 @@ class AsyncSearchCommands(SearchCommands):
             AGGREGATE_CMD, raw, query=query, has_cursor=has_cursor
         )
 
+    async def search_iter(
+        self,
+        query: Union[str, Query],
+        query_params: Optional[Dict[str, Union[str, int, float, bytes]]] = None,
+        page_size: int = 1000,
+        read_ahead: int = 1,
+        raw: bool = False,
+    ) -> AsyncIterator[Union[StreamedDocument, Tuple]]:
+        """
+        Iterate over the results of a query from its offset on, reading
+        `page_size` documents per FT.SEARCH call. The next pages are requested
+        while the current ones are consumed.
+
+        See `SearchCommands.search_iter` for the parameters.
+        """
+        query = copy.copy(Query(query) if isinstance(query, str) else query)
+        offset = query._offset
+        task = asyncio.ensure_future(
+            self._search_pages(query, query_params, offset, page_size, 1)
+        )
+        try:
+            while task is not None:
+                replies = await task
+                task = None
+                pages = [self._page_rows(res, query, raw) for res in replies]
+                total = pages[-1][0] or 0
+                offset += len(pages) * page_size
+                if offset < total:
+                    remaining = -(-(total - offset) // page_size)
+                    task = asyncio.ensure_future(
+                        self._search_pages(
+                            query,
+                            query_params,
+                            offset,
+                            page_size,
+                            max(1, min(read_ahead, remaining)),
+                        )
+                    )
+                for _, rows in pages:
+                    for row in rows:
+                        yield row
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def _search_pages(self, query, query_params, offset, page_size, pages):
+        options = {}
+        if get_protocol_version(self.client) not in ["3", 3]:
+            options[NEVER_DECODE] = True
+        commands = []
+        for page in range(pages):
+            query.paging(offset + page * page_size, page_size)
+            args, _ = self._mk_query_args(query, query_params=query_params)
+            commands.append(args)
+        if pages == 1:
+            return [await self.execute_command(SEARCH_CMD, *commands[0], **options)]
+        pipe = self.client.pipeline(transaction=False)
+        for args in commands:
+            pipe.execute_command(SEARCH_CMD, *args, **options)
+        return await pipe.execute()
+
+    async def aggregate_iter(
+        self,
+        query: AggregateRequest,
+        query_params: Optional[Dict[str, Union[str, int, float]]] = None,
+        count: int = 1000,
+    ) -> AsyncIterator:
+        """
+        Iterate over the rows of an aggregation, reading them through a
+        cursor, `count` rows per FT.CURSOR READ call. The next rows are read
+        while the current ones are consumed.
+
+        See `SearchCommands.aggregate_iter`.
+        """
+        query = copy.copy(query)
+        if not query._cursor:
+            query.cursor(count=count)
+        cmd = [AGGREGATE_CMD, self.index_name] + query.build_args()
+        cmd += self.get_params_args(query_params)
+        rows, cid = self._cursor_page(await self.execute_command(*cmd), query)
+        task = None
+        try:
+            while True:
+                if cid:
+                    task = asyncio.ensure_future(
+                        self.execute_command(CURSOR_CMD, "READ", self.index_name, cid)
+                    )
+                for row in rows:
+                    yield row
+                if task is None:
+                    return
+                raw = await task
+                task = None
+                rows, cid = self._cursor_page(raw, Cursor(cid))
+        finally:
+            if task is not None:
+                task.cancel()
+            if cid:
+                try:
+                    await self.execute_command(CURSOR_CMD, "DEL", self.index_name, cid)
+                except Exception:
+                    pass
+
     async def spellcheck(self, query, distance=None, include=None, exclude=None):
         """
         Issue a spellcheck query
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterator, Optional, Tuple
 
 from ._util import to_string
 from .document import Document
@@ -30,52 +30,9 @@ class Result:
         self.duration = duration
         self.docs = []
 
-        step = 1
-        if hascontent:
-            step = step + 1
-        if has_payload:
-            step = step + 1
-        if with_scores:
-            step = step + 1
-
-        offset = 2 if with_scores else 1
-
-        for i in range(1, len(res), step):
-            id = to_string(res[i])
-            payload = to_string(res[i + offset]) if has_payload else None
-            # fields_offset = 2 if has_payload else 1
-            fields_offset = offset + 1 if has_payload else offset
-            score = float(res[i + 1]) if with_scores else None
-
-            fields = {}
-            if hascontent and res[i + fields_offset] is not None:
-                keys = map(to_string, res[i + fields_offset][::2])
-                values = res[i + fields_offset][1::2]
-
-                for key, value in zip(keys, values):
-                    if field_encodings is None or key not in field_encodings:
-                        fields[key] = to_string(value)
-                        continue
-
-                    encoding = field_encodings[key]
-
-                    # If the encoding is None, we don't need to decode the value
-                    if encoding is None:
-                        fields[key] = value
-                    else:
-                        fields[key] = to_string(value, encoding=encoding)
-
-            try:
-                del fields["id"]
-            except KeyError:
-                pass
-
-            try:
-                fields["json"] = fields["$"]
-                del fields["$"]
-            except KeyError:
-                pass
-
+        for id, score, payload, fields in iter_rows(
+            res, hascontent, has_payload, with_scores, field_encodings
+        ):
             doc = (
                 Document(id, score=score, payload=payload, **fields)
                 if with_scores
@@ -85,3 +42,78 @@ class Result:
 
     def __repr__(self) -> str:
         return f"Result{{{self.total} total, docs: {self.docs}}}"
+
+
+def iter_rows(
+    res,
+    hascontent,
+    has_payload=False,
+    with_scores=False,
+    field_encodings: Optional[dict] = None,
+    decode=True,
+) -> Iterator[Tuple]:
+    """
+    Yield the ``(id, score, payload, fields)`` of every document of a RESP2
+    FT.SEARCH reply, one at a time.
+
+    With ``decode`` the id, payload and fields are decoded to strings and the
+    fields are a dict, otherwise they are left as the server sent them, the
+    fields as a flat list of names and values.
+    """
+    step = 1
+    if hascontent:
+        step = step + 1
+    if has_payload:
+        step = step + 1
+    if with_scores:
+        step = step + 1
+
+    offset = 2 if with_scores else 1
+
+    for i in range(1, len(res), step):
+        id = res[i]
+        payload = res[i + offset] if has_payload else None
+        # fields_offset = 2 if has_payload else 1
+        fields_offset = offset + 1 if has_payload else offset
+        score = float(res[i + 1]) if with_scores else None
+        fields = res[i + fields_offset] if hascontent else None
+
+        if decode:
+            id = to_string(id)
+            payload = to_string(payload) if has_payload else None
+            fields = _decode_fields(fields, field_encodings)
+
+        yield id, score, payload, fields
+
+
+def _decode_fields(raw_fields, field_encodings: Optional[dict]) -> dict:
+    fields = {}
+    if raw_fields is not None:
+        keys = map(to_string, raw_fields[::2])
+        values = raw_fields[1::2]
+
+        for key, value in zip(keys, values):
+            if field_encodings is None or key not in field_encodings:
+                fields[key] = to_string(value)
+                continue
+
+            encoding = field_encodings[key]
+
+            # If the encoding is None, we don't need to decode the value
+            if encoding is None:
+                fields[key] = value
+            else:
+                fields[key] = to_string(value, encoding=encoding)
+
+    try:
+        del fields["id"]
+    except KeyError:
+        pass
+
+    try:
+        fields["json"] = fields["$"]
+        del fields["$"]
+    except KeyError:
+        pass
+
+    return fields
@@ -52,6 +52,19 @@ class AbstractCommandsParser:
             cmd_dict["subcommands"] = command[9]
         return cmd_dict
 
+    def _get_fixed_keys(self, args):
+        """
+        Get the keys of a command whose key positions were already looked up,
+        or None if they were not.
+        """
+        positions = self._key_positions.get(args[0])
+        if positions is None:
+            return None
+        first_key_pos, last_key_pos, step_count = positions
+        if last_key_pos < 0:
+            last_key_pos += len(args)
+        return list(args[first_key_pos : last_key_pos + 1 : step_count])
+
 
 class CommandsParser(AbstractCommandsParser):
     """
@@ -64,6 +77,8 @@ class CommandsParser(AbstractCommandsParser):
 
     def __init__(self, redis_connection):
         self.commands = {}
+        # command name as passed -> key positions, for fixed position commands
+        self._key_positions = {}
         self.initialize(redis_connection)
 
     def initialize(self, r):
@@ -75,6 +90,7 @@ class CommandsParser(AbstractCommandsParser):
         for cmd in uppercase_commands:
             commands[cmd.lower()] = commands.pop(cmd)
         self.commands = commands
+        self._key_positions = {}
 
     # As soon as this PR is merged into Redis, we should reimplement
     # our logic to use COMMAND INFO changes to determine the key positions
@@ -94,8 +110,13 @@ class CommandsParser(AbstractCommandsParser):
             # The command has no keys in it
             return None
 
+        keys = self._get_fixed_keys(args)
+        if keys is not None:
+            return keys
+
         cmd_name = args[0].lower()
-        if cmd_name not in self.commands:
+        fixed = cmd_name in self.commands
+        if not fixed:
             # try to split the command name and to take only the main command,
             # e.g. 'memory' for 'memory usage'
             cmd_name_split = cmd_name.split()
@@ -134,6 +155,13 @@ class CommandsParser(AbstractCommandsParser):
                 # The command doesn't have keys in it
                 if not is_subcmd:
                     return None
+                fixed = False
+            if fixed:
+                self._key_positions[args[0]] = (
+                    command["first_key_pos"],
+                    command["last_key_pos"],
+                    command["step_count"],
+                )
             last_key_pos = command["last_key_pos"]
             if last_key_pos < 0:
                 last_key_pos = len(args) - abs(last_key_pos)
@@ -186,10 +214,12 @@ class AsyncCommandsParser(AbstractCommandsParser):
     So, don't use this with EVAL or EVALSHA.
     """
 
-    __slots__ = ("commands", "node")
+    __slots__ = ("commands", "node", "_key_positions")
 
     def __init__(self) -> None:
         self.commands: Dict[str, Union[int, Dict[str, Any]]] = {}
+        # command name as passed -> key positions, for fixed position commands
+        self._key_positions: Dict[str, Tuple[int, int, int]] = {}
 
     async def initialize(self, node: Optional["ClusterNode"] = None) -> None:
         if node:
@@ -197,6 +227,7 @@ class AsyncCommandsParser(AbstractCommandsParser):
 
         commands = await self.node.execute_command("COMMAND")
         self.commands = {cmd.lower(): command for cmd, command in commands.items()}
+        self._key_positions = {}
 
     # As soon as this PR is merged into Redis, we should reimplement
     # our logic to use COMMAND INFO changes to determine the key positions
@@ -216,8 +247,13 @@ class AsyncCommandsParser(AbstractCommandsParser):
             # The command has no keys in it
             return None
 
+        keys = self._get_fixed_keys(args)
+        if keys is not None:
+            return keys
+
         cmd_name = args[0].lower()
-        if cmd_name not in self.commands:
+        fixed = cmd_name in self.commands
+        if not fixed:
             # try to split the command name and to take only the main command,
             # e.g. 'memory' for 'memory usage'
             cmd_name_split = cmd_name.split()
@@ -256,6 +292,13 @@ class AsyncCommandsParser(AbstractCommandsParser):
                 # The command doesn't have keys in it
                 if not is_subcmd:
                     return None
+                fixed = False
+            if fixed:
+                self._key_positions[args[0]] = (
+                    command["first_key_pos"],
+                    command["last_key_pos"],
+                    command["step_count"],
+                )
             last_key_pos = command["last_key_pos"]
             if last_key_pos < 0:
                 last_key_pos = len(args) - abs(last_key_pos)
@@ -46,6 +46,7 @@ class _HiredisParser(BaseParser, PushNotificationsParser):
             raise RedisError("Hiredis is not installed")
         self.socket_read_size = socket_read_size
         self._buffer = bytearray(socket_read_size)
+        self._metrics = None
         self.pubsub_push_handler_func = self.handle_pubsub_push_response
         self.invalidation_push_handler_func = None
         self._hiredis_PushNotificationType = None
@@ -66,6 +67,7 @@ class _HiredisParser(BaseParser, PushNotificationsParser):
 
         self._sock = connection._sock
         self._socket_timeout = connection.socket_timeout
+        self._metrics = getattr(connection, "metrics", None)
         kwargs = {
             "protocolError": InvalidResponse,
             "replyError": self.parse_error,
@@ -108,6 +110,8 @@ class _HiredisParser(BaseParser, PushNotificationsParser):
             bufflen = self._sock.recv_into(self._buffer)
             if bufflen == 0:
                 raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR)
+            if self._metrics is not None:
+                self._metrics.record_bytes_received(bufflen)
             self._reader.feed(self._buffer, 0, bufflen)
             # data was read from the socket and added to the buffer.
             # return True to indicate that data was read.
@@ -207,6 +211,7 @@ class _AsyncHiredisParser(AsyncBaseParser, AsyncPushNotificationsParser):
         import hiredis
 
         self._stream = connection._reader
+        self._metrics = getattr(connection, "metrics", None)
         kwargs: _HiredisReaderArgs = {
             "protocolError": InvalidResponse,
             "replyError": self.parse_error,
@@ -245,6 +250,8 @@ class _AsyncHiredisParser(AsyncBaseParser, AsyncPushNotificationsParser):
         buffer = await self._stream.read(self._read_size)
         if not buffer or not isinstance(buffer, bytes):
             raise ConnectionError(SERVER_CLOSED_CONNECTION_ERROR) from None
+        if self._metrics is not None:
+            self._metrics.record_bytes_received(len(buffer))
         self._reader.feed(buffer)
         # data was read from the socket and added to the buffer.
         # return True to indicate that data was read.
@@ -2,6 +2,7 @@ import asyncio
 import copy
 import inspect
 import re
+import time
 import warnings
 from typing import (
     TYPE_CHECKING,
@@ -31,7 +32,9 @@ from redis._parsers.helpers import (
     _RedisCallbacksRESP3,
     bool_ok,
 )
+from redis.asyncio.autopipeline import AutoPipeline, can_auto_pipeline
 from redis.asyncio.connection import (
+    CACHE_KEY,
     Connection,
     ConnectionPool,
     SSLConnection,
@@ -40,6 +43,7 @@ from redis.asyncio.connection import (
 from redis.asyncio.lock import Lock
 from redis.asyncio.retry import Retry
 from redis.backoff import ExponentialWithJitterBackoff
+from redis.cache import CacheConfig, CacheInterface, CacheKey
 from redis.client import (
     EMPTY_RESPONSE,
     NEVER_DECODE,
@@ -52,6 +56,7 @@ from redis.commands import (
     AsyncSentinelCommands,
     list_or_args,
 )
+from redis.commands.core import EVALSHA_COMMANDS, AsyncScriptRegistry
 from redis.credentials import CredentialProvider
 from redis.event import (
     AfterPooledConnectionsInstantiationEvent,
@@ -63,11 +68,13 @@ from redis.event import (
 from redis.exceptions import (
     ConnectionError,
     ExecAbortError,
+    NoScriptError,
     PubSubError,
     RedisError,
     ResponseError,
     WatchError,
 )
+from redis.metrics import ClientMetrics
 from redis.typing import ChannelT, EncodableT, KeyT
 from redis.utils import (
     SSL_AVAILABLE,
@@ -129,6 +136,7 @@ class Redis(
         url: str,
         single_connection_client: bool = False,
         auto_close_connection_pool: Optional[bool] = None,
+        auto_pipeline: bool = False,
         **kwargs,
     ):
         """
@@ -177,6 +185,7 @@ class Redis(
         client = cls(
             connection_pool=connection_pool,
             single_connection_client=single_connection_client,
+            auto_pipeline=auto_pipeline,
         )
         if auto_close_connection_pool is not None:
             warnings.warn(
@@ -245,6 +254,7 @@ class Redis(
         ssl_ciphers: Optional[str] = None,
         max_connections: Optional[int] = None,
         single_connection_client: bool = False,
+        auto_pipeline: bool = False,
         health_check_interval: int = 0,
         client_name: Optional[str] = None,
         lib_name: Optional[str] = "redis-py",
@@ -254,7 +264,10 @@ class Redis(
         redis_connect_func=None,
         credential_provider: Optional[CredentialProvider] = None,
         protocol: Optional[int] = 2,
+        cache: Optional[CacheInterface] = None,
+        cache_config: Optional[CacheConfig] = None,
         event_dispatcher: Optional[EventDispatcher] = None,
+        metrics: Optional[ClientMetrics] = None,
     ):
         """
         Initialize a new Redis client.
@@ -276,6 +289,24 @@ class Redis(
 
         When 'connection_pool' is provided - the retry configuration of the
         provided pool will be used.
+
+        When `auto_pipeline` is set, commands awaited within the same event
+        loop iteration are written together on one shared connection and
+        their replies are read back in order, instead of each command taking
+        a connection from the pool. Blocking and connection-state commands
+        (e.g. BLPOP, SELECT, WATCH) still run on a dedicated connection.
+        Auto-pipelined commands are not retried on connection errors, since
+        the server may already have executed them.
+
+        When `cache` or `cache_config` is set, replies of read-only commands
+        are cached locally. Key tracking of every pool connection is
+        redirected to a dedicated connection that applies invalidations in
+        the background, so caching works with both RESP2 and RESP3.
+
+        When `metrics` is set, the connection pool, its connections and the
+        client record pool wait times, connection counts, bytes sent and
+        received and command latencies in it, see
+        `ConnectionPool.collect_metrics()`.
         """
         kwargs: Dict[str, Any]
         if event_dispatcher is None:
@@ -354,6 +385,21 @@ class Redis(
                             "ssl_ciphers": ssl_ciphers,
                         }
                     )
+            if cache_config or cache:
+                kwargs.update(
+                    {
+                        "cache": cache,
+                        "cache_config": cache_config,
+                    }
+                )
+            if metrics is not None:
+                # collected metrics are dispatched to the client's listeners
+                kwargs.update(
+                    {
+                        "metrics": metrics,
+                        "event_dispatcher": self._event_dispatcher,
+                    }
+                )
             # This arg only used if no pool is passed in
             self.auto_close_connection_pool = auto_close_connection_pool
             connection_pool = ConnectionPool(**kwargs)
@@ -374,6 +420,11 @@ class Redis(
         self.connection_pool = connection_pool
         self.single_connection_client = single_connection_client
         self.connection: Optional[Connection] = None
+        self._auto_pipeline: Optional[AutoPipeline] = None
+        if auto_pipeline and not single_connection_client:
+            self._auto_pipeline = AutoPipeline(self)
+
+        self.script_registry = AsyncScriptRegistry()
 
         self.response_callbacks = CaseInsensitiveDict(_RedisCallbacks)
 
@@ -424,6 +475,9 @@ class Redis(
     def get_retry(self) -> Optional[Retry]:
         return self.get_connection_kwargs().get("retry")
 
+    def get_cache(self) -> Optional[CacheInterface]:
+        return self.connection_pool.cache
+
     def set_retry(self, retry: Retry) -> None:
         self.get_connection_kwargs().update({"retry": retry})
         self.connection_pool.set_retry(retry)
@@ -504,6 +558,7 @@ class Redis(
         lock_class: Optional[Type[Lock]] = None,
         thread_local: bool = True,
         raise_on_release_error: bool = True,
+        notify: bool = False,
     ) -> Lock:
         """
         Return a new Lock object using key ``name`` that mimics
@@ -555,6 +610,9 @@ class Redis(
         this is True, meaning an exception will be raised. If False, the warning
         will be logged and the exception will be suppressed.
 
+        ``notify`` makes blocking acquires wait for a signal pushed on release
+        instead of polling every ``sleep`` seconds, see :class:`Lock`.
+
         In some use cases it's necessary to disable thread local storage. For
         example, if you have code where one thread acquires a lock and passes
         that lock instance to a worker thread to release later. If thread
@@ -573,6 +631,7 @@ class Redis(
             blocking_timeout=blocking_timeout,
             thread_local=thread_local,
             raise_on_release_error=raise_on_release_error,
+            notify=notify,
         )
 
     def pubsub(self, **kwargs) -> "PubSub":
@@ -632,6 +691,8 @@ class Redis(
         if conn:
             self.connection = None
             await self.connection_pool.release(conn)
+        if self._auto_pipeline is not None:
+            await self._auto_pipeline.aclose()
         if close_connection_pool or (
             close_connection_pool is None and self.auto_close_connection_pool
         ):
@@ -648,8 +709,16 @@ class Redis(
         """
         Send a command and parse the response
         """
-        await conn.send_command(*args)
-        return await self.parse_response(conn, command_name, **options)
+        metrics = getattr(conn, "metrics", None)
+        if metrics is None:
+            await conn.send_command(*args)
+            return await self.parse_response(conn, command_name, **options)
+        started = time.perf_counter()
+        try:
+            await conn.send_command(*args)
+            return await self.parse_response(conn, command_name, **options)
+        finally:
+            metrics.record_command(command_name, time.perf_counter() - started)
 
     async def _close_connection(self, conn: Connection):
         """
@@ -667,13 +736,33 @@ class Redis(
     async def execute_command(self, *args, **options):
         """Execute a command and return a parsed response"""
         await self.initialize()
-        pool = self.connection_pool
         command_name = args[0]
+        pool = self.connection_pool
+        if pool.cache is not None and options.get("keys"):
+            cache_key = CacheKey(
+                command=command_name, redis_keys=tuple(options["keys"])
+            )
+            if pool.cache.is_cachable(cache_key):
+                entry = pool.get_cache_entry(cache_key)
+                if entry is not None:
+                    return await self._handle_response(
+                        command_name, copy.deepcopy(entry.cache_value), **options
+                    )
+                options[CACHE_KEY] = cache_key
+        if (
+            self._auto_pipeline is not None
+            and can_auto_pipeline(command_name)
+            # loading the registered scripts needs the connection to itself
+            and command_name not in EVALSHA_COMMANDS
+        ):
+            return await self._auto_pipeline.execute_command(*args, **options)
         conn = self.connection or await pool.get_connection()
 
         if self.single_connection_client:
             await self._single_conn_lock.acquire()
         try:
+            if command_name in EVALSHA_COMMANDS:
+                await self.script_registry.attach(conn)
             return await conn.retry.call_with_retry(
                 lambda: self._send_command_parse_response(
                     conn, command_name, *args, **options
@@ -693,7 +782,6 @@ class Redis(
         try:
             if NEVER_DECODE in options:
                 response = await connection.read_response(disable_decoding=True)
-                options.pop(NEVER_DECODE)
             else:
                 response = await connection.read_response()
         except ResponseError:
@@ -701,8 +789,17 @@ class Redis(
                 return options[EMPTY_RESPONSE]
             raise
 
-        if EMPTY_RESPONSE in options:
-            options.pop(EMPTY_RESPONSE)
+        cache_key = options.pop(CACHE_KEY, None)
+        if cache_key is not None:
+            self.connection_pool.cache_response(connection, cache_key, response)
+        return await self._handle_response(command_name, response, **options)
+
+    async def _handle_response(
+        self, command_name: Union[str, bytes], response: Any, **options
+    ):
+        """Applies the response callback of ``command_name``"""
+        options.pop(NEVER_DECODE, None)
+        options.pop(EMPTY_RESPONSE, None)
 
         # Remove keys entry, it needs only for cache.
         options.pop("keys", None)
@@ -1510,11 +1607,44 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
                 )
             except ResponseError as e:
                 response.append(e)
+        if self.scripts:
+            await self._rerun_flushed_scripts(connection, commands, response)
 
         if raise_on_error:
             self.raise_first_error(commands, response)
         return response
 
+    async def _rerun_flushed_scripts(
+        self, connection: Connection, commands: CommandStackT, response: List[Any]
+    ) -> None:
+        # the scripts known to be loaded weren't checked, so a SCRIPT FLUSH
+        # by another client shows as NOSCRIPT: load them again and re-run
+        # the EVALSHA calls that failed
+        scripts = {s.sha: s for s in self.scripts}
+        failed = [
+            i
+            for i, r in enumerate(response)
+            if isinstance(r, NoScriptError)
+            and str_if_bytes(commands[i][0][1]) in scripts
+        ]
+        if not failed:
+            return
+        for s in scripts.values():
+            if s.registry is not None:
+                s.registry.forget(connection)
+        await self.load_scripts()
+        rerun = [commands[i] for i in failed]
+        await connection.send_packed_command(
+            connection.pack_commands([args for args, _ in rerun])
+        )
+        for i, (args, options) in zip(failed, rerun):
+            try:
+                response[i] = await self.parse_response(
+                    connection, args[0], **options
+                )
+            except ResponseError as e:
+                response[i] = e
+
     def raise_first_error(self, commands: CommandStackT, response: Iterable[Any]):
         for i, r in enumerate(response):
             if isinstance(r, ResponseError):
@@ -1542,8 +1672,19 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
         return result
 
     async def load_scripts(self):
-        # make sure all scripts that are about to be run on this pipeline exist
-        scripts = list(self.scripts)
+        # make sure all scripts that are about to be run on this pipeline exist,
+        # except those known to be loaded on the server of the connection. a
+        # transaction can't re-run an EVALSHA failing with NOSCRIPT after the
+        # other commands ran, so it always checks
+        conn = self.connection
+        check_all = conn is None or self.is_transaction or self.explicit_transaction
+        scripts = [
+            s
+            for s in self.scripts
+            if check_all or s.registry is None or not s.registry.is_loaded(conn, s.sha)
+        ]
+        if not scripts:
+            return
         immediate = self.immediate_execute_command
         shas = [s.sha for s in scripts]
         # we can't use the normal script_* methods because they would just
@@ -1553,6 +1694,9 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
             for s, exist in zip(scripts, exists):
                 if not exist:
                     s.sha = await immediate("SCRIPT LOAD", s.script)
+        for s in scripts:
+            if s.registry is not None:
+                s.registry.mark_loaded(self.connection, s.sha)
 
     async def _disconnect_raise_on_watching(self, conn: Connection, error: Exception):
         """
@@ -1578,8 +1722,6 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
         stack = self.command_stack
         if not stack and not self.watching:
             return []
-        if self.scripts:
-            await self.load_scripts()
         if self.is_transaction or self.explicit_transaction:
             execute = self._execute_transaction
         else:
@@ -1593,11 +1735,20 @@ class Pipeline(Redis):  # lgtm [py/init-calls-subclass]
             self.connection = conn
         conn = cast(Connection, conn)
 
+        scripts = self.scripts
         try:
+            if scripts:
+                await self.load_scripts()
             return await conn.retry.call_with_retry(
                 lambda: execute(conn, stack, raise_on_error),
                 lambda error: self._disconnect_raise_on_watching(conn, error),
             )
+        except NoScriptError:
+            # the script cache of the server was flushed, check it next time
+            for s in scripts:
+                if s.registry is not None:
+                    s.registry.forget(conn)
+            raise
         finally:
             await self.reset()
 
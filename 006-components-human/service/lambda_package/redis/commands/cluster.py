@@ -1,4 +1,5 @@
 import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -14,7 +15,6 @@ from typing import (
     Union,
 )
 
-from redis.crc import key_slot
 from redis.exceptions import RedisClusterException, RedisError
 from redis.typing import (
     AnyKeyT,
@@ -106,7 +106,7 @@ class ClusterMultiKeyCommands(ClusterCommandsProtocol):
 
         slots_to_keys = {}
         for key in keys:
-            slot = key_slot(self.encoder.encode(key))
+            slot = self.keyslot(key)
             slots_to_keys.setdefault(slot, []).append(key)
 
         return slots_to_keys
@@ -118,13 +118,16 @@ class ClusterMultiKeyCommands(ClusterCommandsProtocol):
 
         slots_to_pairs = {}
         for pair in mapping.items():
-            slot = key_slot(self.encoder.encode(pair[0]))
+            slot = self.keyslot(pair[0])
             slots_to_pairs.setdefault(slot, []).extend(pair)
 
         return slots_to_pairs
 
     def _execute_pipeline_by_slot(
-        self, command: str, slots_to_args: Mapping[int, Iterable[EncodableT]]
+        self,
+        command: str,
+        slots_to_args: Mapping[int, Iterable[EncodableT]],
+        **options: Any,
     ) -> List[Any]:
         read_from_replicas = self.read_from_replicas and command in READ_COMMANDS
         pipe = self.pipeline()
@@ -135,6 +138,7 @@ class ClusterMultiKeyCommands(ClusterCommandsProtocol):
                 target_nodes=[
                     self.nodes_manager.get_node_from_slot(slot, read_from_replicas)
                 ],
+                **options,
             )
             for slot, slot_args in slots_to_args.items()
         ]
@@ -320,7 +324,10 @@ class AsyncClusterMultiKeyCommands(ClusterMultiKeyCommands):
         return sum(await self._execute_pipeline_by_slot(command, slots_to_keys))
 
     async def _execute_pipeline_by_slot(
-        self, command: str, slots_to_args: Mapping[int, Iterable[EncodableT]]
+        self,
+        command: str,
+        slots_to_args: Mapping[int, Iterable[EncodableT]],
+        **options: Any,
     ) -> List[Any]:
         if self._initialize:
             await self.initialize()
@@ -333,6 +340,7 @@ class AsyncClusterMultiKeyCommands(ClusterMultiKeyCommands):
                 target_nodes=[
                     self.nodes_manager.get_node_from_slot(slot, read_from_replicas)
                 ],
+                **options,
             )
             for slot, slot_args in slots_to_args.items()
         ]
@@ -779,11 +787,35 @@ class ClusterDataAccessCommands(DataAccessCommands):
         match: Optional[PatternT] = None,
         count: Optional[int] = None,
         _type: Optional[str] = None,
+        prefetch: bool = False,
+        batched: bool = False,
         **kwargs,
     ) -> Iterator:
+        """
+        Make an iterator using the SCAN command on all primaries, or on
+        ``target_nodes``.
+
+        ``prefetch`` scans the nodes in parallel from worker threads, each
+            requesting its next page while the current one is consumed.
+
+        ``batched`` yields the keys of each reply as a list instead of one
+            by one.
+        """
+        kwargs.update(match=match, count=count, _type=_type)
+        if prefetch:
+            pages = self._scan_node_pages_parallel(**kwargs)
+        else:
+            pages = self._scan_node_pages(**kwargs)
+        for data in pages:
+            if not batched:
+                yield from data
+            elif data:
+                yield data
+
+    def _scan_node_pages(self, **kwargs) -> Iterator:
         # Do the first query with cursor=0 for all nodes
-        cursors, data = self.scan(match=match, count=count, _type=_type, **kwargs)
-        yield from data
+        cursors, data = self.scan(**kwargs)
+        yield data
 
         cursors = {name: cursor for name, cursor in cursors.items() if cursor != 0}
         if cursors:
@@ -795,20 +827,40 @@ class ClusterDataAccessCommands(DataAccessCommands):
             while cursors:
                 for name, cursor in cursors.items():
                     cur, data = self.scan(
-                        cursor=cursor,
-                        match=match,
-                        count=count,
-                        _type=_type,
-                        target_nodes=nodes[name],
-                        **kwargs,
+                        cursor=cursor, target_nodes=nodes[name], **kwargs
                     )
-                    yield from data
+                    yield data
                     cursors[name] = cur[name]
 
                 cursors = {
                     name: cursor for name, cursor in cursors.items() if cursor != 0
                 }
 
+    def _scan_node_pages_parallel(self, **kwargs) -> Iterator:
+        target_nodes = kwargs.pop("target_nodes", None)
+        if target_nodes is None:
+            nodes = self.get_primaries()
+        elif self._is_nodes_flag(target_nodes):
+            nodes = self._determine_nodes("SCAN", nodes_flag=target_nodes)
+        else:
+            nodes = list(self._parse_target_nodes(target_nodes))
+
+        def fetch(node, cursor):
+            cursors, data = self.scan(cursor=cursor, target_nodes=node, **kwargs)
+            return node, cursors[node.name], data
+
+        # one page in flight per node, requested as soon as the previous
+        # page of that node arrived
+        with ThreadPoolExecutor(max_workers=max(len(nodes), 1)) as executor:
+            pending = {executor.submit(fetch, node, 0) for node in nodes}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, cursor, data = future.result()
+                    if cursor != 0:
+                        pending.add(executor.submit(fetch, node, cursor))
+                    yield data
+
 
 class AsyncClusterDataAccessCommands(
     ClusterDataAccessCommands, AsyncDataAccessCommands
@@ -825,12 +877,36 @@ class AsyncClusterDataAccessCommands(
         match: Optional[PatternT] = None,
         count: Optional[int] = None,
         _type: Optional[str] = None,
+        prefetch: bool = False,
+        batched: bool = False,
         **kwargs,
     ) -> AsyncIterator:
+        """
+        Make an iterator using the SCAN command on all primaries, or on
+        ``target_nodes``.
+
+        ``prefetch`` scans the nodes concurrently, each one in a task
+            requesting its next page while the current one is consumed.
+
+        ``batched`` yields the keys of each reply as a list instead of one
+            by one.
+        """
+        kwargs.update(match=match, count=count, _type=_type)
+        if prefetch:
+            pages = self._scan_node_pages_parallel(**kwargs)
+        else:
+            pages = self._scan_node_pages(**kwargs)
+        async for data in pages:
+            if not batched:
+                for value in data:
+                    yield value
+            elif data:
+                yield data
+
+    async def _scan_node_pages(self, **kwargs) -> AsyncIterator:
         # Do the first query with cursor=0 for all nodes
-        cursors, data = await self.scan(match=match, count=count, _type=_type, **kwargs)
-        for value in data:
-            yield value
+        cursors, data = await self.scan(**kwargs)
+        yield data
 
         cursors = {name: cursor for name, cursor in cursors.items() if cursor != 0}
         if cursors:
@@ -842,21 +918,45 @@ class AsyncClusterDataAccessCommands(
             while cursors:
                 for name, cursor in cursors.items():
                     cur, data = await self.scan(
-                        cursor=cursor,
-                        match=match,
-                        count=count,
-                        _type=_type,
-                        target_nodes=nodes[name],
-                        **kwargs,
+                        cursor=cursor, target_nodes=nodes[name], **kwargs
                     )
-                    for value in data:
-                        yield value
+                    yield data
                     cursors[name] = cur[name]
 
                 cursors = {
                     name: cursor for name, cursor in cursors.items() if cursor != 0
                 }
 
+    async def _scan_node_pages_parallel(self, **kwargs) -> AsyncIterator:
+        target_nodes = kwargs.pop("target_nodes", None)
+        if target_nodes is None:
+            nodes = self.get_primaries()
+        elif self._is_node_flag(target_nodes):
+            nodes = await self._determine_nodes("SCAN", node_flag=target_nodes)
+        else:
+            nodes = self._parse_target_nodes(target_nodes)
+
+        async def fetch(node, cursor):
+            cursors, data = await self.scan(cursor=cursor, target_nodes=node, **kwargs)
+            return node, cursors[node.name], data
+
+        # one page in flight per node, requested as soon as the previous
+        # page of that node arrived
+        pending = {asyncio.ensure_future(fetch(node, 0)) for node in nodes}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    node, cursor, data = task.result()
+                    if cursor != 0:
+                        pending.add(asyncio.ensure_future(fetch(node, cursor)))
+                    yield data
+        finally:
+            for task in pending:
+                task.cancel()
+
 
 class RedisClusterCommands(
     ClusterMultiKeyCommands,
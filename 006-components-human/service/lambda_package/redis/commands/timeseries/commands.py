@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional, Tuple, Union
+from array import array
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, Union
 
 from redis.exceptions import DataError
 from redis.typing import KeyT, Number
@@ -573,6 +574,7 @@ class TimeSeriesCommands:
         latest: Optional[bool] = False,
         bucket_timestamp: Optional[str] = None,
         empty: Optional[bool] = False,
+        columnar: Optional[bool] = False,
     ):
         """
         Query a range in forward direction for a specific time-series.
@@ -614,6 +616,9 @@ class TimeSeriesCommands:
                 `+`, `high`, `~`, `mid`].
             empty:
                 Reports aggregations for empty buckets.
+            columnar:
+                Return the samples as an `array("q")` of timestamps and
+                an `array("d")` of values instead of a list of tuples.
         """
         params = self.__range_params(
             key,
@@ -630,7 +635,8 @@ class TimeSeriesCommands:
             bucket_timestamp,
             empty,
         )
-        return self.execute_command(RANGE_CMD, *params, keys=[key])
+        options = {"columnar": True} if columnar else {}
+        return self.execute_command(RANGE_CMD, *params, keys=[key], **options)
 
     def revrange(
         self,
@@ -647,6 +653,7 @@ class TimeSeriesCommands:
         latest: Optional[bool] = False,
         bucket_timestamp: Optional[str] = None,
         empty: Optional[bool] = False,
+        columnar: Optional[bool] = False,
     ):
         """
         Query a range in reverse direction for a specific time-series.
@@ -690,6 +697,9 @@ class TimeSeriesCommands:
                 `+`, `high`, `~`, `mid`].
             empty:
                 Reports aggregations for empty buckets.
+            columnar:
+                Return the samples as an `array("q")` of timestamps and
+                an `array("d")` of values instead of a list of tuples.
         """
         params = self.__range_params(
             key,
@@ -706,7 +716,80 @@ class TimeSeriesCommands:
             bucket_timestamp,
             empty,
         )
-        return self.execute_command(REVRANGE_CMD, *params, keys=[key])
+        options = {"columnar": True} if columnar else {}
+        return self.execute_command(REVRANGE_CMD, *params, keys=[key], **options)
+
+    def range_iter(
+        self,
+        key: KeyT,
+        from_time: Union[int, str],
+        to_time: Union[int, str],
+        chunk_size: int = 10000,
+        filter_by_ts: Optional[List[int]] = None,
+        filter_by_min_value: Optional[int] = None,
+        filter_by_max_value: Optional[int] = None,
+        latest: Optional[bool] = False,
+    ) -> Iterator[Tuple[array, array]]:
+        """
+        Iterate over the raw samples of a range in forward direction, reading
+        `chunk_size` samples per TS.RANGE call.
+
+        Yields an `array("q")` of timestamps and an `array("d")` of values per
+        chunk, so memory is bounded by the chunk size however large the range
+        is. Aggregations are not supported, use `range` for them.
+        """
+        while True:
+            timestamps, values = self.range(
+                key,
+                from_time,
+                to_time,
+                count=chunk_size,
+                filter_by_ts=filter_by_ts,
+                filter_by_min_value=filter_by_min_value,
+                filter_by_max_value=filter_by_max_value,
+                latest=latest,
+                columnar=True,
+            )
+            if timestamps:
+                yield timestamps, values
+            if len(timestamps) < chunk_size:
+                return
+            from_time = timestamps[-1] + 1
+
+    def revrange_iter(
+        self,
+        key: KeyT,
+        from_time: Union[int, str],
+        to_time: Union[int, str],
+        chunk_size: int = 10000,
+        filter_by_ts: Optional[List[int]] = None,
+        filter_by_min_value: Optional[int] = None,
+        filter_by_max_value: Optional[int] = None,
+        latest: Optional[bool] = False,
+    ) -> Iterator[Tuple[array, array]]:
+        """
+        Iterate over the raw samples of a range in reverse direction, reading
+        `chunk_size` samples per TS.REVRANGE call.
+
+        See `range_iter` for the chunks yielded.
+        """
+        while True:
+            timestamps, values = self.revrange(
+                key,
+                from_time,
+                to_time,
+                count=chunk_size,
+                filter_by_ts=filter_by_ts,
+                filter_by_min_value=filter_by_min_value,
+                filter_by_max_value=filter_by_max_value,
+                latest=latest,
+                columnar=True,
+            )
+            if timestamps:
+                yield timestamps, values
+            if len(timestamps) < chunk_size:
+                return
+            to_time = timestamps[-1] - 1
 
     def __mrange_params(
         self,
@@ -763,6 +846,7 @@ class TimeSeriesCommands:
         latest: Optional[bool] = False,
         bucket_timestamp: Optional[str] = None,
         empty: Optional[bool] = False,
+        columnar: Optional[bool] = False,
     ):
         """
         Query a range across multiple time-series by filters in forward direction.
@@ -815,6 +899,10 @@ class TimeSeriesCommands:
                 `+`, `high`, `~`, `mid`].
             empty:
                 Reports aggregations for empty buckets.
+            columnar:
+                Return the samples of every series as an `array("q")` of
+                timestamps and an `array("d")` of values instead of a list of
+                tuples.
         """
         params = self.__mrange_params(
             aggregation_type,
@@ -835,8 +923,8 @@ class TimeSeriesCommands:
             bucket_timestamp,
             empty,
         )
-
-        return self.execute_command(MRANGE_CMD, *params)
+        options = {"columnar": True} if columnar else {}
+        return self.execute_command(MRANGE_CMD, *params, **options)
 
     def mrevrange(
         self,
@@ -857,6 +945,7 @@ class TimeSeriesCommands:
         latest: Optional[bool] = False,
         bucket_timestamp: Optional[str] = None,
         empty: Optional[bool] = False,
+        columnar: Optional[bool] = False,
     ):
         """
         Query a range across multiple time-series by filters in reverse direction.
@@ -909,6 +998,10 @@ class TimeSeriesCommands:
                 `+`, `high`, `~`, `mid`].
             empty:
                 Reports aggregations for empty buckets.
+            columnar:
+                Return the samples of every series as an `array("q")` of
+                timestamps and an `array("d")` of values instead of a list of
+                tuples.
         """
         params = self.__mrange_params(
             aggregation_type,
@@ -929,8 +1022,8 @@ class TimeSeriesCommands:
             bucket_timestamp,
             empty,
         )
-
-        return self.execute_command(MREVRANGE_CMD, *params)
+        options = {"columnar": True} if columnar else {}
+        return self.execute_command(MREVRANGE_CMD, *params, **options)
 
     def get(self, key: KeyT, latest: Optional[bool] = False):
         """
@@ -1134,3 +1227,75 @@ class TimeSeriesCommands:
             params.extend(
                 ["IGNORE", str(ignore_max_time_diff), str(ignore_max_val_diff)]
             )
+
+
+class AsyncTimeSeriesCommands(TimeSeriesCommands):
+    async def range_iter(
+        self,
+        key: KeyT,
+        from_time: Union[int, str],
+        to_time: Union[int, str],
+        chunk_size: int = 10000,
+        filter_by_ts: Optional[List[int]] = None,
+        filter_by_min_value: Optional[int] = None,
+        filter_by_max_value: Optional[int] = None,
+        latest: Optional[bool] = False,
+    ) -> AsyncIterator[Tuple[array, array]]:
+        """
+        Iterate over the raw samples of a range in forward direction, reading
+        `chunk_size` samples per TS.RANGE call.
+
+        See `TimeSeriesCommands.range_iter`.
+        """
+        while True:
+            timestamps, values = await self.range(
+                key,
+                from_time,
+                to_time,
+                count=chunk_size,
+                filter_by_ts=filter_by_ts,
+                filter_by_min_value=filter_by_min_value,
+                filter_by_max_value=filter_by_max_value,
+                latest=latest,
+                columnar=True,
+            )
+            if timestamps:
+                yield timestamps, values
+            if len(timestamps) < chunk_size:
+                return
+            from_time = timestamps[-1] + 1
+
+    async def revrange_iter(
+        self,
+        key: KeyT,
+        from_time: Union[int, str],
+        to_time: Union[int, str],
+        chunk_size: int = 10000,
+        filter_by_ts: Optional[List[int]] = None,
+        filter_by_min_value: Optional[int] = None,
+        filter_by_max_value: Optional[int] = None,
+        latest: Optional[bool] = False,
+    ) -> AsyncIterator[Tuple[array, array]]:
+        """
+        Iterate over the raw samples of a range in reverse direction, reading
+        `chunk_size` samples per TS.REVRANGE call.
+
+        See `TimeSeriesCommands.range_iter`.
+        """
+        while True:
+            timestamps, values = await self.revrange(
+                key,
+                from_time,
+                to_time,
+                count=chunk_size,
+                filter_by_ts=filter_by_ts,
+                filter_by_min_value=filter_by_min_value,
+                filter_by_max_value=filter_by_max_value,
+                latest=latest,
+                columnar=True,
+            )
+            if timestamps:
+                yield timestamps, values
+            if len(timestamps) < chunk_size:
+                return
+            to_time = timestamps[-1] - 1
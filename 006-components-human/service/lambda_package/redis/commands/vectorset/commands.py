@@ -1,6 +1,9 @@
 import json
+import sys
+from array import array
 from enum import Enum
-from typing import Awaitable, Dict, List, Optional, Union
+from itertools import chain
+from typing import Awaitable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 from redis.client import NEVER_DECODE
 from redis.commands.helpers import get_protocol_version
@@ -19,6 +22,69 @@ VSETATTR_CMD = "VSETATTR"
 VGETATTR_CMD = "VGETATTR"
 VRANDMEMBER_CMD = "VRANDMEMBER"
 
+# rows up to the connection's buffer cutoff are cheaper to copy into the
+# packed command than to write to the socket one by one
+FP32_COPY_CUTOFF = 6000
+
+
+def _to_fp32_matrix(vectors, dim: Optional[int] = None) -> Tuple[memoryview, int]:
+    """
+    Return the vectors as a flat byte view of little-endian float32 values,
+    and the number of dimensions.
+
+    ``vectors`` is a 2-D buffer, e.g. a NumPy array, a 1-D buffer of
+    ``dim`` floats per vector, e.g. ``array("f")``, or a sequence of
+    sequences of floats. C-contiguous float32 buffers are used without
+    copying, anything else is converted once.
+    """
+    try:
+        view = memoryview(vectors)
+    except TypeError:
+        rows = list(vectors)
+        if not rows:
+            raise DataError("'vectors' should not be empty")
+        dim = len(rows[0])
+        if any(len(row) != dim for row in rows):
+            raise DataError("All vectors must have the same number of dimensions")
+        view = memoryview(array("f", chain.from_iterable(rows)))
+
+    if view.ndim == 2:
+        if dim is not None and dim != view.shape[1]:
+            raise DataError(f"'dim' is {dim} but the vectors have {view.shape[1]}")
+        dim = view.shape[1]
+    elif view.ndim == 1:
+        if not dim:
+            raise DataError("'dim' is required for a 1-D buffer of vectors")
+        if len(view) % dim:
+            raise DataError(f"Buffer length {len(view)} is not a multiple of {dim}")
+    else:
+        raise DataError("'vectors' should be a 1-D or 2-D buffer")
+    if not dim:
+        raise DataError("Vectors should have at least one dimension")
+
+    byteorder, code = view.format[0], view.format[1:]
+    if byteorder not in "@=<>!":
+        byteorder, code = "@", view.format
+    if code not in ("f", "d"):
+        raise DataError(f"Unsupported vector format {view.format!r}, use float32")
+    if byteorder in "@=":
+        little_endian = sys.byteorder == "little"
+    else:
+        little_endian = byteorder == "<"
+    if code == "f" and little_endian and view.c_contiguous:
+        return view.cast("B"), dim
+    if byteorder not in "@=":
+        # memoryview can only read the values of native formats
+        raise DataError(f"Unsupported vector format {view.format!r}, use float32")
+
+    items = view.tolist()
+    if view.ndim == 2:
+        items = chain.from_iterable(items)
+    converted = array("f", items)
+    if sys.byteorder != "little":
+        converted.byteswap()
+    return memoryview(converted).cast("B"), dim
+
 
 class QuantizationOptions(Enum):
     """Quantization options for the VADD command."""
@@ -35,6 +101,7 @@ class CallbacksOptions(Enum):
     WITHSCORES = "WITHSCORES"
     ALLOW_DECODING = "ALLOW_DECODING"
     RESP3 = "RESP3"
+    AS_ARRAY = "AS_ARRAY"
 
 
 class VectorSetCommands(CommandsProtocol):
@@ -118,6 +185,106 @@ class VectorSetCommands(CommandsProtocol):
 
         return self.execute_command(VADD_CMD, key, *pieces)
 
+    def vadd_many(
+        self,
+        key: KeyT,
+        vectors,
+        elements: Sequence[str],
+        dim: Optional[int] = None,
+        reduce_dim: Optional[int] = None,
+        cas: Optional[bool] = False,
+        quantization: Optional[QuantizationOptions] = None,
+        ef: Optional[Number] = None,
+        attributes: Optional[Sequence[Optional[Union[dict, str]]]] = None,
+        numlinks: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> Union[Awaitable[array], array]:
+        """
+        Add the vectors ``vectors`` for the elements ``elements`` to a vector
+        set ``key`` through a pipeline, ``chunk_size`` commands per round trip.
+
+        ``vectors`` is a 2-D buffer, e.g. a float32 NumPy array, a 1-D buffer
+        of ``dim`` floats per vector, e.g. ``array("f")``, or a sequence of
+        sequences of floats. Every vector is sent as an ``FP32`` blob sliced
+        out of the buffer, so no float is formatted as a string.
+
+        ``attributes`` is an optional sequence with the attributes of every
+        element, or None for the elements without attributes.
+
+        The other options are those of :meth:`vadd`, applied to every vector.
+
+        Returns an ``array("b")`` with 1 for every element that was added and
+        0 for every element that was updated.
+
+        For more information see https://redis.io/commands/vadd
+        """
+        pipe = self.client.pipeline(transaction=False)
+        results = array("b")
+        for args in self._vadd_many_commands(
+            key,
+            vectors,
+            elements,
+            dim,
+            reduce_dim,
+            cas,
+            quantization,
+            ef,
+            attributes,
+            numlinks,
+        ):
+            pipe.execute_command(*args)
+            if len(pipe) >= chunk_size:
+                results.extend(map(int, pipe.execute()))
+        if len(pipe):
+            results.extend(map(int, pipe.execute()))
+        return results
+
+    def _vadd_many_commands(
+        self,
+        key,
+        vectors,
+        elements,
+        dim,
+        reduce_dim,
+        cas,
+        quantization,
+        ef,
+        attributes,
+        numlinks,
+    ) -> Iterator[Tuple]:
+        blob, dim = _to_fp32_matrix(vectors, dim)
+        row_size = dim * 4
+        count = len(blob) // row_size
+        if len(elements) != count:
+            raise DataError(f"Got {count} vectors but {len(elements)} elements")
+        if attributes is not None and len(attributes) != count:
+            raise DataError(f"Got {count} vectors but {len(attributes)} attributes")
+
+        head = [VADD_CMD, key]
+        if reduce_dim:
+            head.extend(["REDUCE", reduce_dim])
+        options = []
+        if cas:
+            options.append("CAS")
+        if quantization:
+            options.append(quantization.value)
+        if ef:
+            options.extend(["EF", ef])
+        if numlinks:
+            options.extend(["M", numlinks])
+
+        for i, element in enumerate(elements):
+            row = blob[i * row_size : (i + 1) * row_size]
+            if row_size <= FP32_COPY_CUTOFF:
+                row = row.tobytes()
+            args = head + ["FP32", row, element] + options
+            if attributes is not None and attributes[i]:
+                if isinstance(attributes[i], dict):
+                    args.extend(["SETATTR", json.dumps(attributes[i])])
+                else:
+                    args.extend(["SETATTR", attributes[i]])
+            yield args
+
     def vsim(
         self,
         key: KeyT,
@@ -130,6 +297,7 @@ class VectorSetCommands(CommandsProtocol):
         truth: Optional[bool] = False,
         no_thread: Optional[bool] = False,
         epsilon: Optional[Number] = None,
+        as_array: Optional[bool] = False,
     ) -> Union[
         Awaitable[Optional[List[Union[List[EncodableT], Dict[EncodableT, Number]]]]],
         Optional[List[Union[List[EncodableT], Dict[EncodableT, Number]]]],
@@ -156,6 +324,10 @@ class VectorSetCommands(CommandsProtocol):
         ``epsilon`` floating point between 0 and 1, if specified will return
                 only elements with distance no further than the specified one.
 
+        ``as_array`` when enabled together with ``with_scores`` returns a
+                tuple of the list of elements and an ``array("d")`` of their
+                scores instead of a dict.
+
         For more information see https://redis.io/commands/vsim
         """
 
@@ -176,6 +348,8 @@ class VectorSetCommands(CommandsProtocol):
         if with_scores:
             pieces.append("WITHSCORES")
             options[CallbacksOptions.WITHSCORES.value] = True
+            if as_array:
+                options[CallbacksOptions.AS_ARRAY.value] = True
 
         if count:
             pieces.extend(["COUNT", count])
@@ -233,7 +407,11 @@ class VectorSetCommands(CommandsProtocol):
         return self.execute_command(VREM_CMD, key, element)
 
     def vemb(
-        self, key: KeyT, element: str, raw: Optional[bool] = False
+        self,
+        key: KeyT,
+        element: str,
+        raw: Optional[bool] = False,
+        as_array: Optional[bool] = False,
     ) -> Union[
         Awaitable[Optional[Union[List[EncodableT], Dict[str, EncodableT]]]],
         Optional[Union[List[EncodableT], Dict[str, EncodableT]]],
@@ -244,6 +422,9 @@ class VectorSetCommands(CommandsProtocol):
         ``raw`` is a boolean flag that indicates whether to return the
                 interal representation used by the vector.
 
+        ``as_array`` when enabled returns the vector as an ``array("f")``
+                instead of a list. It is ignored together with ``raw``.
+
 
         For more information see https://redis.io/commands/vembed
         """
@@ -271,6 +452,8 @@ class VectorSetCommands(CommandsProtocol):
                 options[CallbacksOptions.ALLOW_DECODING.value] = True
 
             options[CallbacksOptions.RAW.value] = True
+        elif as_array:
+            options[CallbacksOptions.AS_ARRAY.value] = True
 
         return self.execute_command(VEMB_CMD, *pieces, **options)
 
@@ -372,3 +555,46 @@ class VectorSetCommands(CommandsProtocol):
         if count is not None:
             pieces.append(count)
         return self.execute_command(VRANDMEMBER_CMD, *pieces)
+
+
+class AsyncVectorSetCommands(VectorSetCommands):
+    async def vadd_many(
+        self,
+        key: KeyT,
+        vectors,
+        elements: Sequence[str],
+        dim: Optional[int] = None,
+        reduce_dim: Optional[int] = None,
+        cas: Optional[bool] = False,
+        quantization: Optional[QuantizationOptions] = None,
+        ef: Optional[Number] = None,
+        attributes: Optional[Sequence[Optional[Union[dict, str]]]] = None,
+        numlinks: Optional[int] = None,
+        chunk_size: int = 1000,
+    ) -> array:
+        """
+        Add the vectors ``vectors`` for the elements ``elements`` to a vector
+        set ``key`` through a pipeline, ``chunk_size`` commands per round trip.
+
+        See :meth:`VectorSetCommands.vadd_many` for the arguments.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        results = array("b")
+        for args in self._vadd_many_commands(
+            key,
+            vectors,
+            elements,
+            dim,
+            reduce_dim,
+            cas,
+            quantization,
+            ef,
+            attributes,
+            numlinks,
+        ):
+            pipe.execute_command(*args)
+            if len(pipe) >= chunk_size:
+                results.extend(map(int, await pipe.execute()))
+        if len(pipe):
+            results.extend(map(int, await pipe.execute()))
+        return results
@@ -2,7 +2,7 @@ import asyncio
 import threading
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Type, Union
 
 from redis.auth.token import TokenInterface
 from redis.credentials import CredentialProvider, StreamingCredentialProvider
@@ -55,10 +55,16 @@ class EventException(Exception):
 
 
 class EventDispatcher(EventDispatcherInterface):
-    # TODO: Make dispatcher to accept external mappings.
-    def __init__(self):
+    def __init__(
+        self,
+        event_listeners: Optional[
+            Dict[Type[object], List[EventListenerInterface]]
+        ] = None,
+    ):
         """
         Mapping should be extended for any new events or listeners to be added.
+        Additional listeners can be passed as ``event_listeners`` or registered
+        with register_listeners().
         """
         self._event_listeners_mapping = {
             AfterConnectionReleasedEvent: [
@@ -76,19 +82,39 @@ class EventDispatcher(EventDispatcherInterface):
                 AsyncReAuthConnectionListener(),
             ],
         }
+        self._lock = threading.Lock()
+        if event_listeners:
+            self.register_listeners(event_listeners)
 
     def dispatch(self, event: object):
-        listeners = self._event_listeners_mapping.get(type(event))
+        listeners = self._event_listeners_mapping.get(type(event), ())
 
         for listener in listeners:
             listener.listen(event)
 
     async def dispatch_async(self, event: object):
-        listeners = self._event_listeners_mapping.get(type(event))
+        listeners = self._event_listeners_mapping.get(type(event), ())
 
         for listener in listeners:
             await listener.listen(event)
 
+    def register_listeners(
+        self,
+        mappings: Dict[
+            Type[object],
+            List[Union[EventListenerInterface, AsyncEventListenerInterface]],
+        ],
+    ):
+        """Add listeners to the given event types"""
+        with self._lock:
+            for event_type, listeners in mappings.items():
+                # replaced rather than extended, so a concurrent dispatch
+                # iterates over a consistent list
+                self._event_listeners_mapping[event_type] = [
+                    *self._event_listeners_mapping.get(event_type, ()),
+                    *listeners,
+                ]
+
 
 class AfterConnectionReleasedEvent:
     """
@@ -107,6 +133,25 @@ class AsyncAfterConnectionReleasedEvent(AfterConnectionReleasedEvent):
     pass
 
 
+class PoolMetricsCollectedEvent:
+    """
+    Event that will be fired when the metrics of a connection pool are
+    collected with ``collect_metrics()``.
+    """
+
+    def __init__(self, connection_pool, metrics):
+        self._connection_pool = connection_pool
+        self._metrics = metrics
+
+    @property
+    def connection_pool(self):
+        return self._connection_pool
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+
 class ClientType(Enum):
     SYNC = ("sync",)
     ASYNC = ("async",)
@@ -0,0 +1,185 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with exponential buckets: bucket ``i`` counts the
+    observations of less than ``2**i`` microseconds, the last one everything
+    longer. Recording an observation is a couple of integer operations, and
+    the buckets are fine enough to tell a slow tail from pool starvation.
+    """
+
+    BUCKETS = 27
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts: List[int] = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds: float) -> None:
+        bucket = int(seconds * 1_000_000).bit_length()
+        self.counts[min(bucket, self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def copy(self) -> "LatencyHistogram":
+        histogram = LatencyHistogram()
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.total = self.total
+        return histogram
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Return the upper bound in seconds of the bucket holding the given
+        percentile (0-100), ``float("inf")`` if it is the last bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = self.count * percentile / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                break
+        return self._upper_bound(bucket)
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """
+        Return ``(upper bound in seconds, cumulative count)`` pairs, the
+        layout of a Prometheus histogram.
+        """
+        result = []
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            result.append((self._upper_bound(bucket), seen))
+        return result
+
+    def _upper_bound(self, bucket: int) -> float:
+        if bucket == self.BUCKETS - 1:
+            return float("inf")
+        return 2**bucket / 1_000_000
+
+
+@dataclass
+class MetricsSnapshot:
+    connects: int = 0
+    disconnects: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    pool_exhausted: int = 0
+    pool_wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+    commands: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    in_use_connections: int = 0
+    idle_connections: int = 0
+
+
+@dataclass
+class PubSubWorkerStats:
+    received: int = 0
+    dispatched: int = 0
+    dropped: int = 0
+    batches: int = 0
+    queued: int = 0
+    # time from reading a message to calling its handler
+    lag: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+@dataclass
+class StreamWorkerStats:
+    received: int = 0
+    claimed: int = 0
+    acked: int = 0
+    failed: int = 0
+    batches: int = 0
+    in_flight: int = 0
+    # age of the entries when read, from the time in their ID
+    lag: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class ClientMetrics:
+    """
+    Counters and latency histograms of a connection pool and its connections.
+
+    Pass an instance as ``metrics`` to a connection pool, a connection or a
+    client. The pool counts how long callers wait for a connection and how
+    often none is available, its connections count connects, disconnects and
+    bytes sent and received, and the client records the latency of every
+    command by name. ``ConnectionPool.collect_metrics()`` returns a
+    :py:class:`MetricsSnapshot` and dispatches it as a
+    :py:class:`~redis.event.PoolMetricsCollectedEvent`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connects = 0
+        self._disconnects = 0
+        self._bytes_sent = 0
+        self._bytes_received = 0
+        self._pool_exhausted = 0
+        self._pool_wait = LatencyHistogram()
+        self._commands: Dict[str, LatencyHistogram] = {}
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def record_disconnect(self) -> None:
+        with self._lock:
+            self._disconnects += 1
+
+    def record_bytes_sent(self, count: int) -> None:
+        with self._lock:
+            self._bytes_sent += count
+
+    def record_bytes_received(self, count: int) -> None:
+        with self._lock:
+            self._bytes_received += count
+
+    def record_pool_exhausted(self) -> None:
+        with self._lock:
+            self._pool_exhausted += 1
+
+    def record_pool_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._pool_wait.record(seconds)
+
+    def record_command(self, command_name: str, seconds: float) -> None:
+        with self._lock:
+            try:
+                histogram = self._commands[command_name]
+            except KeyError:
+                histogram = self._commands[command_name] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            return MetricsSnapshot(
+                connects=self._connects,
+                disconnects=self._disconnects,
+                bytes_sent=self._bytes_sent,
+                bytes_received=self._bytes_received,
+                pool_exhausted=self._pool_exhausted,
+                pool_wait=self._pool_wait.copy(),
+                commands={
+                    name: histogram.copy()
+                    for name, histogram in self._commands.items()
+                },
+            )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._connects = self._disconnects = 0
+            self._bytes_sent = self._bytes_received = 0
+            self._pool_exhausted = 0
+            self._pool_wait = LatencyHistogram()
+            self._commands = {}
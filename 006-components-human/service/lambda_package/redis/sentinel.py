@@ -1,4 +1,7 @@
+import logging
 import random
+import threading
+import time
 import weakref
 from typing import Optional
 
@@ -11,6 +14,12 @@ from redis.exceptions import (
     ResponseError,
     TimeoutError,
 )
+from redis.utils import str_if_bytes
+
+logger = logging.getLogger(__name__)
+
+# events that change the address of a master or its set of replicas
+SENTINEL_EVENTS = ("+switch-master", "+sdown", "-sdown", "+odown", "-odown", "+slave")
 
 
 class MasterNotFoundError(ConnectionError):
@@ -49,12 +58,18 @@ class SentinelManagedConnection(Connection):
         if self._sock:
             return  # already connected
         if self.connection_pool.is_master:
-            self.connect_to(self.connection_pool.get_master_address())
+            try:
+                self.connect_to(self.connection_pool.get_master_address())
+            except ConnectionError:
+                # the address may be stale, look it up again on the retry
+                self.connection_pool.invalidate_cache()
+                raise
         else:
             for slave in self.connection_pool.rotate_slaves():
                 try:
                     return self.connect_to(slave)
                 except ConnectionError:
+                    self.connection_pool.invalidate_cache()
                     continue
             raise SlaveNotFoundError  # Never be here
 
@@ -81,6 +96,7 @@ class SentinelManagedConnection(Connection):
                 # to has been demoted to a slave and there's a new master.
                 # calling disconnect will force the connection to re-query
                 # sentinel during the next connect() attempt.
+                self.connection_pool.invalidate_cache()
                 self.disconnect()
                 raise ConnectionError("The previous master is now a slave")
             raise
@@ -110,6 +126,11 @@ class SentinelConnectionPoolProxy:
         self.master_address = None
         self.slave_rr_counter = None
 
+    def invalidate_cache(self):
+        invalidate_cache = getattr(self.sentinel_manager, "invalidate_cache", None)
+        if invalidate_cache is not None:
+            invalidate_cache(self.service_name)
+
     def get_master_address(self):
         master_address = self.sentinel_manager.discover_master(self.service_name)
         if self.is_master and self.master_address != master_address:
@@ -199,6 +220,45 @@ class SentinelConnectionPool(ConnectionPool):
         return self.proxy.rotate_slaves()
 
 
+def _watch_sentinels(sentinel_manager_ref, stop: threading.Event) -> None:
+    # Only a weak reference is kept, so the thread doesn't keep an otherwise
+    # unused Sentinel alive.
+    index = 0
+    while not stop.is_set():
+        sentinel_manager = sentinel_manager_ref()
+        if sentinel_manager is None:
+            return
+        sentinels = sentinel_manager.sentinels
+        pubsub = sentinels[index % len(sentinels)].pubsub(
+            ignore_subscribe_messages=True
+        )
+        del sentinel_manager, sentinels
+        try:
+            pubsub.subscribe(*SENTINEL_EVENTS)
+            while not stop.is_set():
+                message = pubsub.get_message(timeout=1.0)
+                sentinel_manager = sentinel_manager_ref()
+                if sentinel_manager is None:
+                    return
+                if message is not None:
+                    sentinel_manager._handle_event(
+                        str_if_bytes(message["channel"]), str_if_bytes(message["data"])
+                    )
+                del sentinel_manager
+        except Exception as e:
+            # try the next sentinel, events may have been missed meanwhile
+            if not isinstance(e, (ConnectionError, TimeoutError)):
+                logger.exception("Error watching the sentinels for failover events")
+            index += 1
+            sentinel_manager = sentinel_manager_ref()
+            if sentinel_manager is not None:
+                sentinel_manager.invalidate_cache()
+            del sentinel_manager
+            stop.wait(0.1)
+        finally:
+            pubsub.close()
+
+
 class Sentinel(SentinelCommands):
     """
     Redis Sentinel cluster client
@@ -224,6 +284,17 @@ class Sentinel(SentinelCommands):
     not specified, any socket_timeout and socket_keepalive options specified
     in ``connection_kwargs`` will be used.
 
+    ``cache_ttl`` caches the discovered master and replica addresses for
+    that many seconds, so new connections don't query the sentinels. The
+    cache of a service is dropped when connecting to one of its addresses
+    fails or its master turns read-only.
+
+    ``watch_failover`` subscribes to the failover events of a sentinel in a
+    background thread, which updates the cache as soon as a master is
+    switched or an instance goes down or comes back, and disconnects the
+    idle connections to a replaced master. The addresses are then cached
+    until such an event, unless ``cache_ttl`` is also set.
+
     ``connection_kwargs`` are keyword arguments that will be used when
     establishing a connection to a Redis server.
     """
@@ -234,6 +305,8 @@ class Sentinel(SentinelCommands):
         min_other_sentinels=0,
         sentinel_kwargs=None,
         force_master_ip=None,
+        cache_ttl: Optional[float] = None,
+        watch_failover: bool = False,
         **connection_kwargs,
     ):
         # if sentinel_kwargs isn't defined, use the socket_* options from
@@ -251,6 +324,19 @@ class Sentinel(SentinelCommands):
         self.min_other_sentinels = min_other_sentinels
         self.connection_kwargs = connection_kwargs
         self._force_master_ip = force_master_ip
+        self.cache_ttl = cache_ttl
+        self.watch_failover = watch_failover
+        self._caching = cache_ttl is not None or watch_failover
+        # service name -> (addresses, expires at or None)
+        self._master_cache = {}
+        self._slaves_cache = {}
+        # service name (None for all) -> count of the events that changed its
+        # addresses, so a lookup started before one doesn't cache stale ones
+        self._generations = {}
+        self._cache_lock = threading.Lock()
+        # the pools of master_for(), told about master switches
+        self._master_pools = weakref.WeakSet()
+        self._watch_stop: Optional[threading.Event] = None
 
     def execute_command(self, *args, **kwargs):
         """
@@ -299,6 +385,97 @@ class Sentinel(SentinelCommands):
             return False
         return True
 
+    def _get_cached(self, cache, service_name):
+        with self._cache_lock:
+            entry = cache.get(service_name)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            return None
+        return value
+
+    def _generation(self, service_name):
+        # called with the cache lock held
+        return self._generations.get(None, 0), self._generations.get(service_name, 0)
+
+    def _bump_generation(self, service_name):
+        # called with the cache lock held
+        self._generations[service_name] = self._generations.get(service_name, 0) + 1
+
+    def _set_cached(self, cache, service_name, value, generation=None):
+        if self.cache_ttl is None:
+            expires_at = None
+        else:
+            expires_at = time.monotonic() + self.cache_ttl
+        with self._cache_lock:
+            if generation not in (None, self._generation(service_name)):
+                # the addresses changed during the lookup
+                return
+            cache[service_name] = (value, expires_at)
+
+    def invalidate_cache(self, service_name=None):
+        """
+        Drop the cached addresses of ``service_name``, or of every service,
+        so that they're discovered again on the next connection.
+        """
+        with self._cache_lock:
+            if service_name is None:
+                self._master_cache.clear()
+                self._slaves_cache.clear()
+                self._bump_generation(None)
+            else:
+                self._master_cache.pop(service_name, None)
+                self._slaves_cache.pop(service_name, None)
+                self._bump_generation(service_name)
+
+    def _start_watching(self):
+        with self._cache_lock:
+            if self._watch_stop is not None:
+                return
+            self._watch_stop = threading.Event()
+        threading.Thread(
+            target=_watch_sentinels,
+            args=(weakref.ref(self), self._watch_stop),
+            name=f"redis-sentinel-watch-{id(self):x}",
+            daemon=True,
+        ).start()
+
+    def close(self):
+        """Stop watching for failover events"""
+        with self._cache_lock:
+            if self._watch_stop is not None:
+                self._watch_stop.set()
+                self._watch_stop = None
+
+    def _handle_event(self, event, data):
+        parts = data.split()
+        if not parts:
+            return
+        if event == "+switch-master":
+            # <master name> <old ip> <old port> <new ip> <new port>
+            service_name = parts[0]
+            ip = parts[3]
+            if self._force_master_ip is not None:
+                ip = self._force_master_ip
+            with self._cache_lock:
+                self._bump_generation(service_name)
+                self._slaves_cache.pop(service_name, None)
+            self._set_cached(self._master_cache, service_name, (ip, int(parts[4])))
+            for pool in list(self._master_pools):
+                if pool.service_name == service_name:
+                    # disconnects the idle connections to the old master
+                    pool.get_master_address()
+        elif parts[0] == "master":
+            # <instance type> <name> <ip> <port>
+            self.invalidate_cache(parts[1])
+        elif "@" in parts:
+            # <instance type> <name> <ip> <port> @ <master name> <ip> <port>
+            service_name = parts[parts.index("@") + 1]
+            with self._cache_lock:
+                self._slaves_cache.pop(service_name, None)
+                self._bump_generation(service_name)
+
     def discover_master(self, service_name):
         """
         Asks sentinel servers for the Redis master's address corresponding
@@ -307,6 +484,14 @@ class Sentinel(SentinelCommands):
         Returns a pair (address, port) or raises MasterNotFoundError if no
         master is found.
         """
+        if self._caching:
+            if self.watch_failover and self._watch_stop is None:
+                self._start_watching()
+            address = self._get_cached(self._master_cache, service_name)
+            if address is not None:
+                return address
+            with self._cache_lock:
+                generation = self._generation(service_name)
         collected_errors = list()
         for sentinel_no, sentinel in enumerate(self.sentinels):
             try:
@@ -327,6 +512,13 @@ class Sentinel(SentinelCommands):
                     if self._force_master_ip is not None
                     else state["ip"]
                 )
+                if self._caching:
+                    self._set_cached(
+                        self._master_cache,
+                        service_name,
+                        (ip, state["port"]),
+                        generation,
+                    )
                 return ip, state["port"]
 
         error_info = ""
@@ -345,6 +537,12 @@ class Sentinel(SentinelCommands):
 
     def discover_slaves(self, service_name):
         "Returns a list of alive slaves for service ``service_name``"
+        if self._caching:
+            slaves = self._get_cached(self._slaves_cache, service_name)
+            if slaves is not None:
+                return slaves
+            with self._cache_lock:
+                generation = self._generation(service_name)
         for sentinel in self.sentinels:
             try:
                 slaves = sentinel.sentinel_slaves(service_name)
@@ -352,6 +550,10 @@ class Sentinel(SentinelCommands):
                 continue
             slaves = self.filter_slaves(slaves)
             if slaves:
+                if self._caching:
+                    self._set_cached(
+                        self._slaves_cache, service_name, slaves, generation
+                    )
                 return slaves
         return []
 
@@ -389,9 +591,10 @@ class Sentinel(SentinelCommands):
         kwargs["is_master"] = True
         connection_kwargs = dict(self.connection_kwargs)
         connection_kwargs.update(kwargs)
-        return redis_class.from_pool(
-            connection_pool_class(service_name, self, **connection_kwargs)
-        )
+        connection_pool = connection_pool_class(service_name, self, **connection_kwargs)
+        if self.watch_failover:
+            self._master_pools.add(connection_pool)
+        return redis_class.from_pool(connection_pool)
 
     def slave_for(
         self,
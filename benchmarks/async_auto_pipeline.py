@@ -0,0 +1,108 @@
+"""
+Compare plain, explicit-pipeline and auto-pipelined execution of concurrent
+commands with ``redis.asyncio.Redis``.
+
+Run against a local server with the vendored package on the path, e.g.::
+
+    PYTHONPATH=001-base/service/lambda_package \\
+        python benchmarks/async_auto_pipeline.py
+"""
+
+import asyncio
+import functools
+import time
+
+import redis.asyncio as redispy
+
+
+def timer(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        tic = time.perf_counter()
+        await func(*args, **kwargs)
+        toc = time.perf_counter()
+        return f"{toc - tic:.4f}"
+
+    return wrapper
+
+
+@timer
+async def plain(client, gather, count, size):
+    data_str = "a" * size
+    for i in range(0, count, gather):
+        await asyncio.gather(
+            *(
+                client.set(f"bench:{j}", data_str)
+                for j in range(i, min(i + gather, count))
+            )
+        )
+        await asyncio.gather(
+            *(client.get(f"bench:{j}") for j in range(i, min(i + gather, count)))
+        )
+
+
+@timer
+async def explicit_pipeline(client, gather, count, size):
+    data_str = "a" * size
+    for i in range(0, count, gather):
+        async with client.pipeline(transaction=False) as pipe:
+            for j in range(i, min(i + gather, count)):
+                pipe.set(f"bench:{j}", data_str)
+            await pipe.execute()
+        async with client.pipeline(transaction=False) as pipe:
+            for j in range(i, min(i + gather, count)):
+                pipe.get(f"bench:{j}")
+            await pipe.execute()
+
+
+@timer
+async def auto_pipeline(client, gather, count, size):
+    # same call pattern as ``plain``: the client batches each gather itself
+    data_str = "a" * size
+    for i in range(0, count, gather):
+        await asyncio.gather(
+            *(
+                client.set(f"bench:{j}", data_str)
+                for j in range(i, min(i + gather, count))
+            )
+        )
+        await asyncio.gather(
+            *(client.get(f"bench:{j}") for j in range(i, min(i + gather, count)))
+        )
+
+
+async def main(loop, host, port, gather, count, size):
+    plain_client = redispy.Redis(host=host, port=port, max_connections=gather)
+    auto_client = redispy.Redis(host=host, port=port, auto_pipeline=True)
+    print(f"{loop} {gather} {count} {size}")
+    await plain_client.flushdb()
+    try:
+        print("plain", await plain(plain_client, gather, count, size))
+        print(
+            "explicit pipeline",
+            await explicit_pipeline(plain_client, gather, count, size),
+        )
+        print("auto pipeline", await auto_pipeline(auto_client, gather, count, size))
+    finally:
+        await plain_client.flushdb()
+        await plain_client.aclose()
+        await auto_client.aclose()
+
+
+if __name__ == "__main__":
+    host = "localhost"
+    port = 6379
+
+    print("1. asyncio")
+    for gather in (1, 10, 100):
+        asyncio.run(main("asyncio", host, port, gather, 10000, 100))
+
+    try:
+        import uvloop
+
+        print("2. uvloop")
+        uvloop.install()
+        for gather in (1, 10, 100):
+            asyncio.run(main("uvloop", host, port, gather, 10000, 100))
+    except ImportError:
+        pass
@@ -0,0 +1,109 @@
+"""
+Replay a key access trace through the client-side cache with every eviction
+policy and report hit ratio, evictions and replay time.
+
+The trace is a text file with one Redis key per line. Without a trace, a
+synthetic workload of a few very hot keys, a long tail and periodic scan
+bursts of one-off reads is generated. No Redis server is needed::
+
+    PYTHONPATH=001-base/service/lambda_package \\
+        python benchmarks/cache_eviction_replay.py --max-size 1000
+"""
+
+import argparse
+import random
+import time
+
+from redis.cache import (
+    CacheConfig,
+    CacheEntry,
+    CacheEntryStatus,
+    CacheKey,
+    DefaultCache,
+    EvictionPolicy,
+)
+
+
+def synthetic_trace(length, hot_keys, scan_every, scan_length, seed):
+    rnd = random.Random(seed)
+    hot = [f"hot:{i}" for i in range(hot_keys)]
+    scan_id = 0
+    i = 0
+    while i < length:
+        if scan_every and i and i % scan_every == 0:
+            for _ in range(min(scan_length, length - i)):
+                yield f"scan:{scan_id}"
+                scan_id += 1
+                i += 1
+            continue
+        if rnd.random() < 0.7:
+            yield rnd.choice(hot)
+        else:
+            yield f"tail:{int(rnd.paretovariate(1.1))}"
+        i += 1
+
+
+def replay(trace, policy, max_size, max_memory, max_age):
+    cache = DefaultCache(
+        CacheConfig(
+            max_size=max_size,
+            eviction_policy=policy,
+            max_memory=max_memory,
+            max_age=max_age,
+        )
+    )
+    tic = time.perf_counter()
+    for redis_key in trace:
+        cache_key = CacheKey(command="GET", redis_keys=(redis_key,))
+        if cache.get(cache_key) is None:
+            cache.set(
+                CacheEntry(
+                    cache_key=cache_key,
+                    cache_value=redis_key.encode(),
+                    status=CacheEntryStatus.VALID,
+                    connection_ref=None,
+                )
+            )
+    toc = time.perf_counter()
+    return cache.stats, toc - tic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trace", help="file with one key per line")
+    parser.add_argument("--length", type=int, default=200000)
+    parser.add_argument("--hot-keys", type=int, default=200)
+    parser.add_argument("--scan-every", type=int, default=20000)
+    parser.add_argument("--scan-length", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-size", type=int, default=1000)
+    parser.add_argument("--max-memory", type=int, default=None)
+    parser.add_argument("--max-age", type=float, default=None)
+    args = parser.parse_args()
+
+    if args.trace:
+        with open(args.trace) as f:
+            trace = [line.strip() for line in f if line.strip()]
+    else:
+        trace = list(
+            synthetic_trace(
+                args.length, args.hot_keys, args.scan_every, args.scan_length, args.seed
+            )
+        )
+
+    print(f"{len(trace)} accesses, max_size={args.max_size}")
+    for policy in EvictionPolicy:
+        if policy is EvictionPolicy.LRU_MEMORY and args.max_memory is None:
+            continue
+        stats, elapsed = replay(
+            trace, policy, args.max_size, args.max_memory, args.max_age
+        )
+        print(
+            f"{policy.name:<10} hit ratio {stats.hit_ratio:.4f} "
+            f"hits {stats.hits} misses {stats.misses} "
+            f"evictions {stats.evictions} {elapsed:.4f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Measure connection pool throughput with many threads checking connections
+out and back in, for ``ConnectionPool``, ``BlockingConnectionPool`` and
+``ShardedConnectionPool``.
+
+By default every checkout runs a PING against a local server. With
+``--no-server`` connections are stubbed out, which isolates the cost of the
+pool itself::
+
+    PYTHONPATH=001-base/service/lambda_package \\
+        python benchmarks/pool_contention.py --no-server
+"""
+
+import argparse
+import threading
+import time
+
+from redis.connection import (
+    BlockingConnectionPool,
+    Connection,
+    ConnectionPool,
+    ShardedConnectionPool,
+)
+
+
+class StubConnection(Connection):
+    def connect(self):
+        pass
+
+    def can_read(self, timeout=0):
+        return False
+
+    def disconnect(self, *args):
+        pass
+
+
+def run(pool, threads, iterations, ping):
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        for _ in range(iterations):
+            connection = pool.get_connection()
+            try:
+                if ping:
+                    connection.send_command("PING")
+                    connection.read_response()
+            finally:
+                pool.release(connection)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    barrier.wait()
+    tic = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.join()
+    toc = time.perf_counter()
+    pool.disconnect()
+    return threads * iterations / (toc - tic)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 64, 128])
+    parser.add_argument("--no-server", action="store_true")
+    args = parser.parse_args()
+
+    kwargs = {"host": args.host, "port": args.port}
+    if args.no_server:
+        kwargs["connection_class"] = StubConnection
+
+    for threads in args.threads:
+        pools = {
+            "ConnectionPool": ConnectionPool(max_connections=threads, **kwargs),
+            "BlockingConnectionPool": BlockingConnectionPool(
+                max_connections=threads, **kwargs
+            ),
+            "ShardedConnectionPool": ShardedConnectionPool(
+                max_connections=threads, **kwargs
+            ),
+        }
+        for name, pool in pools.items():
+            rate = run(pool, threads, args.iterations, not args.no_server)
+            print(f"{threads:>4} threads {name:<24} {rate:>12.0f} checkouts/s")
+
+
+if __name__ == "__main__":
+    main()
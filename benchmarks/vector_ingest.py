@@ -0,0 +1,66 @@
+"""
+Compare loading vectors into a vector set one ``VADD`` at a time with
+``VALUES`` against ``vadd_many`` with ``FP32`` blobs in pipelined chunks.
+
+Needs a server with vector sets, e.g. Redis 8::
+
+    PYTHONPATH=001-base/service/lambda_package \\
+        python benchmarks/vector_ingest.py --count 10000 --dim 256
+"""
+
+import argparse
+import random
+import time
+from array import array
+
+import redis
+from redis.commands.vectorset.commands import QuantizationOptions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    vectors = array("f", (rnd.random() for _ in range(args.count * args.dim)))
+    elements = [f"e:{i}" for i in range(args.count)]
+    client = redis.Redis(host=args.host, port=args.port)
+    vset = client.vset()
+    client.delete("bench:vadd", "bench:vadd_many")
+
+    try:
+        tic = time.perf_counter()
+        for i, element in enumerate(elements):
+            vector = vectors[i * args.dim : (i + 1) * args.dim].tolist()
+            vset.vadd(
+                "bench:vadd",
+                vector,
+                element,
+                quantization=QuantizationOptions.NOQUANT,
+            )
+        toc = time.perf_counter()
+        print(f"vadd      {args.count / (toc - tic):>12.0f} vectors/s")
+
+        tic = time.perf_counter()
+        vset.vadd_many(
+            "bench:vadd_many",
+            vectors,
+            elements,
+            dim=args.dim,
+            quantization=QuantizationOptions.NOQUANT,
+            chunk_size=args.chunk_size,
+        )
+        toc = time.perf_counter()
+        print(f"vadd_many {args.count / (toc - tic):>12.0f} vectors/s")
+    finally:
+        client.delete("bench:vadd", "bench:vadd_many")
+        client.close()
+
+
+if __name__ == "__main__":
+    main()